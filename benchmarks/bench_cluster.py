@@ -0,0 +1,125 @@
+"""Ingest throughput of the multi-process cluster with a local load generator.
+
+Posts Helius-style webhook batches at the front and measures how fast the
+workers store them. Scaling needs at least as many free cores as workers.
+
+Usage:
+    python benchmarks/bench_cluster.py [--workers 1 2 4] [--transactions 20000]
+"""
+
+import argparse
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+
+import base58
+import requests
+
+from wallet_watch.cluster import Cluster, worker_storage_path
+from wallet_watch.config import ChainConfig, Config, ServerConfig, StorageConfig, WatchConfig
+
+
+def make_address(seed: int) -> str:
+    return base58.b58encode(seed.to_bytes(32, "big")).decode()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_payload(index: int, addresses: list[str]) -> dict:
+    address = addresses[index % len(addresses)]
+    return {
+        "signature": f"bench{index:012d}",
+        "type": "TRANSFER",
+        "description": f"{address} received 1 SOL",
+        "timestamp": 1700000000 + index,
+        "nativeTransfers": [{"fromUserAccount": make_address(10**6), "toUserAccount": address, "amount": 10**9}],
+        "accountData": [{"account": address, "nativeBalanceChange": 10**9}],
+    }
+
+
+def stored(config: Config, workers: int) -> int:
+    total = 0
+    for index in range(workers):
+        path = worker_storage_path(config.storage.path, index)
+        if os.path.exists(path):
+            conn = sqlite3.connect(path)
+            total += conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+            conn.close()
+    return total
+
+
+def run(workers: int, transactions: int, batch: int, senders: int) -> float:
+    addresses = [make_address(i) for i in range(1000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Config(
+            chains=[ChainConfig(name="solana", provider="helius")],
+            watches=[WatchConfig(address=a, chain="solana", label=f"w{i}") for i, a in enumerate(addresses)],
+            storage=StorageConfig(path=os.path.join(tmp, "bench.db")),
+            server=ServerConfig(host="127.0.0.1", port=free_port()),
+        )
+        config.outbox.enabled = False
+        cluster = Cluster(config, workers=workers, log_level="ERROR")
+        thread = threading.Thread(target=cluster.run, daemon=True)
+        thread.start()
+
+        url = f"http://127.0.0.1:{config.server.port}/webhook/solana"
+        session = requests.Session()
+        while True:
+            try:
+                session.get(f"http://127.0.0.1:{config.server.port}/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        time.sleep(2)  # let workers load their watches
+
+        batches = [
+            [make_payload(i, addresses) for i in range(start, min(start + batch, transactions))]
+            for start in range(0, transactions, batch)
+        ]
+
+        def send(mine):
+            with requests.Session() as s:
+                for body in mine:
+                    while s.post(url, json=body, timeout=30).status_code == 503:
+                        time.sleep(0.05)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=send, args=(batches[i::senders],)) for i in range(senders)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        while stored(config, workers) < transactions:
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - started
+
+        cluster.stop()
+        thread.join(timeout=30)
+        return transactions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--senders", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"{os.cpu_count()} CPUs")
+    for workers in args.workers:
+        rate = run(workers, args.transactions, args.batch, args.senders)
+        print(f"workers={workers:2d}  {rate:9.0f} tx/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark decoding of large webhook bodies.
+
+Compares, for one body of N transactions with instruction trees:
+
+- ``json.loads``: the full document decoded at once (what
+  ``request.get_json()`` did before)
+- ``stream``: ``SolanaProvider.decode_webhook``, which decodes one
+  transaction at a time and keeps only the projected fields
+
+Reports best-of-``repeat`` time and the tracemalloc peak of each.
+
+Usage:
+    python benchmarks/bench_decode.py --sizes 100 1000 --instructions 8
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from payloads import make_address, make_batch
+
+from wallet_watch.chains.solana import SolanaProvider
+
+
+def full_decode(body: bytes) -> int:
+    return len(json.loads(body))
+
+
+def stream_decode(provider: SolanaProvider) -> Callable[[bytes], int]:
+    def run(body: bytes) -> int:
+        # Hold the projected items like the pipeline does while processing
+        return len(list(provider.decode_webhook(body)))
+    return run
+
+
+def measure(run: Callable[[bytes], int], body: bytes, repeat: int) -> dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(body)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    run(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(best * 1000, 2), "peak_mb": round(peak / 1e6, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--instructions", type=int, default=8, help="Instructions per transaction")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    provider = SolanaProvider(sync_subscriptions=False)
+    watched = [make_address(i) for i in range(100)]
+    cases = {"json.loads": full_decode, "stream": stream_decode(provider)}
+
+    print(f"{'size':>6} {'body MB':>8} {'case':>11} {'ms':>9} {'peak MB':>9}")
+    for size in args.sizes:
+        body = json.dumps(make_batch(size, watched, instructions=args.instructions)).encode()
+        for name, run in cases.items():
+            result = measure(run, body, args.repeat)
+            print(f"{size:>6} {len(body) / 1e6:>8.2f} {name:>11} {result['ms']:>9} {result['peak_mb']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Microbenchmarks for the ingest, filter, render and storage hot paths.
+
+Measures, per transaction:
+
+- ``process_webhook_data``: ``SolanaProvider._process_webhook_data`` on
+  synthetic Helius batches, with N watched addresses subscribed
+- ``should_notify``: ``WalletWatch._should_notify`` with USD and type filters
+- ``to_message``: ``Transaction.to_message`` (default HTML template)
+- ``save_transaction``: ``SQLiteStorage.save_transaction`` into a table
+  already holding N transactions
+
+The filter and render cases don't depend on N and run once. Results can
+be saved as JSON and compared against an earlier run; the comparison
+exits with status 1 if any case got slower than the threshold.
+
+Usage:
+    python benchmarks/bench_hotpaths.py --output results.json
+    python benchmarks/bench_hotpaths.py --sizes 1000 100000 --compare results.json --threshold 0.15
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from payloads import make_address, make_batch
+
+from wallet_watch.chains.solana import SolanaProvider
+from wallet_watch.config import Config, FilterConfig, StorageConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.models import Transaction
+from wallet_watch.storage.sqlite import SQLiteStorage
+
+
+def measure(run: Callable[[], int], min_time: float, repeat: int) -> dict[str, float]:
+    """Best-of-``repeat`` time per operation; ``run`` returns the operations it did."""
+    best = float("inf")
+    for _ in range(repeat):
+        ops = 0
+        started = time.perf_counter()
+        while True:
+            ops += run()
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / ops)
+    return {"us_per_op": round(best * 1e6, 3), "ops_per_sec": round(1 / best, 1)}
+
+
+def bench_process(size: int, args) -> dict[str, float]:
+    watched = [make_address(i) for i in range(size)]
+    provider = SolanaProvider(sync_subscriptions=False)
+    delivered = []
+    callbacks = [delivered.append]
+    provider.subscriptions = dict.fromkeys(watched, callbacks)
+
+    batch = make_batch(args.batch, watched, args.transfers, args.watched_ratio)
+
+    def run() -> int:
+        provider._process_webhook_data(batch)
+        delivered.clear()
+        return len(batch)
+
+    return measure(run, args.min_time, args.repeat)
+
+
+def bench_should_notify(args) -> dict[str, float]:
+    config = Config(
+        chains=[],
+        filters=FilterConfig(min_usd_value=100, tx_types=["TRANSFER", "SWAP"]),
+        storage=StorageConfig(path=f"{tempfile.mkdtemp()}/filter.db"),
+    )
+    watcher = WalletWatch(config)
+    txs = [
+        Transaction(
+            signature=str(i), chain="solana", address="a", tx_type="TRANSFER" if i % 3 else "NFT_SALE",
+            description="", amount_usd=float(i % 500),
+        )
+        for i in range(1000)
+    ]
+
+    def run() -> int:
+        for tx in txs:
+            watcher._should_notify(tx)
+        return len(txs)
+
+    result = measure(run, args.min_time, args.repeat)
+    watcher.stop(timeout=1)
+    return result
+
+
+def bench_to_message(args) -> dict[str, float]:
+    batch = make_batch(100, [], args.transfers)
+    txs = [
+        Transaction(
+            signature=tx["signature"], chain="solana", address=tx["feePayer"], tx_type=tx["type"],
+            description=tx["description"], amount_usd=1234.5, timestamp=datetime.fromtimestamp(tx["timestamp"]),
+            raw=tx,
+        )
+        for tx in batch
+    ]
+
+    def run() -> int:
+        for tx in txs:
+            tx.to_message(label="Whale")
+        return len(txs)
+
+    return measure(run, args.min_time, args.repeat)
+
+
+def bench_save_transaction(size: int, args) -> dict[str, float]:
+    path = Path(tempfile.mkdtemp()) / "bench.db"
+    storage = SQLiteStorage(path=str(path))
+
+    # Existing history, inserted in bulk outside the measured path
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO transactions (signature, chain, address, tx_type, description) VALUES (?, ?, ?, ?, ?)",
+            ((f"existing{i}", "solana", make_address(i % 1000), "TRANSFER", "") for i in range(size)),
+        )
+    conn.close()
+
+    batch = make_batch(100, [], args.transfers)
+    counter = iter(range(10**9))
+
+    def run() -> int:
+        for tx_data in batch:
+            storage.save_transaction(Transaction(
+                signature=f"new{next(counter)}", chain="solana", address=tx_data["feePayer"],
+                tx_type=tx_data["type"], description=tx_data["description"], raw=tx_data,
+            ))
+        return len(batch)
+
+    result = measure(run, args.min_time, args.repeat)
+    storage.close()
+    return result
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table and return the regressed case names."""
+    regressions = []
+    print(f"\n{'case':36s} {'baseline us':>12s} {'current us':>12s} {'change':>8s}")
+    for name, current in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:36s} {'-':>12s} {current['us_per_op']:12.3f}")
+            continue
+        change = current["us_per_op"] / before["us_per_op"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:36s} {before['us_per_op']:12.3f} {current['us_per_op']:12.3f} {change:+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Watched addresses / stored transactions")
+    parser.add_argument("--batch", type=int, default=100, help="Transactions per webhook body")
+    parser.add_argument("--transfers", type=int, default=4, help="Transfers per transaction")
+    parser.add_argument("--watched-ratio", type=float, default=0.1,
+                        help="Chance a transfer touches a watched address")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per measurement")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown, e.g. 0.15 for 15%%")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "batch": args.batch,
+            "transfers": args.transfers,
+            "watched_ratio": args.watched_ratio,
+        },
+        "results": {},
+    }
+
+    cases: list[tuple[str, Callable[[], dict]]] = [
+        ("should_notify", lambda: bench_should_notify(args)),
+        ("to_message", lambda: bench_to_message(args)),
+    ]
+    for size in args.sizes:
+        cases.append((f"process_webhook_data@{size}", lambda size=size: bench_process(size, args)))
+        cases.append((f"save_transaction@{size}", lambda size=size: bench_save_transaction(size, args)))
+
+    for name, run in cases:
+        result = run()
+        results["results"][name] = result
+        print(f"{name:36s} {result['us_per_op']:12.3f} us/op {result['ops_per_sec']:14.1f} ops/s", flush=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Overhead of metrics instrumentation on the ingest hot path.
+
+Processes Helius-style payloads end to end (parse, filter, render, outbox
+write, dispatch to a no-op notifier) with metrics recording normally and
+with recording patched out, and reports the difference. Also reports the
+raw cost of a single counter increment and histogram observation.
+
+Usage:
+    python benchmarks/bench_metrics.py [--transactions 20000] [--rounds 3]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from unittest.mock import patch
+
+import base58
+
+from wallet_watch.config import ChainConfig, Config, StorageConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.metrics import Counter, Histogram
+from wallet_watch.notifiers.base import NotifierBase
+
+
+class NullNotifier(NotifierBase):
+    name = "null"
+
+    def send(self, message: str, **kwargs) -> bool:
+        return True
+
+    def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+        return True
+
+
+def make_address(seed: int) -> str:
+    return base58.b58encode(seed.to_bytes(32, "big")).decode()
+
+
+def make_payload(index: int, addresses: list[str]) -> dict:
+    address = addresses[index % len(addresses)]
+    return {
+        "signature": f"bench{index:012d}",
+        "type": "TRANSFER",
+        "description": f"{address} received 1 SOL",
+        "timestamp": 1700000000 + index,
+        "nativeTransfers": [{"fromUserAccount": make_address(10**6), "toUserAccount": address, "amount": 10**9}],
+    }
+
+
+def run(transactions: int, offset: int) -> float:
+    """Seconds to process ``transactions`` payloads and drain notifications."""
+    addresses = [make_address(i) for i in range(100)]
+    config = Config(
+        chains=[ChainConfig(name="solana", provider="helius")],
+        storage=StorageConfig(path=f"{tempfile.mkdtemp()}/bench.db"),
+        watches=[WatchConfig(address=a, chain="solana", notify=["null"]) for a in addresses],
+    )
+    watcher = WalletWatch(config)
+    notifier = NullNotifier()
+    watcher.notifiers["null"] = notifier
+    watcher.dispatcher.add("null", notifier, workers=1, queue_size=transactions)
+    watcher.add_watches(config.watches, persist=False)
+    chain = watcher.chains["solana"]
+
+    payloads = [make_payload(offset + i, addresses) for i in range(transactions)]
+    started = time.perf_counter()
+    for i in range(0, transactions, 100):
+        chain.process_payload(payloads[i:i + 100])
+    watcher.dispatcher.close(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    watcher.storage.close()
+    return elapsed
+
+
+def primitive_cost(iterations: int = 200_000) -> tuple[float, float]:
+    """Nanoseconds per Counter.inc and Histogram.observe."""
+    counter, histogram = Counter(), Histogram()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        counter.inc()
+    inc = (time.perf_counter() - started) / iterations
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        histogram.observe(0.001)
+    observe = (time.perf_counter() - started) / iterations
+    return inc * 1e9, observe * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    inc, observe = primitive_cost()
+    print(f"Counter.inc: {inc:.0f} ns, Histogram.observe: {observe:.0f} ns")
+
+    # Alternate the two modes so drift affects both equally; keep the best round
+    enabled, disabled = [], []
+    for round_index in range(args.rounds):
+        offset = round_index * 2 * args.transactions
+        enabled.append(run(args.transactions, offset))
+        with patch.object(Counter, "inc", lambda self, amount=1: None), \
+                patch.object(Histogram, "observe", lambda self, value: None):
+            disabled.append(run(args.transactions, offset + args.transactions))
+
+    with_metrics, without_metrics = min(enabled), min(disabled)
+    overhead = (with_metrics - without_metrics) / without_metrics * 100
+    print(f"with metrics:    {args.transactions / with_metrics:8.0f} tx/s")
+    print(f"without metrics: {args.transactions / without_metrics:8.0f} tx/s")
+    print(f"overhead:        {overhead:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
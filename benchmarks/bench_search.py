@@ -0,0 +1,155 @@
+"""Benchmark full-text search over stored transaction descriptions.
+
+Builds (or reuses) a SQLite database of N transactions through
+``SQLiteStorage``, so the FTS5 index is filled by its triggers, then
+times ``search_transactions`` for rare, common, prefix and phrase
+queries, with and without address and time filters, by rank and by
+recency. The same searches are timed as ``LIKE`` scans (the fallback
+used without FTS5) for comparison. Also reports what the index costs:
+``save_transaction`` time with and without the triggers, and database
+size.
+
+Usage:
+    python benchmarks/bench_search.py --rows 2000000 --db /tmp/search.db
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from payloads import make_address, make_description, make_signature
+
+from wallet_watch.models import Transaction
+from wallet_watch.storage.sqlite import SQLiteStorage
+
+BATCH = 50_000
+START = datetime(2026, 1, 1)
+DAYS = 90
+
+
+def build(path: str, rows: int, addresses: list[str], seed: int = 0) -> float:
+    """Fill a database with ``rows`` transactions; returns rows per second."""
+    storage = SQLiteStorage(path)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    done = 0
+    while done < rows:
+        batch = []
+        for i in range(done, min(rows, done + BATCH)):
+            address = rng.choice(addresses)
+            created = START + timedelta(seconds=DAYS * 86400 * i / rows)
+            batch.append((
+                make_signature(rng), "solana", address, "SWAP",
+                make_description(rng, address, rng.choice(addresses)),
+                round(rng.lognormvariate(3, 2), 2), created.strftime("%Y-%m-%d %H:%M:%S"),
+            ))
+        with storage.conn:
+            storage.conn.executemany("""
+                INSERT INTO transactions (signature, chain, address, tx_type, description, amount_usd, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, batch)
+        done += len(batch)
+        print(f"\r  {done:,} rows", end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print()
+    storage.close()
+    return rows / elapsed
+
+
+def time_saves(count: int, triggers: bool) -> float:
+    """Microseconds per ``save_transaction`` (one commit each) into a fresh database."""
+    with tempfile.TemporaryDirectory() as directory:
+        storage = SQLiteStorage(os.path.join(directory, "saves.db"))
+        if not triggers:
+            for name in ("insert", "delete", "update"):
+                storage.conn.execute(f"DROP TRIGGER transactions_fts_{name}")
+        rng = random.Random(1)
+        addresses = [make_address(i) for i in range(100)]
+        txs = [
+            Transaction(
+                signature=make_signature(rng), chain="solana", address=addresses[i % 100], tx_type="SWAP",
+                description=make_description(rng, addresses[i % 100], addresses[(i + 1) % 100]),
+            )
+            for i in range(count)
+        ]
+        started = time.perf_counter()
+        for tx in txs:
+            storage.save_transaction(tx)
+        elapsed = time.perf_counter() - started
+        storage.close()
+    return elapsed / count * 1e6
+
+
+def measure(run, repeat: int) -> float:
+    """Median milliseconds over ``repeat`` runs."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--addresses", type=int, default=10_000, help="Distinct watched addresses")
+    parser.add_argument("--db", default=None, help="Database to build, or reuse if it exists")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--saves", type=int, default=5000, help="Transactions for the write-cost comparison")
+    args = parser.parse_args()
+
+    addresses = [make_address(i + 1) for i in range(args.addresses)]
+    path = args.db or os.path.join(tempfile.mkdtemp(), "search.db")
+    if not os.path.exists(path):
+        print(f"Building {args.rows:,} transactions in {path}")
+        print(f"  {build(path, args.rows, addresses):,.0f} rows/s with the FTS5 triggers")
+
+    storage = SQLiteStorage(path)
+    total = storage.conn.execute("SELECT MAX(id) FROM transactions").fetchone()[0]
+    print(f"{total:,} transactions, {os.path.getsize(path) / 1e6:,.0f} MB")
+
+    address = addresses[7]
+    since = START + timedelta(days=DAYS - 7)
+    cases = [
+        ("no match", "NOSUCHTOKEN", {}),
+        ("rare word", "HNT", {}),
+        ("common word", "USDC", {}),
+        ("prefix", "BON*", {}),
+        ("two words", "swapped BONK", {}),
+        ("phrase", '"sold Mad Lads"', {}),
+        ("common + address", "USDC", {"address": address}),
+        ("phrase + last 7 days", '"sold Mad Lads"', {"since": since}),
+    ]
+
+    print(f"\n{'case':<22} {'matches':>9} {'rank ms':>9} {'newest ms':>10} {'LIKE ms':>9}")
+    for name, query, filters in cases:
+        matches = storage.conn.execute(
+            "SELECT COUNT(*) FROM transactions_fts WHERE transactions_fts MATCH ?",
+            (storage_query(query),),
+        ).fetchone()[0]
+        rank = measure(lambda: storage.search_transactions(query, **filters), args.repeat)
+        newest = measure(lambda: storage.search_transactions(query, order="newest", **filters), args.repeat)
+        storage.supports_search = False
+        like = measure(lambda: storage.search_transactions(query, **filters), max(1, args.repeat // 2))
+        storage.supports_search = True
+        print(f"{name:<22} {matches:>9,} {rank:>9.2f} {newest:>10.2f} {like:>9.2f}")
+    storage.close()
+
+    with_index = time_saves(args.saves, triggers=True)
+    without = time_saves(args.saves, triggers=False)
+    print(f"\nsave_transaction: {with_index:.0f} us with the index, {without:.0f} us without")
+
+
+def storage_query(query: str) -> str:
+    from wallet_watch.storage.sqlite import fts_query
+
+    return fts_query(query)
+
+
+if __name__ == "__main__":
+    main()
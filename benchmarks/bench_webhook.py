@@ -0,0 +1,96 @@
+"""Webhook delivery throughput against a local HTTP sink.
+
+Compares the old one-request-per-call ``requests.post`` path with the
+pooled WebhookNotifier, with and without batching.
+
+Usage:
+    python benchmarks/bench_webhook.py [--events 2000]
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.notifiers import Delivery
+from wallet_watch.notifiers.webhook import WebhookNotifier
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        with self.server.lock:
+            self.server.events += len(payload) if isinstance(payload, list) else 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_sink() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SinkHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.events = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_deliveries(count: int) -> list[Delivery]:
+    data = {"signature": "5" * 88, "address": "A" * 44, "tx_type": "swap", "amount_usd": 1234.5}
+    return [Delivery(f"<b>SWAP</b> #{i}", data=data) for i in range(count)]
+
+
+def bench_unpooled(url: str, deliveries: list[Delivery]) -> None:
+    for delivery in deliveries:
+        requests.post(url, json={"message": delivery.message, "transaction": delivery.data}, timeout=10)
+
+
+def bench_dispatcher(url: str, deliveries: list[Delivery], **options) -> None:
+    notifier = WebhookNotifier(webhook_url=url, **options)
+    dispatcher = Dispatcher()
+    dispatcher.add("webhook", notifier, workers=options.get("concurrency", 4), queue_size=len(deliveries))
+    for delivery in deliveries:
+        dispatcher.submit("webhook", [delivery])
+    dispatcher.close(timeout=120)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = [
+        ("requests.post per event", lambda url, d: bench_unpooled(url, d)),
+        ("pooled, concurrency=4", lambda url, d: bench_dispatcher(url, d, concurrency=4)),
+        ("pooled, batch_size=100", lambda url, d: bench_dispatcher(url, d, batch_size=100, batch_interval=0.05)),
+        ("pooled, batch_size=100, gzip", lambda url, d: bench_dispatcher(
+            url, d, batch_size=100, batch_interval=0.05, gzip=True
+        )),
+    ]
+
+    deliveries = make_deliveries(args.events)
+    for name, run in cases:
+        sink = start_sink()
+        url = f"http://127.0.0.1:{sink.server_address[1]}/hook"
+        started = time.perf_counter()
+        run(url, deliveries)
+        elapsed = time.perf_counter() - started
+        sink.shutdown()
+        print(f"{name:32s} {sink.events:6d} events  {elapsed:7.2f}s  {sink.events / elapsed:9.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
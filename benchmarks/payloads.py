@@ -0,0 +1,135 @@
+"""Synthetic Helius enhanced-transaction payloads for benchmarks.
+
+Payloads follow the shape of Helius enhanced webhooks: native and token
+transfers, per-account balance changes and the usual top-level fields.
+Generation is seeded, so the same arguments give the same payloads.
+"""
+
+import random
+
+import base58
+
+
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def make_address(seed: int) -> str:
+    """Valid Solana address derived from an integer."""
+    return base58.b58encode(seed.to_bytes(32, "big")).decode()
+
+
+def make_signature(rng: random.Random) -> str:
+    """Random 64-byte base58 transaction signature."""
+    return base58.b58encode(rng.randbytes(64)).decode()
+
+
+def make_transaction(
+    rng: random.Random,
+    watched: list[str],
+    transfers: int = 2,
+    watched_ratio: float = 0.5,
+    timestamp: int = 1_700_000_000,
+    instructions: int = 0,
+) -> dict:
+    """One enhanced transaction.
+
+    Args:
+        rng: Random source
+        watched: Watched addresses; each transfer touches one with
+            probability ``watched_ratio``
+        transfers: Native plus token transfers in the transaction
+        watched_ratio: Chance a transfer involves a watched address
+        timestamp: Block time
+        instructions: Instructions, each with a few inner instructions,
+            as in swaps and other program-heavy transactions
+    """
+    def counterparty() -> str:
+        if watched and rng.random() < watched_ratio:
+            return rng.choice(watched)
+        return make_address(rng.getrandbits(64) + 2**64)
+
+    native, token, accounts = [], [], {}
+    for i in range(transfers):
+        sender, receiver = counterparty(), counterparty()
+        amount = rng.randint(1, 10**11)
+        if i % 2 == 0:
+            native.append({"fromUserAccount": sender, "toUserAccount": receiver, "amount": amount})
+        else:
+            token.append({
+                "fromUserAccount": sender,
+                "toUserAccount": receiver,
+                "fromTokenAccount": make_address(rng.getrandbits(64)),
+                "toTokenAccount": make_address(rng.getrandbits(64)),
+                "tokenAmount": amount / 10**6,
+                "mint": USDC_MINT,
+                "tokenStandard": "Fungible",
+            })
+        accounts[sender] = accounts.get(sender, 0) - amount
+        accounts[receiver] = accounts.get(receiver, 0) + amount
+
+    fee_payer = native[0]["fromUserAccount"] if native else counterparty()
+    return {
+        "signature": make_signature(rng),
+        "type": "TRANSFER",
+        "source": "SYSTEM_PROGRAM",
+        "description": f"{fee_payer} transferred {len(native)} SOL and {len(token)} token transfers",
+        "fee": 5000,
+        "feePayer": fee_payer,
+        "slot": 250_000_000 + rng.randint(0, 10**6),
+        "timestamp": timestamp,
+        "nativeTransfers": native,
+        "tokenTransfers": token,
+        "accountData": [
+            {"account": account, "nativeBalanceChange": change, "tokenBalanceChanges": []}
+            for account, change in accounts.items()
+        ],
+        "transactionError": None,
+        "instructions": [make_instruction(rng, inner=3) for _ in range(instructions)],
+        "events": {"swap": {"innerSwaps": [], "nativeFees": [], "tokenFees": []}} if instructions else {},
+    }
+
+
+# Token symbols by how often they show up in descriptions, most common first
+TOKENS = ("USDC", "SOL", "BONK", "JUP", "WIF", "RAY", "PYTH", "ORCA", "MNGO", "SAMO", "DUST", "HNT")
+
+
+def make_description(rng: random.Random, address: str, counterparty: str) -> str:
+    """A Helius-style description of a swap, transfer or NFT sale."""
+    token = TOKENS[min(int(rng.expovariate(0.6)), len(TOKENS) - 1)]
+    amount = round(rng.lognormvariate(3, 2), 2)
+    kind = rng.random()
+    if kind < 0.5:
+        other = TOKENS[min(int(rng.expovariate(0.6)), len(TOKENS) - 1)]
+        return f"{address} swapped {amount} {token} for {round(amount * rng.uniform(0.5, 2), 2)} {other}"
+    if kind < 0.9:
+        return f"{address} transferred {amount} {token} to {counterparty}"
+    number = rng.randint(1, 9999)
+    return f"{address} sold Mad Lads #{number} to {counterparty} for {amount} SOL on MAGIC_EDEN"
+
+
+def make_instruction(rng: random.Random, inner: int = 0) -> dict:
+    """A program instruction with its accounts and encoded data."""
+    instruction = {
+        "programId": make_address(rng.getrandbits(64)),
+        "accounts": [make_address(rng.getrandbits(64)) for _ in range(8)],
+        "data": base58.b58encode(rng.randbytes(24)).decode(),
+    }
+    if inner:
+        instruction["innerInstructions"] = [make_instruction(rng) for _ in range(inner)]
+    return instruction
+
+
+def make_batch(
+    size: int,
+    watched: list[str],
+    transfers: int = 2,
+    watched_ratio: float = 0.5,
+    seed: int = 0,
+    instructions: int = 0,
+) -> list[dict]:
+    """A webhook body of ``size`` transactions."""
+    rng = random.Random(seed)
+    return [
+        make_transaction(rng, watched, transfers, watched_ratio, 1_700_000_000 + i, instructions)
+        for i in range(size)
+    ]
@@ -0,0 +1,104 @@
+"""Admin HTTP API for managing watches on a running instance."""
+
+import hmac
+import logging
+
+from flask import Blueprint, Response, jsonify, request
+from pydantic import ValidationError
+
+from wallet_watch.config import WatchConfig
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for /admin/profile, which holds its request open while sampling
+MAX_PROFILE_SECONDS = 60
+
+
+def create_admin_blueprint(watcher, token: str) -> Blueprint:
+    """Create the admin API blueprint.
+
+    Every route requires an ``Authorization: Bearer <token>`` header.
+
+    Args:
+        watcher: The running WalletWatch instance
+        token: Shared admin token
+
+    Returns:
+        Flask blueprint mounted at ``/admin``
+    """
+    if not token:
+        raise ValueError("Admin token is required")
+
+    bp = Blueprint("admin", __name__, url_prefix="/admin")
+    expected = f"Bearer {token}"
+
+    @bp.before_request
+    def check_auth():
+        auth = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth.encode(), expected.encode()):
+            return jsonify({"error": "Unauthorized"}), 401
+        return None
+
+    @bp.route("/watches", methods=["GET"])
+    def list_watches():
+        watches = [watch.model_dump() for watch in watcher.list_watches()]
+        return jsonify({"watches": watches, "count": len(watches)}), 200
+
+    @bp.route("/watches", methods=["POST"])
+    def add_watches():
+        data = request.get_json(silent=True)
+        items = data.get("watches") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return jsonify({"error": "Expected a list of watches"}), 400
+
+        watches = []
+        rejected = []
+        for item in items:
+            if not isinstance(item, dict):
+                rejected.append({"address": str(item), "error": "Expected an object"})
+                continue
+            try:
+                watches.append(WatchConfig(**item))
+            except ValidationError as e:
+                rejected.append({"address": str(item.get("address", "")), "error": str(e)})
+
+        result = watcher.add_watches(watches)
+        result["rejected"] = rejected + result["rejected"]
+        return jsonify(result), 200
+
+    @bp.route("/watches", methods=["DELETE"])
+    def remove_watches():
+        data = request.get_json(silent=True)
+        addresses = data.get("addresses") if isinstance(data, dict) else data
+        if not isinstance(addresses, list) or not all(isinstance(a, str) for a in addresses):
+            return jsonify({"error": "Expected a list of addresses"}), 400
+
+        removed = watcher.remove_watches(addresses)
+        return jsonify({"removed": removed}), 200
+
+    @bp.route("/stats", methods=["GET"])
+    def stats():
+        return jsonify(watcher.stats()), 200
+
+    @bp.route("/profile", methods=["POST"])
+    def profile():
+        try:
+            seconds = float(request.args.get("seconds", 10))
+            interval = float(request.args.get("interval", 0.005))
+        except ValueError:
+            return jsonify({"error": "seconds and interval must be numbers"}), 400
+        if not 0 < seconds <= MAX_PROFILE_SECONDS or not 0.001 <= interval <= 1:
+            return jsonify({"error": f"seconds must be in (0, {MAX_PROFILE_SECONDS}], interval in [0.001, 1]"}), 400
+
+        logger.info(f"Profiling for {seconds}s")
+        result = watcher.profiler.profile(seconds, interval)
+        if result is None:
+            return jsonify({"error": "A profile is already running"}), 409
+
+        if request.args.get("format") == "folded":
+            folded = "".join(f"{entry['stack']} {entry['count']}\n" for entry in result["stacks"])
+            return Response(folded, mimetype="text/plain")
+        return jsonify(result), 200
+
+    return bp
@@ -0,0 +1,134 @@
+"""Circuit breaker for notifier calls."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from wallet_watch.config import BreakerConfig
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks recent call outcomes for one notifier and trips on trouble.
+
+    While closed, calls are recorded in a sliding ``window``. Once at least
+    ``min_calls`` were seen, the breaker opens if the share of failed calls
+    reaches ``error_rate`` or the share of calls slower than ``slow_call``
+    seconds reaches ``slow_rate``. An open breaker rejects calls for
+    ``open_seconds`` and then lets ``half_open_calls`` trial calls through;
+    if they all succeed it closes again, otherwise it reopens.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: BreakerConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.config = config or BreakerConfig()
+        self.clock = clock
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._trials = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may go through, moving open to half-open when due."""
+        if not self.config.enabled:
+            return True
+
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.config.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self._trials = 0
+                self._trial_successes = 0
+                logger.info(f"Circuit for {self.name} half-open, sending trial calls")
+
+            if self.state == HALF_OPEN:
+                if self._trials >= self.config.half_open_calls:
+                    self.rejected += 1
+                    return False
+                self._trials += 1
+
+            return True
+
+    def record(self, ok: bool, duration: float) -> None:
+        """Record the outcome of an allowed call."""
+        if not self.config.enabled:
+            return
+
+        slow = duration >= self.config.slow_call
+        now = self.clock()
+
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if not ok or slow:
+                    self._open(now, "trial call failed")
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.config.half_open_calls:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"Circuit for {self.name} closed")
+                return
+
+            if self.state == OPEN:
+                return
+
+            self._calls.append((now, not ok, slow))
+            cutoff = now - self.config.window
+            while self._calls and self._calls[0][0] < cutoff:
+                self._calls.popleft()
+
+            total = len(self._calls)
+            if total < self.config.min_calls:
+                return
+
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+            if failures / total >= self.config.error_rate:
+                self._open(now, f"{failures}/{total} calls failed")
+            elif slow_calls / total >= self.config.slow_rate:
+                self._open(now, f"{slow_calls}/{total} calls slower than {self.config.slow_call}s")
+
+    def _open(self, now: float, reason: str) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        self._calls.clear()
+        logger.warning(f"Circuit for {self.name} opened: {reason}")
+
+    def retry_in(self) -> float | None:
+        """Seconds until the next trial call, or None if the breaker is closed."""
+        with self._lock:
+            if self.state == CLOSED:
+                return None
+            if self.state == HALF_OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.config.open_seconds - self.clock())
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the breaker state and counters."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
@@ -1,19 +1,41 @@
-"""Blockchain chain providers."""
+"""Blockchain chain providers.
+
+Providers are registered as ``"module:Class"`` paths and imported the
+first time they are used, so loading this package stays cheap.
+"""
+
+import importlib
 
 from wallet_watch.chains.base import ChainBase
-from wallet_watch.chains.solana import SolanaProvider
 
-PROVIDERS = {
-    "solana": SolanaProvider,
+PROVIDERS: dict[str, str | type[ChainBase]] = {
+    "solana": "wallet_watch.chains.solana:SolanaProvider",
 }
 
+_EXPORTS = {"SolanaProvider": "solana"}
 
-def get_chain_provider(name: str, **kwargs) -> ChainBase:
-    """Get a chain provider by name."""
+
+def get_provider_class(name: str) -> type[ChainBase]:
+    """Resolve a chain provider class by name, importing its module."""
     if name not in PROVIDERS:
         raise ValueError(f"Unknown chain provider: {name}. Available: {list(PROVIDERS.keys())}")
 
-    return PROVIDERS[name](**kwargs)
+    provider = PROVIDERS[name]
+    if isinstance(provider, str):
+        module, _, attr = provider.partition(":")
+        provider = PROVIDERS[name] = getattr(importlib.import_module(module), attr)
+    return provider
+
+
+def get_chain_provider(name: str, **kwargs) -> ChainBase:
+    """Get a chain provider by name."""
+    return get_provider_class(name)(**kwargs)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return get_provider_class(_EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["ChainBase", "SolanaProvider", "get_chain_provider"]
+__all__ = ["ChainBase", "SolanaProvider", "get_chain_provider", "get_provider_class"]
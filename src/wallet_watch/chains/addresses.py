@@ -0,0 +1,150 @@
+"""Fast bulk address validation.
+
+Solana addresses are base58 strings that decode to 32 bytes. Instead of
+decoding to bytes, ``is_solana_address`` checks the characters with one
+regex, folds the digits into an integer (after a ``bytes.translate`` to
+digit values) and derives the decoded length from its bit length.
+``AddressValidator`` remembers addresses already found valid, so the
+repeated checks at startup and on every subscribe are set lookups.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+B58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+_B58_DIGITS = bytes.maketrans(B58_ALPHABET, bytes(range(58)))
+
+# 32 bytes encode to 32 (all zero) to 44 characters
+_SOLANA_ADDRESS = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,44}")
+
+
+def b58_decoded_length(value: str) -> int:
+    """Length in bytes of a base58 string's decoding; the string must be valid base58."""
+    digits = value.lstrip("1")
+    number = 0
+    for digit in digits.encode("ascii").translate(_B58_DIGITS):
+        number = number * 58 + digit
+    return len(value) - len(digits) + (number.bit_length() + 7) // 8
+
+
+def is_solana_address(address: str) -> bool:
+    """True if ``address`` is base58 that decodes to 32 bytes."""
+    if not isinstance(address, str) or _SOLANA_ADDRESS.fullmatch(address) is None:
+        return False
+    return b58_decoded_length(address) == 32
+
+
+class AddressValidator:
+    """Memoizing wrapper around an address check.
+
+    Valid addresses are remembered up to ``max_size``; after that new
+    addresses are still checked but no longer remembered. Invalid ones are
+    never cached, since they are rare and usually fixed and retried.
+    """
+
+    def __init__(self, check: Callable[[str], bool], max_size: int = 2_000_000):
+        self.check = check
+        self.max_size = max_size
+        self._valid: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, address: str) -> bool:
+        if address in self._valid:
+            return True
+        if not self.check(address):
+            return False
+        if len(self._valid) < self.max_size:
+            with self._lock:
+                self._valid.add(address)
+        return True
+
+    def validate_many(self, addresses: Iterable[str]) -> list[bool]:
+        """Validate addresses in order."""
+        valid = self._valid
+        return [address in valid or self(address) for address in addresses]
+
+    def __len__(self) -> int:
+        return len(self._valid)
+
+
+solana_addresses = AddressValidator(is_solana_address)
+
+# Plain (picklable) checks per chain, for validating files across processes
+ADDRESS_CHECKS: dict[str, Callable[[str], bool]] = {
+    "solana": is_solana_address,
+}
+
+
+def _check_chunk(check: Callable[[str], bool], lines: list[str]) -> tuple[int, list[str]]:
+    """Worker: count valid addresses and return the invalid ones."""
+    invalid = [line for line in lines if not check(line)]
+    return len(lines) - len(invalid), invalid
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validate_file(
+    path: str,
+    chain: str = "solana",
+    workers: int | None = None,
+    chunk_size: int = 50_000,
+) -> Iterator[tuple[int, list[str]]]:
+    """Validate a file of addresses, one per line, across processes.
+
+    Yields ``(valid_count, invalid_addresses)`` per chunk, in file order.
+    Blank lines and ``#`` comments are skipped.
+    """
+    if chain not in ADDRESS_CHECKS:
+        raise ValueError(f"Bulk validation not supported for chain: {chain}")
+    check = ADDRESS_CHECKS[chain]
+    workers = workers or os.cpu_count() or 1
+    with open(path, encoding="utf-8") as f:
+        if workers == 1:
+            for chunk in _chunks(f, chunk_size):
+                yield _check_chunk(check, chunk)
+            return
+        # Keep a few chunks per worker in flight so the file is never all in memory
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque = deque()
+            for chunk in _chunks(f, chunk_size):
+                pending.append(executor.submit(_check_chunk, check, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def measure_file(path: str, chain: str = "solana", workers: int | None = None) -> dict:
+    """Validate a file and report counts, invalid addresses and throughput."""
+    started = time.perf_counter()
+    valid, invalid = 0, []
+    for count, bad in validate_file(path, chain, workers):
+        valid += count
+        invalid.extend(bad)
+    seconds = time.perf_counter() - started
+    total = valid + len(invalid)
+    return {
+        "total": total,
+        "valid": valid,
+        "invalid": invalid,
+        "seconds": seconds,
+        "per_second": total / seconds if seconds else 0.0,
+    }
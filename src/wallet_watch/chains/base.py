@@ -1,7 +1,27 @@
 """Base class for blockchain providers."""
 
 from abc import ABC, abstractmethod
-from typing import Callable, Any
+from typing import Any, Callable, Iterable, Iterator
+
+from wallet_watch.chains.decode import iter_json_items
+from wallet_watch.metrics import FAST_BUCKETS, REGISTRY
+
+
+WEBHOOK_PARSE_SECONDS = REGISTRY.histogram(
+    "wallet_watch_webhook_parse_seconds", "Time to decode a webhook body", ("chain",), FAST_BUCKETS
+)
+WEBHOOK_PROCESS_SECONDS = REGISTRY.histogram(
+    "wallet_watch_webhook_process_seconds",
+    "Time to process a decoded webhook payload, including notification and storage",
+    ("chain",),
+    FAST_BUCKETS,
+)
+TRANSACTIONS_TOTAL = REGISTRY.counter(
+    "wallet_watch_transactions_total", "Transactions received in webhooks", ("chain",)
+)
+PREFILTER_DROPPED_TOTAL = REGISTRY.counter(
+    "wallet_watch_prefilter_dropped_total", "Transactions dropped by the pre-filter", ("chain", "rule")
+)
 
 
 class ChainBase(ABC):
@@ -26,6 +46,17 @@ class ChainBase(ABC):
         """
         pass
 
+    def validate_addresses(self, addresses: list[str]) -> list[bool]:
+        """Validate many addresses at once.
+
+        Args:
+            addresses: Wallet addresses to validate
+
+        Returns:
+            One result per address, in order
+        """
+        return [self.validate_address(address) for address in addresses]
+
     @abstractmethod
     def subscribe(self, address: str, callback: Callable) -> None:
         """Subscribe to transactions for an address.
@@ -45,6 +76,38 @@ class ChainBase(ABC):
         """
         pass
 
+    def subscribe_many(self, addresses: list[str], callback: Callable) -> list[str]:
+        """Subscribe to transactions for many addresses.
+
+        Providers that sync subscriptions remotely should override this to
+        push a single update for the whole batch.
+
+        Args:
+            addresses: The wallet addresses to watch
+            callback: Function to call with Transaction when activity detected
+
+        Returns:
+            The addresses that were subscribed
+        """
+        subscribed = []
+        for address in addresses:
+            try:
+                self.subscribe(address, callback)
+                subscribed.append(address)
+            except ValueError as e:
+                import logging
+                logging.getLogger(__name__).error(f"Subscribe error: {e}")
+        return subscribed
+
+    def unsubscribe_many(self, addresses: list[str]) -> None:
+        """Unsubscribe from many addresses.
+
+        Args:
+            addresses: The wallet addresses to stop watching
+        """
+        for address in addresses:
+            self.unsubscribe(address)
+
     @abstractmethod
     def get_balance(self, address: str) -> float:
         """Get the native token balance for an address.
@@ -57,14 +120,78 @@ class ChainBase(ABC):
         """
         pass
 
-    @abstractmethod
-    def run(self) -> None:
-        """Start the provider's event loop.
+    def process_payload(self, data: Any) -> None:
+        """Process a parsed webhook payload, notifying subscribers."""
+        items = data if isinstance(data, list) else [data]
+        self.process_items((item, None) for item in items)
+
+    def decode_webhook(self, body: bytes) -> Iterator[tuple[dict, str]]:
+        """Decode a webhook body into ``(transaction, source_text)`` pairs as they are parsed.
 
-        This method should block and process incoming transactions.
+        Providers may override this to keep only the fields they use.
+        """
+        return iter_json_items(body)
+
+    def process_items(self, items: Iterable[tuple[dict, str | None]]) -> None:
+        """Process decoded transactions with their source JSON, if known.
+
+        Cluster workers call this with items forwarded by the front process.
+        """
+        raise NotImplementedError(f"{self.name} does not accept webhook payloads")
+
+    def involved_addresses(self, tx_data: dict) -> set[str]:
+        """Addresses touched by a raw webhook transaction.
+
+        Used to route payloads to the worker that owns each address.
+        """
+        return set()
+
+    def authorize_webhook(self, request: Any) -> bool:
+        """Whether a webhook request carries this provider's credentials.
+
+        Checked by the ingest server before anything else about the request.
+        """
+        return True
+
+    def handle_webhook(self, request: Any) -> tuple[dict, int]:
+        """Handle a webhook request routed to this provider by the ingest server.
+
+        Args:
+            request: The incoming Flask request
+
+        Returns:
+            JSON body and HTTP status code
+        """
+        return {"error": f"{self.name} does not accept webhooks"}, 404
+
+    def start(self) -> None:
+        """Start background work such as polling or WebSocket streams.
+
+        Must not block. Providers that only receive webhooks need not
+        override this.
         """
         pass
 
+    def stop(self) -> None:
+        """Stop background work and flush pending subscription changes."""
+        pass
+
+    def healthy(self) -> bool:
+        """Whether background work is running; unhealthy providers are restarted."""
+        return True
+
+    def run(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        """Serve this provider alone on an ingest server (blocking)."""
+        from wallet_watch.server import IngestServer
+
+        server = IngestServer()
+        server.mount(self)
+        self.start()
+        try:
+            server.serve(host=host, port=port)
+        finally:
+            self.stop()
+
     def add_callback(self, address: str, callback: Callable) -> None:
         """Add a callback for an address."""
         if address not in self.subscriptions:
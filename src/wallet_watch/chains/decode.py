@@ -0,0 +1,62 @@
+"""Incremental decoding of webhook bodies.
+
+Webhook bodies are usually a JSON array of transactions. Instead of
+building the whole array, ``iter_json_items`` decodes one element at a
+time with ``JSONDecoder.raw_decode`` and yields it together with its
+exact source text. A caller that keeps only the fields it needs holds at
+most one full transaction tree at a time, and can store the source text
+without serializing the object again.
+"""
+
+import json
+from typing import Any, Iterator
+
+_decode = json.JSONDecoder().raw_decode
+
+_WHITESPACE = " \t\n\r"
+
+
+def _skip(text: str, pos: int, chars: str = _WHITESPACE) -> int:
+    while pos < len(text) and text[pos] in chars:
+        pos += 1
+    return pos
+
+
+def iter_json_items(body: bytes | str) -> Iterator[tuple[Any, str]]:
+    """Yield ``(item, source_text)`` for each element of a top-level JSON array.
+
+    A top-level value that is not an array is yielded as the only item.
+
+    Raises:
+        ValueError: If the body is not valid JSON; items before the error
+            have already been yielded
+    """
+    text = body.decode("utf-8") if isinstance(body, (bytes, bytearray)) else body
+    pos = _skip(text, 0)
+    if pos == len(text):
+        raise ValueError("Empty JSON body")
+
+    if text[pos] != "[":
+        item, end = _decode(text, pos)
+        if _skip(text, end) != len(text):
+            raise ValueError(f"Extra data after JSON value at offset {end}")
+        yield item, text[pos:end]
+        return
+
+    pos = _skip(text, pos + 1)
+    if pos < len(text) and text[pos] == "]":
+        return
+    while True:
+        item, end = _decode(text, pos)
+        yield item, text[pos:end]
+        pos = _skip(text, end)
+        if pos >= len(text):
+            raise ValueError("Unterminated JSON array")
+        if text[pos] == "]":
+            break
+        if text[pos] != ",":
+            raise ValueError(f"Expected ',' or ']' at offset {pos}")
+        pos = _skip(text, pos + 1)
+
+    if _skip(text, pos + 1) != len(text):
+        raise ValueError(f"Extra data after JSON array at offset {pos + 1}")
@@ -1,21 +1,47 @@
 """Solana blockchain provider using Helius."""
 
+import hmac
 import json
 import logging
+import threading
 import time
 from datetime import datetime
-from typing import Callable
-
-import base58
-import requests
-from flask import Flask, request, jsonify
-
-from wallet_watch.chains.base import ChainBase
+from typing import Callable, Iterable, Iterator
+
+from wallet_watch.chains.addresses import solana_addresses
+from wallet_watch.chains.base import (
+    PREFILTER_DROPPED_TOTAL,
+    TRANSACTIONS_TOTAL,
+    WEBHOOK_PARSE_SECONDS,
+    WEBHOOK_PROCESS_SECONDS,
+    ChainBase,
+)
+from wallet_watch.chains.decode import iter_json_items
 from wallet_watch.models import Transaction
+from wallet_watch.tracing import Tracer, span
 
 
 logger = logging.getLogger(__name__)
 
+# Fields of a Helius enhanced transaction the pipeline reads; accountData
+# is cut down to its account addresses
+TRANSACTION_FIELDS = (
+    "signature", "type", "source", "timestamp", "description", "fee", "feePayer", "slot",
+    "transactionError", "nativeTransfers", "tokenTransfers",
+)
+
+
+def project_transaction(tx_data: dict) -> dict:
+    """Keep only the fields the pipeline uses, dropping instructions and events."""
+    if not isinstance(tx_data, dict):
+        return tx_data
+    projected = {field: tx_data[field] for field in TRANSACTION_FIELDS if field in tx_data}
+    if "accountData" in tx_data:
+        projected["accountData"] = [
+            {"account": account.get("account", "")} for account in tx_data["accountData"] or []
+        ]
+    return projected
+
 
 class SolanaProvider(ChainBase):
     """Solana blockchain provider using Helius for webhooks."""
@@ -31,86 +57,134 @@ class SolanaProvider(ChainBase):
         self.webhook_secret = kwargs.get("webhook_secret", "")
         self.webhook_url = kwargs.get("webhook_url", "")
 
-        # Flask app for receiving webhooks
-        self.app = Flask(__name__)
-        self._setup_routes()
+        # Optional PreFilter that drops spam and dust before parsing
+        self.prefilter = kwargs.get("prefilter")
 
-    def _setup_routes(self):
-        """Setup Flask routes for webhook handling."""
+        # Samples transactions for tracing; the default traces nothing
+        self.tracer = kwargs.get("tracer") or Tracer()
 
-        @self.app.route("/webhook", methods=["POST"])
-        def handle_webhook():
-            # Verify auth header if configured
-            if self.webhook_secret:
-                auth = request.headers.get("Authorization", "")
-                if auth != self.webhook_secret:
-                    return jsonify({"error": "Unauthorized"}), 401
+        # Cluster workers leave the Helius address list to the front process
+        self.sync_subscriptions = kwargs.get("sync_subscriptions", True)
 
-            try:
-                data = request.get_json()
-                self._process_webhook_data(data)
-                return jsonify({"status": "ok"}), 200
-            except Exception as e:
-                logger.error(f"Webhook processing error: {e}")
-                return jsonify({"error": str(e)}), 500
+        # Subscription changes within this window share one Helius update
+        self.sync_delay = kwargs.get("sync_delay", 1.0)
+        self._sync_lock = threading.Lock()
+        self._sync_timer: threading.Timer | None = None
 
-        @self.app.route("/health", methods=["GET"])
-        def health():
-            return jsonify({"status": "healthy"}), 200
+        self._parse_seconds = WEBHOOK_PARSE_SECONDS.labels(chain=self.name)
+        self._process_seconds = WEBHOOK_PROCESS_SECONDS.labels(chain=self.name)
+        self._transactions = TRANSACTIONS_TOTAL.labels(chain=self.name)
 
-    def _process_webhook_data(self, data: list | dict):
-        """Process incoming webhook data from Helius."""
-        if isinstance(data, dict):
-            data = [data]
+    def authorize_webhook(self, request) -> bool:
+        """Check the Helius auth header if a webhook secret is configured."""
+        if not self.webhook_secret:
+            return True
+        supplied = request.headers.get("Authorization", "")
+        return hmac.compare_digest(supplied.encode(), self.webhook_secret.encode())
+
+    def handle_webhook(self, request) -> tuple[dict, int]:
+        """Handle a Helius webhook request."""
+        if not self.authorize_webhook(request):
+            return {"error": "Unauthorized"}, 401
 
-        for tx_data in data:
+        try:
+            self.process_items(self.decode_webhook(request.get_data(cache=False)))
+            return {"status": "ok"}, 200
+        except Exception as e:
+            logger.error(f"Webhook processing error: {e}")
+            return {"error": str(e)}, 500
+
+    def decode_webhook(self, body: bytes) -> Iterator[tuple[dict, str]]:
+        """Decode a Helius body one transaction at a time, keeping only the fields used."""
+        for tx_data, source in iter_json_items(body):
+            yield project_transaction(tx_data), source
+
+    def _process_webhook_data(self, data: list | dict):
+        """Process parsed webhook data from Helius."""
+        self.process_payload(data)
+
+    def process_items(self, items: Iterable[tuple[dict, str | None]]) -> None:
+        """Process Helius transactions, timing decoding separately when items are parsed lazily."""
+        started = time.perf_counter()
+        parse_seconds = 0.0
+        count = 0
+        items = iter(items)
+
+        while True:
+            decode_started = time.perf_counter()
+            item = next(items, None)
+            parse_seconds += time.perf_counter() - decode_started
+            if item is None:
+                break
+            tx_data, source = item
+            count += 1
             try:
-                # Extract transaction info
                 signature = tx_data.get("signature", "")
-                description = tx_data.get("description", "")
-                tx_type = tx_data.get("type", "unknown")
-                timestamp = tx_data.get("timestamp")
-
-                # Find which watched address this relates to
-                account_data = tx_data.get("accountData", [])
-                native_transfers = tx_data.get("nativeTransfers", [])
-                token_transfers = tx_data.get("tokenTransfers", [])
-
-                # Collect all addresses involved
-                addresses_involved = set()
-                for acc in account_data:
-                    addresses_involved.add(acc.get("account", ""))
-                for transfer in native_transfers:
-                    addresses_involved.add(transfer.get("fromUserAccount", ""))
-                    addresses_involved.add(transfer.get("toUserAccount", ""))
-                for transfer in token_transfers:
-                    addresses_involved.add(transfer.get("fromUserAccount", ""))
-                    addresses_involved.add(transfer.get("toUserAccount", ""))
-
-                # Notify subscribers
-                for address in addresses_involved:
-                    if address in self.subscriptions:
-                        tx = Transaction(
-                            signature=signature,
-                            chain="solana",
-                            address=address,
-                            tx_type=tx_type,
-                            description=description,
-                            timestamp=datetime.fromtimestamp(timestamp) if timestamp else None,
-                            raw=tx_data,
-                        )
-                        self.notify_callbacks(address, tx)
-
+                transfers = len(tx_data.get("nativeTransfers") or []) + len(tx_data.get("tokenTransfers") or [])
+                with self.tracer.trace("transaction", chain=self.name, signature=signature, transfers=transfers):
+                    self._process_transaction(tx_data, source)
             except Exception as e:
                 logger.error(f"Error processing transaction: {e}")
 
+        self._transactions.inc(count)
+        self._parse_seconds.observe(parse_seconds)
+        self._process_seconds.observe(time.perf_counter() - started - parse_seconds)
+
+    def _process_transaction(self, tx_data: dict, source: str | None = None):
+        """Filter and parse one Helius transaction, then notify its watched addresses."""
+        with span("ingest"):
+            if self.prefilter is not None:
+                rule = self.prefilter.check(tx_data, self.subscriptions)
+                if rule:
+                    PREFILTER_DROPPED_TOTAL.labels(chain=self.name, rule=rule).inc()
+                    logger.debug(f"Dropped {tx_data.get('signature', '')[:16]}... by prefilter rule {rule}")
+                    return
+
+            # Extract transaction info
+            signature = tx_data.get("signature", "")
+            description = tx_data.get("description", "")
+            tx_type = tx_data.get("type", "unknown")
+            timestamp = tx_data.get("timestamp")
+
+            txs = [
+                Transaction(
+                    signature=signature,
+                    chain="solana",
+                    address=address,
+                    tx_type=tx_type,
+                    description=description,
+                    timestamp=datetime.fromtimestamp(timestamp) if timestamp else None,
+                    raw=tx_data,
+                    raw_json=source,
+                )
+                for address in self.involved_addresses(tx_data)
+                if address in self.subscriptions
+            ]
+
+        # Notify subscribers
+        for tx in txs:
+            self.notify_callbacks(tx.address, tx)
+
+    def involved_addresses(self, tx_data: dict) -> set[str]:
+        """All accounts a Helius transaction touches."""
+        addresses = set()
+        for acc in tx_data.get("accountData", []):
+            addresses.add(acc.get("account", ""))
+        for transfer in tx_data.get("nativeTransfers", []):
+            addresses.add(transfer.get("fromUserAccount", ""))
+            addresses.add(transfer.get("toUserAccount", ""))
+        for transfer in tx_data.get("tokenTransfers", []):
+            addresses.add(transfer.get("fromUserAccount", ""))
+            addresses.add(transfer.get("toUserAccount", ""))
+        return addresses
+
     def validate_address(self, address: str) -> bool:
-        """Validate Solana address format."""
-        try:
-            decoded = base58.b58decode(address)
-            return len(decoded) == 32
-        except Exception:
-            return False
+        """Validate Solana address format (base58 decoding to 32 bytes)."""
+        return solana_addresses(address)
+
+    def validate_addresses(self, addresses: list[str]) -> list[bool]:
+        """Validate many addresses, reusing earlier results."""
+        return solana_addresses.validate_many(addresses)
 
     def subscribe(self, address: str, callback: Callable) -> None:
         """Subscribe to transactions for an address."""
@@ -121,7 +195,23 @@ class SolanaProvider(ChainBase):
         logger.info(f"Subscribed to Solana address: {address}")
 
         # Update Helius webhook with new address list
-        self._update_webhook()
+        self._schedule_webhook_update()
+
+    def subscribe_many(self, addresses: list[str], callback: Callable) -> list[str]:
+        """Subscribe to many addresses with a single webhook update."""
+        subscribed = []
+        for address, valid in zip(addresses, self.validate_addresses(addresses)):
+            if not valid:
+                logger.error(f"Invalid Solana address: {address}")
+                continue
+            self.add_callback(address, callback)
+            subscribed.append(address)
+
+        logger.info(f"Subscribed to {len(subscribed)} Solana addresses")
+
+        if subscribed:
+            self._schedule_webhook_update()
+        return subscribed
 
     def unsubscribe(self, address: str) -> None:
         """Unsubscribe from an address."""
@@ -129,10 +219,51 @@ class SolanaProvider(ChainBase):
         logger.info(f"Unsubscribed from Solana address: {address}")
 
         # Update Helius webhook
+        self._schedule_webhook_update()
+
+    def unsubscribe_many(self, addresses: list[str]) -> None:
+        """Unsubscribe from many addresses with a single webhook update."""
+        for address in addresses:
+            self.remove_callbacks(address)
+
+        logger.info(f"Unsubscribed from {len(addresses)} Solana addresses")
+
+        if addresses:
+            self._schedule_webhook_update()
+
+    def _schedule_webhook_update(self):
+        """Coalesce subscription changes into one Helius webhook update."""
+        if not self.sync_subscriptions:
+            return
+        if self.sync_delay <= 0:
+            self._update_webhook()
+            return
+
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                return
+            self._sync_timer = threading.Timer(self.sync_delay, self._run_scheduled_update)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def stop(self) -> None:
+        """Push a pending debounced webhook update now instead of dropping it."""
+        with self._sync_lock:
+            timer, self._sync_timer = self._sync_timer, None
+        if timer is not None:
+            timer.cancel()
+            self._update_webhook()
+
+    def _run_scheduled_update(self):
+        """Timer target: clear the pending marker, then push the address list."""
+        with self._sync_lock:
+            self._sync_timer = None
         self._update_webhook()
 
     def _update_webhook(self):
         """Update Helius webhook with current address list."""
+        import requests
+
         if not self.webhook_id or not self.helius_api_key:
             logger.warning("Webhook ID or API key not configured, skipping webhook update")
             return
@@ -160,6 +291,8 @@ class SolanaProvider(ChainBase):
 
     def get_balance(self, address: str) -> float:
         """Get SOL balance for an address."""
+        import requests
+
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
@@ -178,6 +311,8 @@ class SolanaProvider(ChainBase):
 
     def get_recent_transactions(self, address: str, limit: int = 10) -> list[dict]:
         """Get recent transactions for an address."""
+        import requests
+
         payload = {
             "jsonrpc": "2.0",
             "id": 1,
@@ -192,8 +327,3 @@ class SolanaProvider(ChainBase):
         except Exception as e:
             logger.error(f"Failed to get transactions: {e}")
             return []
-
-    def run(self, host: str = "0.0.0.0", port: int = 8080) -> None:
-        """Start the webhook server."""
-        logger.info(f"Starting Solana webhook server on {host}:{port}")
-        self.app.run(host=host, port=port, threaded=True)
@@ -1,14 +1,16 @@
 """Command-line interface for Wallet Watch."""
 
+import json
 import logging
+import os
+import signal
 import sys
+import threading
 from pathlib import Path
 
 import click
 
 from wallet_watch import __version__
-from wallet_watch.config import load_config, get_default_config
-from wallet_watch.core import WalletWatch
 
 
 def setup_logging(level: str) -> None:
@@ -42,10 +44,22 @@ def main():
     help="Logging level",
     type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]),
 )
-def start(config: str, log_level: str):
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    envvar="WORKERS",
+    help="Worker processes; more than 1 partitions addresses across processes",
+    type=click.IntRange(min=1),
+)
+def start(config: str, log_level: str, workers: int):
     """Start the wallet watcher."""
+    from wallet_watch.config import get_default_config, load_config
+    from wallet_watch.core import WalletWatch
+
     setup_logging(log_level)
     logger = logging.getLogger("wallet_watch")
+    watcher = None
 
     try:
         if Path(config).exists():
@@ -55,12 +69,27 @@ def start(config: str, log_level: str):
             cfg = get_default_config()
             logger.warning(f"Config file {config} not found, using defaults")
 
-        watcher = WalletWatch(cfg)
-        logger.info("Starting Wallet Watch...")
+        if workers > 1:
+            from wallet_watch.cluster import Cluster
+
+            watcher = Cluster(cfg, workers=workers, log_level=log_level)
+            logger.info(f"Starting Wallet Watch with {workers} workers...")
+        else:
+            watcher = WalletWatch(cfg)
+            logger.info("Starting Wallet Watch...")
+
+        # Railway and Docker send SIGTERM on deploy; shut down like Ctrl+C
+        def on_sigterm(signum, frame):
+            logger.info("Received SIGTERM, shutting down...")
+            watcher.request_shutdown()
+
+        signal.signal(signal.SIGTERM, on_sigterm)
         watcher.run()
 
     except KeyboardInterrupt:
         logger.info("Shutting down...")
+        if watcher:
+            watcher.stop()
         sys.exit(0)
     except Exception as e:
         logger.exception(f"Fatal error: {e}")
@@ -77,6 +106,8 @@ def start(config: str, log_level: str):
 )
 def validate(config: str):
     """Validate configuration file."""
+    from wallet_watch.config import load_config
+
     try:
         cfg = load_config(config)
         click.echo(f"Config valid: {len(cfg.chains)} chains, {len(cfg.notifiers)} notifiers, {len(cfg.watches)} watches")
@@ -93,10 +124,19 @@ def health():
 
 
 @main.command()
-@click.argument("address")
+@click.argument("address", required=False)
 @click.option("--chain", "-c", default="solana", help="Blockchain name")
-def check(address: str, chain: str):
-    """Check if an address is valid."""
+@click.option("--file", "-f", "file_path", type=click.Path(exists=True), help="File with one address per line")
+@click.option("--workers", "-w", type=click.IntRange(min=1), default=None, help="Processes for --file (default: CPUs)")
+def check(address: str | None, chain: str, file_path: str | None, workers: int | None):
+    """Check if an address, or every address in a file, is valid."""
+    if file_path:
+        _check_file(file_path, chain, workers)
+        return
+    if not address:
+        click.echo("Give an address or --file", err=True)
+        sys.exit(1)
+
     from wallet_watch.chains import get_chain_provider
 
     try:
@@ -111,6 +151,290 @@ def check(address: str, chain: str):
         sys.exit(1)
 
 
+def _check_file(path: str, chain: str, workers: int | None) -> None:
+    """Validate a file of addresses in parallel and report throughput."""
+    from wallet_watch.chains.addresses import measure_file
+
+    try:
+        result = measure_file(path, chain, workers)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    for address in result["invalid"]:
+        click.echo(f"Invalid {chain} address: {address}", err=True)
+    click.echo(
+        f"{result['valid']} valid, {len(result['invalid'])} invalid of {result['total']} addresses "
+        f"in {result['seconds']:.2f}s ({result['per_second']:,.0f}/s)"
+    )
+    if result["invalid"]:
+        sys.exit(1)
+
+
+def _parse_time(value: str | None):
+    """An ISO date/time, or a time that long ago such as ``30m``, ``24h`` or ``7d``; UTC if no zone."""
+    from datetime import datetime, timedelta, timezone
+
+    if value is None:
+        return None
+    units = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    if value[-1:] in units and value[:-1].isdigit():
+        return datetime.now(timezone.utc) - timedelta(**{units[value[-1]]: int(value[:-1])})
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise click.BadParameter(f"{value!r} is not a date, time or duration like 24h") from None
+
+
+@main.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option("--config", "-c", default="config.yaml", help="Path to config file", type=click.Path())
+@click.option("--db", default=None, help="SQLite database to search instead of the configured storage", type=click.Path(exists=True))
+@click.option("--address", "-a", default=None, help="Only transactions of this address")
+@click.option("--since", default=None, help="Only transactions since this time, e.g. 2026-01-31 or 24h")
+@click.option("--until", default=None, help="Only transactions before this time")
+@click.option("--limit", "-n", default=20, help="Maximum results", type=click.IntRange(min=1))
+@click.option("--order", default="rank", help="Best matches or most recent first", type=click.Choice(["rank", "newest"]))
+@click.option("--raw", is_flag=True, help="Pass the query to SQLite FTS5 unchanged")
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+def search(query, config, db, address, since, until, limit, order, raw, as_json):
+    """Search stored transaction descriptions.
+
+    Every word must appear; quote a phrase to match it exactly and end a
+    word with * to match a prefix, as in: wallet-watch search 'BON*' swapped
+    """
+    since, until = _parse_time(since), _parse_time(until)
+    if db:
+        from wallet_watch.storage.sqlite import SQLiteStorage
+
+        storage = SQLiteStorage(db)
+    else:
+        from wallet_watch.config import get_default_config, load_config
+        from wallet_watch.storage import get_storage
+
+        cfg = load_config(config) if Path(config).exists() else get_default_config()
+        storage = get_storage(cfg.storage)
+
+    try:
+        results = storage.search_transactions(
+            " ".join(query), address=address, since=since, until=until, limit=limit, order=order, raw=raw
+        )
+    except (ValueError, NotImplementedError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        storage.close()
+
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+    for result in results:
+        click.echo(f"{result['created_at']}  {result['address']}  {result['signature']}")
+        click.echo(f"    {result['snippet']}")
+    click.echo(f"{len(results)} transactions")
+
+
+@main.command()
+@click.option("--output", "-o", default="capture.jsonl.gz", help="Capture file (gzipped JSON lines)", type=click.Path())
+@click.option("--host", default="0.0.0.0", help="Address to listen on")
+@click.option("--port", "-p", default=9000, help="Port to listen on")
+@click.option("--forward", "-f", default=None, help="Instance URL to pass webhooks on to, e.g. http://localhost:8080")
+def record(output: str, host: str, port: int, forward: str | None):
+    """Record incoming webhooks for later replay."""
+    from wallet_watch.loadtest import WebhookRecorder
+
+    setup_logging("INFO")
+    recorder = WebhookRecorder(output, forward=forward)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=recorder.shutdown).start())
+    try:
+        recorder.serve(host, port)
+    except KeyboardInterrupt:
+        recorder.shutdown()
+    click.echo(f"Recorded {recorder.recorded} webhooks to {output}")
+
+
+@main.command()
+@click.argument("capture", type=click.Path(exists=True))
+@click.option("--target", "-t", default=f"http://localhost:{os.getenv('PORT', '8080')}", help="Instance to replay to")
+@click.option("--speed", "-s", default=1.0, help="Replay speed factor; 0 sends as fast as possible")
+@click.option("--rps", type=float, default=None, help="Send open-loop at this request rate instead")
+@click.option("--duration", "-d", type=float, default=None, help="Seconds to send for with --rps")
+@click.option("--loops", default=1, help="Passes over the capture")
+@click.option("--concurrency", "-n", default=32, help="Concurrent connections")
+@click.option("--sink-port", default=9100, help="Port of the local Telegram/webhook sink; 0 disables it")
+@click.option("--settle", default=10.0, help="Seconds to wait for outstanding alerts")
+@click.option("--output", "-o", default=None, help="Write the report to this JSON file", type=click.Path())
+def replay(capture, target, speed, rps, duration, loops, concurrency, sink_port, settle, output):
+    """Replay recorded webhooks against a running instance.
+
+    To measure alert latency and loss, configure the instance's notifiers
+    to deliver to the local sink: Telegram with
+    ``api_url: http://127.0.0.1:9100/bot{0}/{1}`` and webhooks with
+    ``webhook_url: http://127.0.0.1:9100/hook``. Transactions that don't
+    match a watch or the filters never alert and count as missing.
+    """
+    from wallet_watch.loadtest import AlertSink, Replayer, read_capture
+
+    entries = read_capture(capture)
+    sink = None
+    if sink_port:
+        sink = AlertSink(port=sink_port)
+        sink.start()
+        click.echo(f"Alert sink listening on {sink.url}")
+
+    try:
+        replayer = Replayer(
+            target, entries, sink=sink, speed=speed, rps=rps, duration=duration, loops=loops,
+            concurrency=concurrency,
+        )
+        click.echo(f"Replaying {len(entries)} captured webhooks to {target}")
+        elapsed = replayer.run()
+        replayer.wait_for_alerts(settle)
+        report = replayer.report(elapsed)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        if sink is not None:
+            sink.stop()
+
+    click.echo(json.dumps(report, indent=2))
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2) + "\n")
+
+
+def _read_address_file(path: str) -> list[dict]:
+    """Read watches from a JSON list or a text file with one address per line."""
+    text = Path(path).read_text()
+
+    if path.endswith(".json"):
+        items = json.loads(text)
+        return [item if isinstance(item, dict) else {"address": item} for item in items]
+
+    entries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            entries.append({"address": line})
+    return entries
+
+
+def _admin_request(method: str, url: str, token: str, payload: dict | None = None) -> dict:
+    """Call the admin API of a running instance."""
+    import requests
+
+    response = requests.request(
+        method,
+        f"{url.rstrip('/')}/admin/watches",
+        json=payload,
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=60,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+admin_options = [
+    click.option(
+        "--url",
+        default=f"http://localhost:{os.getenv('PORT', '8080')}",
+        help="Base URL of the running instance",
+    ),
+    click.option(
+        "--token",
+        envvar="ADMIN_TOKEN",
+        required=True,
+        help="Admin API token (or ADMIN_TOKEN env var)",
+    ),
+]
+
+
+def with_admin_options(func):
+    """Attach the shared --url/--token options."""
+    for option in reversed(admin_options):
+        func = option(func)
+    return func
+
+
+@main.group()
+def watches():
+    """Manage watches on a running instance."""
+    pass
+
+
+@watches.command("add")
+@click.argument("addresses", nargs=-1)
+@click.option("--file", "-f", "file_path", type=click.Path(exists=True), help="JSON or text file of watches")
+@click.option("--chain", "-c", default="solana", help="Blockchain name")
+@click.option("--label", default="", help="Label for the watches")
+@click.option("--notify", "-n", multiple=True, help="Notifier to use (repeatable)")
+@click.option("--recipient", "-r", multiple=True, help="Recipient such as a chat ID (repeatable)")
+@with_admin_options
+def watches_add(addresses, file_path, chain, label, notify, recipient, url, token):
+    """Add watches in bulk without restarting."""
+    entries = [{"address": address} for address in addresses]
+    if file_path:
+        entries.extend(_read_address_file(file_path))
+
+    if not entries:
+        click.echo("No addresses given", err=True)
+        sys.exit(1)
+
+    for entry in entries:
+        entry.setdefault("chain", chain)
+        entry.setdefault("label", label)
+        entry.setdefault("notify", list(notify))
+        entry.setdefault("recipients", list(recipient))
+
+    try:
+        result = _admin_request("POST", url, token, {"watches": entries})
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"Added {result['added']} watches")
+    for item in result["rejected"]:
+        click.echo(f"Rejected {item['address']}: {item['error']}", err=True)
+
+
+@watches.command("remove")
+@click.argument("addresses", nargs=-1)
+@click.option("--file", "-f", "file_path", type=click.Path(exists=True), help="JSON or text file of watches")
+@with_admin_options
+def watches_remove(addresses, file_path, url, token):
+    """Remove watches in bulk without restarting."""
+    targets = list(addresses)
+    if file_path:
+        targets.extend(entry["address"] for entry in _read_address_file(file_path))
+
+    if not targets:
+        click.echo("No addresses given", err=True)
+        sys.exit(1)
+
+    try:
+        result = _admin_request("DELETE", url, token, {"addresses": targets})
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"Removed {result['removed']} watches")
+
+
+@watches.command("list")
+@with_admin_options
+def watches_list(url, token):
+    """List watches on a running instance."""
+    try:
+        result = _admin_request("GET", url, token)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+    for watch in result["watches"]:
+        click.echo(f"{watch['chain']}\t{watch['address']}\t{watch['label']}")
+    click.echo(f"{result['count']} watches")
+
+
 @main.command()
 def init():
     """Initialize a new config file."""
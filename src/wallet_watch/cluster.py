@@ -0,0 +1,299 @@
+"""Multi-process mode: one ingest front and address-partitioned workers.
+
+The front process receives every webhook and forwards each transaction
+to the worker that owns the watched addresses it touches, chosen by
+consistent hash. Each worker runs its own WalletWatch with its own
+storage file, notifiers and outbox, so workers share nothing and all
+work on one address stays in order in one process.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from wallet_watch.chains import get_chain_provider
+from wallet_watch.chains.base import ChainBase
+from wallet_watch.config import Config, WatchConfig
+from wallet_watch.partition import Partition
+from wallet_watch.server import IngestServer
+
+
+logger = logging.getLogger(__name__)
+
+
+def worker_storage_path(path: str, index: int) -> str:
+    """Storage file for a worker, e.g. data/wallet_watch.worker0.db."""
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.worker{index}{p.suffix}"))
+
+
+def _run_worker(
+    index: int,
+    count: int,
+    config_data: dict,
+    watches: list[dict],
+    inbox: multiprocessing.Queue,
+    log_level: str,
+) -> None:
+    """Worker process: own WalletWatch fed from the front's queue."""
+    from wallet_watch.core import WalletWatch
+
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format=f"%(asctime)s [worker{index}] %(name)s %(levelname)s: %(message)s",
+    )
+
+    config = Config.model_validate(config_data)
+    config.storage.path = worker_storage_path(config.storage.path, index)
+    watcher = WalletWatch(config, partition=Partition(index, count))
+    result = watcher.add_watches([WatchConfig(**watch) for watch in watches], persist=False)
+    watcher.start_background()
+    logger.info(f"Worker {index} owns {result['added']} watches")
+
+    try:
+        while True:
+            item = inbox.get()
+            if item is None:
+                break
+            chain_name, items = item
+            chain = watcher.chains.get(chain_name)
+            if chain is not None:
+                chain.process_items(items)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+
+
+class PartitionRouter:
+    """Ingest endpoint that forwards a chain's transactions to owning workers."""
+
+    def __init__(self, chain: ChainBase, partition: Partition, inboxes: list, retry_after: int = 5):
+        self.name = chain.name
+        self.chain = chain
+        self.partition = partition
+        self.inboxes = inboxes
+        self.retry_after = retry_after
+        self.forwarded = 0
+        self.unrouted = 0
+
+    def authorize_webhook(self, request) -> bool:
+        """Check the request against the chain's webhook credentials."""
+        return self.chain.authorize_webhook(request)
+
+    def handle_webhook(self, request) -> tuple[dict, int]:
+        """Split a webhook payload by owning worker and queue each part."""
+        if not self.authorize_webhook(request):
+            return {"error": "Unauthorized"}, 401
+
+        # Forward decoded (and for Helius, projected) transactions with their source JSON
+        parts: dict[int, list] = {}
+        try:
+            for tx_data, source in self.chain.decode_webhook(request.get_data(cache=False)):
+                owners = {
+                    self.partition.owner(address)
+                    for address in self.chain.involved_addresses(tx_data)
+                    if address in self.chain.subscriptions
+                }
+                if not owners:
+                    self.unrouted += 1
+                for owner in owners:
+                    parts.setdefault(owner, []).append((tx_data, source))
+        except ValueError as e:
+            return {"error": f"Invalid JSON: {e}"}, 400
+
+        # Workers drop duplicates, so a retry after a partial failure is safe
+        for owner, payload in parts.items():
+            try:
+                self.inboxes[owner].put_nowait((self.name, payload))
+            except queue.Full:
+                logger.warning(f"Worker {owner} queue full, rejecting webhook")
+                return {"error": "Overloaded", "retry_after": self.retry_after}, 503
+            self.forwarded += len(payload)
+
+        return {"status": "ok"}, 200
+
+
+class Cluster:
+    """Runs the ingest front and supervises partitioned worker processes."""
+
+    def __init__(self, config: Config, workers: int, log_level: str = "INFO", queue_size: int = 10_000):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if config.server.admin_token:
+            # Watches changed on the front would not reach the workers that own them
+            raise ValueError(
+                "The admin API is not served in multi-process mode; unset ADMIN_TOKEN or use one worker"
+            )
+
+        self.config = config
+        self.workers = workers
+        self.log_level = log_level
+        self.partition = Partition(0, workers)
+        self.context = multiprocessing.get_context("spawn")
+        self.inboxes = [self.context.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.processes: list[multiprocessing.Process | None] = [None] * workers
+        self.restarts = [0] * workers
+        self.chains: dict[str, ChainBase] = {}
+        self.server: IngestServer | None = None
+        self._watches: list[dict] = []
+        self._stopping = threading.Event()
+        self._shutdown_requested = False
+        self._monitor: threading.Thread | None = None
+
+    def _load_watches(self) -> list[WatchConfig]:
+        """Config watches, replaced by address with watches stored in the main database."""
+        from wallet_watch.core import _watch_from_row
+        from wallet_watch.storage import get_storage
+
+        watches: dict[str, list[WatchConfig]] = {}
+        for watch in self.config.watches:
+            watches.setdefault(watch.address, []).append(watch)
+
+        storage = get_storage(self.config.storage)
+        try:
+            stored: dict[str, list[WatchConfig]] = {}
+            for row in storage.get_watches():
+                stored.setdefault(row["address"], []).append(_watch_from_row(row))
+            watches.update(stored)
+        finally:
+            storage.close()
+
+        return [watch for group in watches.values() for watch in group]
+
+    def _spawn(self, index: int) -> None:
+        process = self.context.Process(
+            target=_run_worker,
+            args=(
+                index,
+                self.workers,
+                self.config.model_dump(),
+                self._watches,
+                self.inboxes[index],
+                self.log_level,
+            ),
+            name=f"wallet-watch-worker{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+
+    def start(self) -> IngestServer:
+        """Sync subscriptions, start the workers and build the front server."""
+        watches = self._load_watches()
+        self._watches = [watch.model_dump() for watch in watches]
+
+        # The front owns the full address list and the remote subscriptions
+        for chain_config in self.config.chains:
+            chain = get_chain_provider(
+                chain_config.name,
+                api_key=chain_config.api_key,
+                rpc_url=chain_config.rpc_url,
+                webhook_id=chain_config.webhook_id,
+                webhook_url=chain_config.webhook_url,
+                webhook_secret=chain_config.webhook_secret,
+            )
+            addresses = [watch.address for watch in watches if watch.chain == chain_config.name]
+            chain.subscribe_many(addresses, lambda tx: None)
+            self.chains[chain_config.name] = chain
+
+        if self.config.feed.enabled:
+            logger.warning("The live transaction feed is not served in multi-process mode")
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        self.server = IngestServer(health_check=self.health)
+        for chain in self.chains.values():
+            self.server.mount(
+                PartitionRouter(chain, self.partition, self.inboxes, self.config.priority.retry_after)
+            )
+
+        self._monitor = threading.Thread(target=self._supervise, name="cluster-monitor", daemon=True)
+        self._monitor.start()
+        logger.info(f"Cluster started with {self.workers} workers for {len(watches)} watches")
+        return self.server
+
+    def _supervise(self):
+        """Restart workers that exit unexpectedly."""
+        while not self._stopping.wait(1.0):
+            for index, process in enumerate(self.processes):
+                if process is not None and not process.is_alive() and not self._stopping.is_set():
+                    self.restarts[index] += 1
+                    logger.error(f"Worker {index} exited with {process.exitcode}, restarting")
+                    self._spawn(index)
+
+    def run(self) -> None:
+        """Start everything and serve webhooks (blocking)."""
+        server = self.start()
+        if self._shutdown_requested:
+            server.shutdown()
+        try:
+            server.serve(host=self.config.server.host, port=self.config.server.port)
+        finally:
+            self.stop()
+
+    def request_shutdown(self) -> None:
+        """Ask ``run`` to stop serving and shut down; safe to call from a signal handler."""
+        self._shutdown_requested = True
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, name="shutdown", daemon=True).start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop ingest, let workers drain their queues, and stop them."""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+
+        if timeout is None:
+            timeout = self.config.server.shutdown_timeout
+        deadline = time.monotonic() + timeout
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.drain(max(0.0, deadline - time.monotonic()))
+
+        # A worker whose queue stays full past the deadline is terminated without draining
+        stopping = []
+        for index, inbox in enumerate(self.inboxes):
+            try:
+                inbox.put(None, timeout=max(0.0, deadline - time.monotonic()))
+                stopping.append(index)
+            except queue.Full:
+                logger.warning(f"Worker {index} queue still full at shutdown, terminating")
+                self._terminate(index)
+
+        for index in stopping:
+            process = self.processes[index]
+            if process is None:
+                continue
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker {index} did not stop in time, terminating")
+                self._terminate(index)
+
+        for chain in self.chains.values():
+            chain.stop()
+
+    def _terminate(self, index: int) -> None:
+        """Kill a worker process and wait briefly for it to exit."""
+        process = self.processes[index]
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(timeout=1)
+
+    def health(self) -> dict[str, Any]:
+        """Report worker liveness; degraded while any worker is down."""
+        workers = {
+            str(index): {
+                "alive": process is not None and process.is_alive(),
+                "restarts": self.restarts[index],
+            }
+            for index, process in enumerate(self.processes)
+        }
+        healthy = all(worker["alive"] for worker in workers.values())
+        return {"status": "healthy" if healthy else "degraded", "workers": workers}
@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
@@ -20,6 +20,24 @@ class ChainConfig(BaseModel):
     webhook_secret: str = ""
 
 
+class BreakerConfig(BaseModel):
+    """Circuit breaker settings for a notifier.
+
+    The breaker opens when, over the last ``window`` seconds and at least
+    ``min_calls`` calls, the failure share reaches ``error_rate`` or the
+    share of calls slower than ``slow_call`` seconds reaches ``slow_rate``.
+    """
+
+    enabled: bool = True
+    error_rate: float = 0.5
+    slow_call: float = 5.0
+    slow_rate: float = 0.8
+    min_calls: int = 10
+    window: float = 60.0
+    open_seconds: float = 30.0
+    half_open_calls: int = 1
+
+
 class NotifierConfig(BaseModel):
     """Configuration for a notification provider."""
 
@@ -27,6 +45,24 @@ class NotifierConfig(BaseModel):
     bot_token: str = ""
     webhook_url: str = ""
     chat_id: str = ""
+    workers: int = 2
+    queue_size: int = 1000
+    breaker: BreakerConfig = Field(default_factory=BreakerConfig)
+    template: str = ""
+    options: dict[str, Any] = Field(default_factory=dict)
+
+
+class DigestConfig(BaseModel):
+    """Burst coalescing settings for a watch.
+
+    The first transaction after a quiet period is sent right away. Later
+    ones are collected until ``window`` seconds pass without activity, or
+    ``max_delay`` seconds after the first, and then sent as one digest.
+    """
+
+    window: float = 0
+    max_delay: float = 60
+    top_n: int = 5
 
 
 class WatchConfig(BaseModel):
@@ -36,7 +72,28 @@ class WatchConfig(BaseModel):
     chain: str
     label: str = ""
     notify: list[str] = Field(default_factory=list)
+    recipients: list[str] = Field(default_factory=list)
     filters: dict[str, Any] = Field(default_factory=dict)
+    digest: DigestConfig = Field(default_factory=DigestConfig)
+    template: str = ""
+    priority: int = 0
+
+
+class WatchFileConfig(BaseModel):
+    """An external CSV or JSON-lines file of watches.
+
+    Rows need an ``address``; other columns left empty take the defaults
+    set here. Lists in CSV cells are separated by ``;``. Relative paths
+    are resolved against the config file's directory.
+    """
+
+    path: str
+    chain: str = "solana"
+    label: str = ""
+    notify: list[str] = Field(default_factory=list)
+    recipients: list[str] = Field(default_factory=list)
+    priority: int = 0
+    template: str = ""
 
 
 class FilterConfig(BaseModel):
@@ -46,6 +103,44 @@ class FilterConfig(BaseModel):
     tx_types: list[str] = Field(default_factory=list)
 
 
+class PrefilterConfig(BaseModel):
+    """Spam and dust rules applied to raw webhook payloads.
+
+    Empty lists and zero thresholds disable the matching rule.
+    ``counterparty_limit`` also drops genuine transactions from busy
+    senders such as exchange hot wallets.
+    """
+
+    enabled: bool = True
+    mint_denylist: list[str] = Field(default_factory=list)
+    mint_allowlist: list[str] = Field(default_factory=list)
+    dust_lamports: int = 0
+    counterparty_limit: int = 0
+    counterparty_window: float = 3600.0
+    sketch_width: int = 2048
+    sketch_depth: int = 4
+
+
+class PriorityConfig(BaseModel):
+    """Priority scoring and load shedding.
+
+    A transaction scores its watch's ``priority``, plus one per reached
+    ``usd_tiers`` threshold, plus its ``tx_types`` bonus. When a notifier
+    queue is ``high_water`` full, notifications scoring below
+    ``shed_below`` are shed. At ``reject_water`` the webhook endpoint
+    answers 503 so the sender retries after ``retry_after`` seconds.
+    Both are off by default: nothing scores below 0 unless a watch has a
+    negative priority, and ``reject_water`` is unset.
+    """
+
+    usd_tiers: list[float] = Field(default_factory=lambda: [1_000, 100_000])
+    tx_types: dict[str, int] = Field(default_factory=dict)
+    high_water: float = 0.8
+    reject_water: float | None = None
+    shed_below: int = 0
+    retry_after: int = 5
+
+
 class StorageConfig(BaseModel):
     """Storage configuration."""
 
@@ -54,12 +149,79 @@ class StorageConfig(BaseModel):
     url: str = ""
 
 
+class OutboxConfig(BaseModel):
+    """Durable notification outbox and retry policy."""
+
+    enabled: bool = True
+    max_attempts: int = 8
+    base_delay: float = 2.0
+    max_delay: float = 300.0
+    poll_interval: float = 2.0
+    lease: float = 60.0
+    batch_size: int = 100
+
+
+class CoordinationConfig(BaseModel):
+    """Lease-based notification ownership for replicas sharing storage.
+
+    Addresses hash to ``partitions``. Each partition is delivered by the
+    one replica holding its lease in storage; leases last ``lease_seconds``
+    and are renewed every ``renew_interval`` seconds. Every replica keeps
+    ingesting and storing transactions; a transaction that reaches more
+    than one replica within ``dedupe_window`` seconds is notified once.
+    """
+
+    enabled: bool = False
+    node_id: str = ""
+    partitions: int = 16
+    lease_seconds: float = 10.0
+    renew_interval: float = 3.0
+    dedupe_window: float = 3600.0
+
+
+class TracingConfig(BaseModel):
+    """Trace sampling and stall detection.
+
+    A ``sample_rate`` fraction of transactions is traced to ``path`` as
+    JSON lines. Any webhook, notifier call or outbox poll running longer
+    than ``stall_threshold`` seconds logs its thread's stack; 0 disables it.
+    """
+
+    sample_rate: float = 0.0
+    path: str = "./data/traces.jsonl"
+    stall_threshold: float = 0.0
+
+
+class FeedConfig(BaseModel):
+    """Live transaction feed served as Server-Sent Events at ``/feed``.
+
+    Each client buffers up to ``buffer_size`` events. When a client falls
+    further behind, ``slow_policy`` "skip" discards its oldest events and
+    tells it how many were skipped; "drop" disconnects it. Clients resuming
+    with ``Last-Event-ID`` are sent up to ``replay_limit`` stored
+    transactions first. Each client writes at most once per ``linger``
+    seconds, so the cost of many clients doesn't grow with the event rate.
+    An empty ``token`` leaves the feed unauthenticated.
+    """
+
+    enabled: bool = False
+    token: str = ""
+    buffer_size: int = 1000
+    slow_policy: Literal["skip", "drop"] = "skip"
+    max_clients: int = 5000
+    replay_limit: int = 10_000
+    heartbeat: float = 15.0
+    linger: float = 0.1
+
+
 class ServerConfig(BaseModel):
     """Webhook server configuration."""
 
     port: int = int(os.getenv("PORT", "8080"))
     host: str = "0.0.0.0"
     secret: str = ""
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+    shutdown_timeout: float = float(os.getenv("SHUTDOWN_TIMEOUT", "8"))
 
 
 class Config(BaseModel):
@@ -68,9 +230,19 @@ class Config(BaseModel):
     chains: list[ChainConfig] = Field(default_factory=list)
     notifiers: list[NotifierConfig] = Field(default_factory=list)
     watches: list[WatchConfig] = Field(default_factory=list)
+    watch_files: list[WatchFileConfig] = Field(default_factory=list)
+    # Parsed watch files are cached here by content hash; "" disables it
+    watch_cache: str = "./data/watch_cache"
     filters: FilterConfig = Field(default_factory=FilterConfig)
+    prefilter: PrefilterConfig = Field(default_factory=PrefilterConfig)
+    templates: dict[str, str] = Field(default_factory=dict)
+    priority: PriorityConfig = Field(default_factory=PriorityConfig)
     storage: StorageConfig = Field(default_factory=StorageConfig)
+    outbox: OutboxConfig = Field(default_factory=OutboxConfig)
+    coordination: CoordinationConfig = Field(default_factory=CoordinationConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
     server: ServerConfig = Field(default_factory=ServerConfig)
+    feed: FeedConfig = Field(default_factory=FeedConfig)
 
 
 def expand_env_vars(value: Any) -> Any:
@@ -107,7 +279,12 @@ def load_config(config_path: str | Path = "config.yaml") -> Config:
     # Expand environment variables
     expanded_config = expand_env_vars(raw_config)
 
-    return Config(**expanded_config)
+    config = Config(**expanded_config)
+    if config.watch_files:
+        from wallet_watch.watchfiles import load_watch_files
+
+        config.watches.extend(load_watch_files(config.watch_files, config_path.parent, config.watch_cache))
+    return config
 
 
 def get_default_config() -> Config:
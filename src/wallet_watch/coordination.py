@@ -0,0 +1,158 @@
+"""Lease-based notification ownership for active-active replicas."""
+
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable
+
+from wallet_watch.config import CoordinationConfig
+from wallet_watch.partition import Partition
+from wallet_watch.storage.base import StorageBase
+
+
+logger = logging.getLogger(__name__)
+
+MEMBER_PREFIX = "member:"
+PARTITION_PREFIX = "partition:"
+
+
+class LeaseManager:
+    """Shares address partitions among replicas through leases in storage.
+
+    Every replica heartbeats a member lease and holds up to its fair share
+    of partition leases, renewing them every ``renew_interval``. A replica
+    over its share (because another one joined) releases the surplus, and
+    partitions of a replica that stops renewing are taken over once their
+    leases expire. Each acquisition bumps the lease's fencing token, and
+    the outbox only claims rows for partitions whose token is still
+    current, so a replica that stalled past its lease cannot deliver.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBase,
+        config: CoordinationConfig,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.storage = storage
+        self.config = config
+        self.clock = clock
+        self.node_id = config.node_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.partitioner = Partition(0, config.partitions)
+
+        # partition -> (fencing token, local expiry)
+        self._held: dict[int, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.acquired = 0
+        self.lost = 0
+
+    def partition_of(self, address: str) -> int:
+        """Partition an address belongs to."""
+        return self.partitioner.owner(address)
+
+    def owns(self, partition: int) -> bool:
+        """Whether this replica currently delivers for a partition."""
+        with self._lock:
+            held = self._held.get(partition)
+        return held is not None and self.clock() < held[1]
+
+    def fence(self) -> tuple[str, dict[int, int]]:
+        """Holder ID and fencing token of every partition still held."""
+        now = self.clock()
+        with self._lock:
+            tokens = {p: token for p, (token, expires) in self._held.items() if now < expires}
+        return self.node_id, tokens
+
+    def tick(self) -> None:
+        """Heartbeat, renew held leases, then shed or take partitions to reach a fair share."""
+        now = self.clock()
+        expires_at = now + self.config.lease_seconds
+        self.storage.acquire_lease(f"{MEMBER_PREFIX}{self.node_id}", self.node_id, now, expires_at)
+
+        members = sum(1 for lease in self.storage.get_leases(MEMBER_PREFIX) if lease["expires_at"] > now)
+        share = math.ceil(self.config.partitions / max(1, members))
+
+        with self._lock:
+            previous = dict(self._held)
+
+        held: dict[int, tuple[int, float]] = {}
+        for partition, (token, _) in sorted(previous.items()):
+            renewed = self.storage.acquire_lease(self._name(partition), self.node_id, now, expires_at)
+            if renewed == token:
+                held[partition] = (token, expires_at)
+            else:
+                self.lost += 1
+                logger.warning(f"Lost notification lease for partition {partition}")
+
+        # Hand surplus partitions to replicas that joined
+        for partition in sorted(held, reverse=True)[: max(0, len(held) - share)]:
+            self.storage.release_lease(self._name(partition), self.node_id)
+            del held[partition]
+
+        if len(held) < share:
+            leases = {lease["name"]: lease for lease in self.storage.get_leases(PARTITION_PREFIX)}
+            for partition in range(self.config.partitions):
+                if len(held) >= share:
+                    break
+                lease = leases.get(self._name(partition))
+                if partition in held or (lease and lease["holder"] and lease["expires_at"] > now):
+                    continue
+                token = self.storage.acquire_lease(self._name(partition), self.node_id, now, expires_at)
+                if token is not None:
+                    held[partition] = (token, expires_at)
+                    self.acquired += 1
+
+        with self._lock:
+            self._held = held
+
+        if held.keys() != previous.keys():
+            logger.info(f"Node {self.node_id} delivers partitions {sorted(held)} ({members} members)")
+
+    def _name(self, partition: int) -> str:
+        return f"{PARTITION_PREFIX}{partition}"
+
+    def _run(self):
+        """Renewal loop."""
+        while not self._stop.wait(self.config.renew_interval):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Lease renewal failed: {e}")
+
+    def start(self) -> None:
+        """Take a first share of partitions and start renewing."""
+        self.tick()
+        self._thread = threading.Thread(target=self._run, name="leases", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop renewing and release all leases so other replicas take over at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+        with self._lock:
+            held, self._held = self._held, {}
+        try:
+            for partition in held:
+                self.storage.release_lease(self._name(partition), self.node_id)
+            self.storage.release_lease(f"{MEMBER_PREFIX}{self.node_id}", self.node_id)
+        except Exception as e:
+            logger.error(f"Failed to release leases: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Return this node's partitions and lease counters."""
+        with self._lock:
+            partitions = sorted(self._held)
+        return {
+            "node_id": self.node_id,
+            "partitions": partitions,
+            "acquired": self.acquired,
+            "lost": self.lost,
+        }
@@ -1,26 +1,87 @@
 """Core orchestration for Wallet Watch."""
 
+import json
 import logging
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 
-from wallet_watch.config import Config
+from wallet_watch.config import Config, WatchConfig
 from wallet_watch.models import Transaction
+from wallet_watch.breaker import CLOSED, CircuitBreaker
 from wallet_watch.chains import get_chain_provider
-from wallet_watch.notifiers import get_notifier
+from wallet_watch.coordination import LeaseManager
+from wallet_watch.digest import Coalescer, Digest
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.metrics import FAST_BUCKETS, REGISTRY, Counter, Gauge
+from wallet_watch.notifiers import Delivery, get_notifier
+from wallet_watch.outbox import Outbox
+from wallet_watch.partition import Partition, SignatureDeduper
+from wallet_watch.prefilter import PreFilter
+from wallet_watch.priority import PriorityPolicy
+from wallet_watch.profiling import SamplingProfiler, StallDetector, install_stall_detector
+from wallet_watch.routing import DigestGroup, Route, RoutingTable, Target
+from wallet_watch.server import IngestServer, ProviderSupervisor
 from wallet_watch.storage import get_storage
+from wallet_watch.templates import HTML, JSON, Renderer
+from wallet_watch.tracing import Tracer, span
 
 
 logger = logging.getLogger(__name__)
 
+FILTER_SECONDS = REGISTRY.histogram(
+    "wallet_watch_filter_seconds", "Time spent in global transaction filters", buckets=FAST_BUCKETS
+)
+FILTERED_TOTAL = REGISTRY.counter(
+    "wallet_watch_transactions_filtered_total", "Transactions filtered out before notification"
+)
+HANDLE_SECONDS = REGISTRY.histogram(
+    "wallet_watch_transaction_handle_seconds",
+    "Time to render, persist and queue notifications for a transaction",
+    buckets=FAST_BUCKETS,
+)
+DUPLICATES_TOTAL = REGISTRY.counter(
+    "wallet_watch_duplicates_ignored_total", "Repeated transaction deliveries ignored"
+)
+REJECTED_WEBHOOKS_TOTAL = REGISTRY.counter(
+    "wallet_watch_webhooks_rejected_total", "Webhooks rejected by admission control"
+)
+QUEUE_PRESSURE = REGISTRY.gauge(
+    "wallet_watch_queue_pressure", "Fill fraction of the fullest notifier queue"
+)
+WATCHED_ADDRESSES = REGISTRY.gauge("wallet_watch_watched_addresses", "Addresses being watched")
+
 
 class WalletWatch:
     """Main wallet watcher orchestrator."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, partition: Partition | None = None):
         self.config = config
+        self.partition = partition
         self.chains: dict[str, Any] = {}
         self.notifiers: dict[str, Any] = {}
+        self.notifier_templates: dict[str, str] = {}
         self.storage = None
+        self.routes = RoutingTable()
+        self.priority = PriorityPolicy(config.priority)
+        self.dispatcher = Dispatcher(
+            high_water=config.priority.high_water,
+            shed_below=config.priority.shed_below,
+        )
+        self.rejected_webhooks = 0
+        self.deduper = SignatureDeduper()
+        self.coalescer = Coalescer(self._deliver_digest)
+        self.outbox: Outbox | None = None
+        self.leases: LeaseManager | None = None
+        self.server: IngestServer | None = None
+        self.supervisor: ProviderSupervisor | None = None
+        self.feed = None
+        self.tracer = Tracer(config.tracing)
+        self.profiler = SamplingProfiler()
+        self.stall_detector: StallDetector | None = None
+        self._watch_lock = threading.Lock()
+        self._stopped = False
+        self._shutdown_requested = False
         self._setup()
 
     def _setup(self):
@@ -29,6 +90,9 @@ class WalletWatch:
         self.storage = get_storage(self.config.storage)
         logger.info(f"Storage initialized: {self.config.storage.type}")
 
+        # Compile message templates; invalid templates fail startup
+        self.renderer = Renderer(self.config.templates)
+
         # Setup chain providers
         for chain_config in self.config.chains:
             try:
@@ -39,6 +103,9 @@ class WalletWatch:
                     webhook_id=chain_config.webhook_id,
                     webhook_url=chain_config.webhook_url,
                     webhook_secret=chain_config.webhook_secret,
+                    prefilter=PreFilter(self.config.prefilter) if self.config.prefilter.enabled else None,
+                    sync_subscriptions=self.partition is None,
+                    tracer=self.tracer,
                 )
                 self.chains[chain_config.name] = provider
                 logger.info(f"Chain provider initialized: {chain_config.name}")
@@ -53,12 +120,40 @@ class WalletWatch:
                     bot_token=notifier_config.bot_token,
                     webhook_url=notifier_config.webhook_url,
                     chat_id=notifier_config.chat_id,
+                    **notifier_config.options,
                 )
+                self.renderer.template(notifier_config.template, notifier.format)
                 self.notifiers[notifier_config.type] = notifier
+                self.notifier_templates[notifier_config.type] = notifier_config.template
+                self.dispatcher.add(
+                    notifier_config.type,
+                    notifier,
+                    workers=notifier_config.workers,
+                    queue_size=notifier_config.queue_size,
+                    breaker=CircuitBreaker(notifier_config.type, notifier_config.breaker),
+                )
                 logger.info(f"Notifier initialized: {notifier_config.type}")
             except Exception as e:
                 logger.error(f"Failed to initialize notifier {notifier_config.type}: {e}")
 
+        DUPLICATES_TOTAL.register(Counter(lambda: self.deduper.duplicates))
+        REJECTED_WEBHOOKS_TOTAL.register(Counter(lambda: self.rejected_webhooks))
+        QUEUE_PRESSURE.register(Gauge(self.dispatcher.pressure))
+        WATCHED_ADDRESSES.register(Gauge(lambda: len(self.routes)))
+
+        # Setup outbox
+        if self.config.outbox.enabled and self.storage and self.storage.supports_outbox:
+            if self.config.coordination.enabled:
+                self.leases = LeaseManager(self.storage, self.config.coordination)
+            self.outbox = Outbox(self.storage, self.dispatcher, self.config.outbox, leases=self.leases)
+        elif self.config.coordination.enabled:
+            raise ValueError("Coordination needs the outbox and a storage that supports it")
+
+        if self.config.feed.enabled:
+            from wallet_watch.feed import TransactionFeed
+
+            self.feed = TransactionFeed(self.config.feed, self.storage)
+
     def _should_notify(self, tx: Transaction) -> bool:
         """Check if transaction passes global filters."""
         filters = self.config.filters
@@ -75,65 +170,420 @@ class WalletWatch:
 
         return True
 
-    def _handle_transaction(self, tx: Transaction, watch_config):
+    def _handle_transaction(self, tx: Transaction, route: Route):
         """Handle incoming transaction."""
-        logger.info(f"New transaction: {tx.signature[:16]}... on {tx.chain}")
+        logger.debug(f"New transaction: {tx.signature[:16]}... on {tx.chain}")
+        started = time.perf_counter()
 
         # Check filters
-        if not self._should_notify(tx):
+        with span("filter"):
+            notify = self._should_notify(tx)
+        FILTER_SECONDS.labels().observe(time.perf_counter() - started)
+        if not notify:
+            FILTERED_TOTAL.labels().inc()
             logger.debug(f"Transaction filtered out: {tx.signature[:16]}...")
             return
 
-        # Format message
-        message = tx.to_message(label=watch_config.label)
+        # Render once per distinct (label, template, format)
+        batches = {}
+        if route.targets:
+            with span("render", address=tx.address):
+                data = {label: tx.to_dict(label=label) for label in route.labels}
+                batches = self._build_batches(
+                    route.targets,
+                    lambda label, template, fmt: self.renderer.render(tx, label, template, fmt),
+                    data,
+                )
 
-        # Send to configured notifiers
-        for notifier_name in watch_config.notify:
-            if notifier_name in self.notifiers:
-                try:
-                    self.notifiers[notifier_name].send(message)
-                    logger.info(f"Notification sent via {notifier_name}")
-                except Exception as e:
-                    logger.error(f"Failed to send notification via {notifier_name}: {e}")
+        # Watches with a digest window go through the coalescer
+        for group in route.digests:
+            self.coalescer.add(group, tx)
 
-        # Store transaction
-        if self.storage:
-            self.storage.save_transaction(tx)
+        priority = self.priority.score(tx, route.priority)
 
-    def run(self):
-        """Start watching addresses."""
-        if not self.config.watches:
-            logger.warning("No watches configured. Add watches to config.yaml")
+        # Store the transaction with its notification intents
+        with span("persist", priority=priority):
+            if self.outbox:
+                self.outbox.send(batches, transaction=tx, priority=priority)
+            else:
+                self._submit(batches, priority)
+                if self.storage:
+                    self.storage.save_transaction(tx)
 
-        # Subscribe to all watches
-        for watch in self.config.watches:
-            chain_name = watch.chain
+        if self.feed is not None:
+            self.feed.publish(tx, route)
+
+        HANDLE_SECONDS.labels().observe(time.perf_counter() - started)
 
-            if chain_name not in self.chains:
-                logger.error(f"Chain not configured: {chain_name}")
+    def _build_batches(
+        self,
+        targets: dict[str, list[Target]],
+        render: Callable[[str, str, str], str],
+        data: dict[str, dict] | None = None,
+    ) -> dict[str, list[Delivery]]:
+        """Group rendered messages into one batch per configured notifier.
+
+        ``render(label, template, format)`` is called once per distinct
+        combination. Notifiers that take structured fields also get ``data``
+        per label.
+        """
+        rendered: dict[tuple[str, str, str], str] = {}
+        batches = {}
+        for notifier_name, group in targets.items():
+            notifier = self.notifiers.get(notifier_name)
+            if notifier is None:
                 continue
+            default_template = self.notifier_templates.get(notifier_name, "")
+            structured = notifier.structured and data
+
+            deliveries = []
+            for t in group:
+                key = (t.label, t.template or default_template, notifier.format)
+                message = rendered.get(key)
+                if message is None:
+                    message = rendered[key] = render(*key)
+                deliveries.append(Delivery(message, t.recipient, data[t.label] if structured else None))
+            batches[notifier_name] = deliveries
+        return batches
+
+    def _submit(self, batches: dict[str, list[Delivery]], priority: int = 0):
+        """Queue each notifier's batch."""
+        for notifier_name, deliveries in batches.items():
+            if self.dispatcher.submit(notifier_name, deliveries, priority=priority):
+                logger.debug(f"Notification queued for {notifier_name} ({len(deliveries)} deliveries)")
+
+    def _deliver_digest(self, group: DigestGroup, txs: list[Transaction]):
+        """Coalescer callback: send a single transaction or a digest."""
+        if len(txs) == 1:
+            tx = txs[0]
+            data = tx.to_dict(label=group.label)
 
-            chain = self.chains[chain_name]
+            def render(label: str, template: str, fmt: str) -> str:
+                return self.renderer.render(tx, label, template, fmt)
+        else:
+            digest = Digest(txs, top_n=group.settings.top_n)
+            data = {"label": group.label, "digest": [tx.to_dict(label=group.label) for tx in txs]}
 
-            if not chain.validate_address(watch.address):
-                logger.error(f"Invalid address for {chain_name}: {watch.address}")
+            def render(label: str, template: str, fmt: str) -> str:
+                # Custom templates describe single transactions, so digests use the built-in layout
+                return json.dumps(data) if fmt == JSON else digest.to_message(label, fmt)
+
+        batches = self._build_batches(group.targets, render, {group.label: data})
+        priority = self.priority.score_many(txs, group.priority)
+        if self.outbox:
+            self.outbox.send(batches, priority=priority, address=group.address)
+        else:
+            self._submit(batches, priority)
+
+    def _on_transaction(self, tx: Transaction):
+        """Chain callback: deliver a transaction along its address's route."""
+        route = self.routes.get(tx.address)
+        if route is None:
+            return
+        with span("dedup"):
+            first = self.deduper.add((tx.signature, tx.address))
+        if not first:
+            logger.debug(f"Duplicate transaction ignored: {tx.signature[:16]}...")
+            return
+        self._handle_transaction(tx, route)
+
+    def _load_watches(self) -> list[WatchConfig]:
+        """Merge config watches with watches persisted in storage.
+
+        The watches stored for an address replace config watches on it,
+        matching the replace-by-address semantics of ``add_watches``.
+        """
+        watches: dict[str, list[WatchConfig]] = {}
+        for watch in self.config.watches:
+            watches.setdefault(watch.address, []).append(watch)
+
+        if self.storage:
+            stored: dict[str, list[WatchConfig]] = {}
+            for row in self.storage.get_watches():
+                stored.setdefault(row["address"], []).append(_watch_from_row(row))
+            watches.update(stored)
+
+        return [watch for group in watches.values() for watch in group]
+
+    def add_watches(self, watches: list[WatchConfig], persist: bool = True) -> dict[str, Any]:
+        """Add or replace watches while running.
+
+        Watches replace any existing watches on the same address. New
+        addresses are subscribed in one batch per chain, so each chain
+        syncs its remote subscription once per call. A partitioned worker
+        skips addresses owned by other workers.
+
+        Returns:
+            Dict with ``added`` count and a list of ``rejected`` entries
+        """
+        rejected: list[dict[str, str]] = []
+        accepted: dict[str, list[WatchConfig]] = {}
+
+        for watch in watches:
+            if self.partition is not None and not self.partition.owns(watch.address):
                 continue
+            chain = self.chains.get(watch.chain)
+            if chain is None:
+                rejected.append({"address": watch.address, "error": f"Chain not configured: {watch.chain}"})
+            elif not chain.validate_address(watch.address):
+                rejected.append({"address": watch.address, "error": f"Invalid {watch.chain} address"})
+            elif error := self._check_template(watch):
+                rejected.append({"address": watch.address, "error": error})
+            else:
+                accepted.setdefault(watch.address, []).append(watch)
+
+        new_by_chain: dict[str, list[str]] = {}
+        with self._watch_lock:
+            for address, group in accepted.items():
+                if address not in self.routes:
+                    new_by_chain.setdefault(group[0].chain, []).append(address)
+                self.routes.set(address, group)
+
+        for chain_name, addresses in new_by_chain.items():
+            self.chains[chain_name].subscribe_many(addresses, self._on_transaction)
+
+        if persist and self.storage and accepted:
+            self.storage.save_watches([
+                watch.model_dump() for group in accepted.values() for watch in group
+            ])
+
+        added = sum(len(group) for group in accepted.values())
+        logger.info(f"Added {added} watches ({len(rejected)} rejected)")
+        return {"added": added, "rejected": rejected}
+
+    def _check_template(self, watch: WatchConfig) -> str | None:
+        """Compile a watch's template for its notifiers' formats, returning any error."""
+        if not watch.template:
+            return None
+        formats = {self.notifiers[name].format for name in watch.notify if name in self.notifiers}
+        try:
+            for fmt in formats or {HTML}:
+                self.renderer.template(watch.template, fmt)
+        except ValueError as e:
+            return f"Invalid template: {e}"
+        return None
+
+    def remove_watches(self, addresses: list[str], persist: bool = True) -> int:
+        """Remove all watches on the given addresses while running.
+
+        Returns:
+            Number of addresses that were being watched
+        """
+        removed_by_chain: dict[str, list[str]] = {}
+        with self._watch_lock:
+            for address in addresses:
+                route = self.routes.remove(address)
+                if route:
+                    removed_by_chain.setdefault(route.chain, []).append(address)
+
+        for chain_name, chain_addresses in removed_by_chain.items():
+            if chain_name in self.chains:
+                self.chains[chain_name].unsubscribe_many(chain_addresses)
+
+        if persist and self.storage:
+            self.storage.delete_watches(list(addresses))
+
+        removed = sum(len(chain_addresses) for chain_addresses in removed_by_chain.values())
+        logger.info(f"Removed {removed} watched addresses")
+        return removed
+
+    def list_watches(self) -> list[WatchConfig]:
+        """Return the watches currently active."""
+        return [watch for route in self.routes.routes() for watch in route.watches]
+
+    def stats(self) -> dict[str, Any]:
+        """Return runtime statistics."""
+        return {
+            "watched_addresses": len(self.routes),
+            "duplicates_ignored": self.deduper.duplicates,
+            "notifiers": self.dispatcher.stats(),
+            "digests": self.coalescer.stats(),
+            "outbox": self.outbox.stats() if self.outbox else None,
+            "coordination": self.leases.stats() if self.leases else None,
+            "tracing": {
+                "spans_exported": self.tracer.exported,
+                "stalls": self.stall_detector.stalls if self.stall_detector else 0,
+            },
+            "rendering": self.renderer.stats(),
+            "feed": {
+                "subscribers": len(self.feed),
+                "published": self.feed.published,
+                "skipped": self.feed.skipped,
+                "dropped": self.feed.dropped,
+            } if self.feed else None,
+            "prefilter": {
+                name: chain.prefilter.stats()
+                for name, chain in self.chains.items()
+                if getattr(chain, "prefilter", None)
+            },
+            "admission": {
+                "queue_pressure": round(self.dispatcher.pressure(), 3),
+                "rejected_webhooks": self.rejected_webhooks,
+            },
+        }
+
+    def admission_check(self) -> int | None:
+        """Webhook admission control.
+
+        Returns:
+            Seconds the sender should wait before retrying when notifier
+            queues are past the reject mark, otherwise None
+        """
+        reject_water = self.config.priority.reject_water
+        if reject_water is None or self.dispatcher.pressure() < reject_water:
+            return None
+        self.rejected_webhooks += 1
+        return self.config.priority.retry_after
+
+    def health(self) -> dict[str, Any]:
+        """Return process health; degraded while any notifier circuit is not closed."""
+        circuits = self.dispatcher.circuits()
+        degraded = any(state != CLOSED for state in circuits.values())
+        report = {
+            "status": "degraded" if degraded else "healthy",
+            "circuits": circuits,
+        }
+        if self.supervisor is not None:
+            report["chains"] = self.supervisor.stats()
+            if not all(chain["healthy"] for chain in report["chains"].values()):
+                report["status"] = "degraded"
+        return report
+
+    def request_shutdown(self) -> None:
+        """Ask ``run`` to stop serving and shut down; safe to call from a signal handler."""
+        self._shutdown_requested = True
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, name="shutdown", daemon=True).start()
+
+    def stop(self, timeout: float | None = None) -> dict[str, int]:
+        """Shut down in order within one deadline, losing as little as possible.
+
+        Stops accepting webhooks and waits for those being handled, stops
+        the chain providers, flushes pending digests, drains the notifier
+        queues, releases leases and closes storage. With the outbox,
+        anything not delivered by the deadline stays in storage and is
+        sent on the next start. Calling it again does nothing.
+
+        Returns:
+            Counts of webhooks still in flight, batches abandoned in the
+            queues and notifications left pending in the outbox
+        """
+        if self._stopped:
+            return {}
+        self._stopped = True
+
+        if timeout is None:
+            timeout = self.config.server.shutdown_timeout
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            return max(0.0, deadline - time.monotonic())
+
+        report = {"in_flight": 0, "abandoned": 0, "pending": 0}
+        if self.server is not None:
+            self.server.shutdown()
+            report["in_flight"] = self.server.drain(remaining())
+        if self.feed is not None:
+            self.feed.stop()
+        if self.supervisor is not None:
+            self.supervisor.stop()
+
+        self.coalescer.close()
+        if self.outbox:
+            self.outbox.stop()
+
+        logger.info("Draining notification queues...")
+        report["abandoned"] = self.dispatcher.close(timeout=remaining())
+        if report["abandoned"]:
+            logger.warning(f"{report['abandoned']} notification batches were not delivered")
+
+        if self.leases:
+            self.leases.stop()
+        if self.stall_detector:
+            self.stall_detector.stop()
+            install_stall_detector(None)
+        self.tracer.close()
+        if self.storage:
+            if self.outbox:
+                report["pending"] = self.storage.outbox_counts().get("pending", 0)
+            self.storage.close()
+
+        logger.info(
+            f"Shutdown complete: {report['in_flight']} webhooks in flight, "
+            f"{report['abandoned']} batches abandoned, {report['pending']} notifications kept for next start"
+        )
+        return report
+
+    def create_server(self) -> IngestServer:
+        """Build the shared ingest server with a webhook route per chain."""
+        self.server = IngestServer(health_check=self.health, admission_check=self.admission_check)
+        for chain in self.chains.values():
+            self.server.mount(chain)
+
+        if self.config.server.admin_token:
+            from wallet_watch.admin import create_admin_blueprint
+
+            self.server.app.register_blueprint(create_admin_blueprint(self, self.config.server.admin_token))
+            logger.info("Admin API enabled at /admin")
+
+        if self.feed is not None:
+            from wallet_watch.feed import create_feed_blueprint
+
+            self.server.app.register_blueprint(create_feed_blueprint(self, self.feed))
+            self.feed.start()
+            logger.info("Live transaction feed enabled at /feed")
+
+        return self.server
+
+    def start_background(self) -> None:
+        """Start the stall detector, partition leases and outbox delivery.
+
+        Leases start before the outbox, which only delivers rows of
+        partitions whose lease this process holds.
+        """
+        if self.config.tracing.stall_threshold > 0:
+            self.stall_detector = StallDetector(self.config.tracing.stall_threshold)
+            install_stall_detector(self.stall_detector)
+            self.stall_detector.start()
+        if self.leases:
+            self.leases.start()
+        if self.outbox:
+            self.outbox.start()
+
+    def run(self):
+        """Start watching addresses."""
+        watches = self._load_watches()
+        if not watches:
+            logger.warning("No watches configured. Add watches to config.yaml")
+
+        # Subscribe to all watches, one batch per chain
+        self.add_watches(watches, persist=False)
+        self.start_background()
+
+        server = self.create_server()
+        if self._shutdown_requested:
+            server.shutdown()
 
-            logger.info(f"Watching {watch.label or watch.address} on {chain_name}")
+        # Start every provider's background work, then serve (blocking)
+        self.supervisor = ProviderSupervisor(self.chains)
+        self.supervisor.start()
+        logger.info(f"Watching {len(self.routes)} addresses on {len(self.chains)} chains...")
 
-            # Subscribe with callback
-            chain.subscribe(
-                address=watch.address,
-                callback=lambda tx, w=watch: self._handle_transaction(tx, w),
-            )
+        try:
+            server.serve(host=self.config.server.host, port=self.config.server.port)
+        finally:
+            self.stop()
 
-        # Start all chain providers (blocking)
-        logger.info(f"Watching {len(self.config.watches)} addresses...")
 
-        # Run the first chain's event loop (they typically share one)
-        if self.chains:
-            first_chain = list(self.chains.values())[0]
-            first_chain.run(
-                host=self.config.server.host,
-                port=self.config.server.port,
-            )
+def _watch_from_row(row: dict) -> WatchConfig:
+    """Build a WatchConfig from a storage record."""
+    settings = json.loads(row["settings"]) if row.get("settings") else {}
+    return WatchConfig(
+        **settings,
+        address=row["address"],
+        chain=row["chain"],
+        label=row.get("label") or "",
+        notify=json.loads(row["notify"]) if row.get("notify") else [],
+        recipients=json.loads(row["recipients"]) if row.get("recipients") else [],
+        filters=json.loads(row["filters"]) if row.get("filters") else {},
+    )
@@ -0,0 +1,247 @@
+"""Burst coalescing of transactions into digest messages."""
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+from wallet_watch.models import Transaction
+from wallet_watch.routing import DigestGroup
+from wallet_watch.templates import HTML, bold, escape, explorer_url, link
+
+
+logger = logging.getLogger(__name__)
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+
+def native_delta(tx: Transaction) -> float:
+    """Net native SOL change for the watched address, from Helius transfers."""
+    lamports = 0
+    for transfer in (tx.raw or {}).get("nativeTransfers") or []:
+        amount = transfer.get("amount") or 0
+        if transfer.get("toUserAccount") == tx.address:
+            lamports += amount
+        if transfer.get("fromUserAccount") == tx.address:
+            lamports -= amount
+    return lamports / LAMPORTS_PER_SOL
+
+
+def token_deltas(tx: Transaction) -> dict[str, float]:
+    """Net token changes per mint for the watched address."""
+    deltas: dict[str, float] = {}
+    for transfer in (tx.raw or {}).get("tokenTransfers") or []:
+        mint = transfer.get("mint", "")
+        amount = float(transfer.get("tokenAmount") or 0)
+        if transfer.get("toUserAccount") == tx.address:
+            deltas[mint] = deltas.get(mint, 0.0) + amount
+        if transfer.get("fromUserAccount") == tx.address:
+            deltas[mint] = deltas.get(mint, 0.0) - amount
+    return deltas
+
+
+@dataclass
+class Digest:
+    """A summary of several transactions on one address."""
+
+    transactions: list[Transaction]
+    top_n: int = 5
+
+    def to_message(self, label: str = "", fmt: str = HTML) -> str:
+        """Format the digest as a notification message in the given format."""
+        first = self.transactions[0]
+        wallet_name = escape(label, fmt) if label else first.address[:8] + "..."
+
+        lines = [
+            f"{bold('DIGEST', fmt)} on {first.chain.title()}",
+            f"Wallet: {wallet_name}",
+            f"{len(self.transactions)} transactions",
+        ]
+
+        types = Counter(tx.tx_type for tx in self.transactions)
+        lines.append("Types: " + ", ".join(f"{count} {tx_type}" for tx_type, count in types.most_common()))
+
+        sol = sum(native_delta(tx) for tx in self.transactions)
+        if sol:
+            lines.append(f"Net SOL: {bold(f'{sol:+,.4f}', fmt)}")
+
+        tokens: dict[str, float] = {}
+        for tx in self.transactions:
+            for mint, amount in token_deltas(tx).items():
+                tokens[mint] = tokens.get(mint, 0.0) + amount
+        for mint, amount in sorted(tokens.items(), key=lambda item: -abs(item[1])):
+            if amount:
+                lines.append(f"Net {mint[:4]}...{mint[-4:]}: {amount:+,.4f}")
+
+        total_usd = sum(tx.amount_usd or 0 for tx in self.transactions)
+        if total_usd:
+            lines.append(f"Value: {bold(f'${total_usd:,.2f}', fmt)}")
+
+        # Largest first, by USD value when known and SOL moved otherwise
+        ranked = sorted(
+            self.transactions,
+            key=lambda tx: (tx.amount_usd or 0, abs(native_delta(tx))),
+            reverse=True,
+        )
+        lines.append("")
+        for tx in ranked[:self.top_n]:
+            summary = escape(tx.description, fmt) if tx.description else tx.tx_type.upper()
+            url = explorer_url(tx)
+            if url:
+                summary += f" ({link('tx', url, fmt)})"
+            lines.append(f"• {summary}")
+
+        hidden = len(self.transactions) - self.top_n
+        if hidden > 0:
+            lines.append(f"…and {hidden} more")
+
+        return "\n".join(lines)
+
+
+@dataclass
+class _Window:
+    group: DigestGroup
+    opened: float
+    last: float
+    buffered: list[Transaction] = field(default_factory=list)
+
+    def deadline(self) -> float:
+        settings = self.group.settings
+        return min(self.last + settings.window, self.opened + settings.max_delay)
+
+
+class Coalescer:
+    """Collects bursts per digest group and flushes them as digests.
+
+    The first transaction after a quiet period is delivered immediately.
+    Transactions arriving while the window is open are buffered, and the
+    window closes after ``window`` quiet seconds or ``max_delay`` seconds.
+    A flush with buffered transactions opens a fresh window, so a
+    sustained burst produces at most one digest per ``max_delay``.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[DigestGroup, list[Transaction]], None],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.deliver = deliver
+        self.clock = clock
+        self._windows: dict[tuple, _Window] = {}
+        self._heap: list[tuple[float, tuple]] = []
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self.immediate = 0
+        self.digests = 0
+        self.coalesced = 0
+
+        self._thread = threading.Thread(target=self._run, name="coalescer", daemon=True)
+        self._thread.start()
+
+    def add(self, group: DigestGroup, tx: Transaction) -> None:
+        """Add a transaction for a digest group."""
+        now = self.clock()
+        with self._cond:
+            window = self._windows.get(group.key)
+            if window is None and not self._stopped:
+                window = _Window(group, opened=now, last=now)
+                self._windows[group.key] = window
+                heapq.heappush(self._heap, (window.deadline(), group.key))
+                self._cond.notify()
+                self.immediate += 1
+                send_now = True
+            elif window is None:
+                send_now = True
+            else:
+                window.buffered.append(tx)
+                window.last = now
+                send_now = False
+
+        if send_now:
+            self.deliver(group, [tx])
+
+    def _due(self, now: float) -> tuple[list[_Window], float | None]:
+        """Close every window past its deadline. Returns flushed windows and next wake."""
+        flushed = []
+        while self._heap:
+            deadline, key = self._heap[0]
+            window = self._windows.get(key)
+            if window is None:
+                heapq.heappop(self._heap)
+                continue
+
+            actual = window.deadline()
+            if actual > deadline:
+                heapq.heapreplace(self._heap, (actual, key))
+                continue
+            if actual > now:
+                return flushed, actual - now
+
+            heapq.heappop(self._heap)
+            del self._windows[key]
+            if window.buffered:
+                flushed.append(window)
+                # Keep coalescing while the burst continues
+                self._windows[key] = _Window(window.group, opened=now, last=now)
+                heapq.heappush(self._heap, (self._windows[key].deadline(), key))
+
+        return flushed, None
+
+    def _run(self):
+        """Timer loop: flush windows as their deadlines pass."""
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                flushed, wait = self._due(self.clock())
+                if not flushed:
+                    self._cond.wait(timeout=wait)
+                    continue
+            for window in flushed:
+                self._flush(window)
+
+    def _flush(self, window: _Window):
+        txs = window.buffered
+        with self._cond:
+            if len(txs) > 1:
+                self.digests += 1
+                self.coalesced += len(txs)
+            else:
+                self.immediate += 1
+        try:
+            self.deliver(window.group, txs)
+        except Exception as e:
+            logger.error(f"Failed to deliver digest for {window.group.address}: {e}")
+
+    def pending(self) -> int:
+        """Number of buffered transactions."""
+        with self._cond:
+            return sum(len(window.buffered) for window in self._windows.values())
+
+    def stats(self) -> dict[str, int]:
+        """Return coalescing counters."""
+        with self._cond:
+            return {
+                "open_windows": len(self._windows),
+                "buffered": sum(len(window.buffered) for window in self._windows.values()),
+                "immediate": self.immediate,
+                "digests": self.digests,
+                "coalesced_transactions": self.coalesced,
+            }
+
+    def close(self) -> None:
+        """Flush every open window and stop the timer."""
+        with self._cond:
+            self._stopped = True
+            windows = [window for window in self._windows.values() if window.buffered]
+            self._windows.clear()
+            self._heap.clear()
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+        for window in windows:
+            self._flush(window)
@@ -0,0 +1,377 @@
+"""Asynchronous notification dispatch for Wallet Watch."""
+
+import itertools
+import logging
+import math
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from wallet_watch.breaker import CircuitBreaker
+from wallet_watch.metrics import REGISTRY, Counter, Gauge, Histogram
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+from wallet_watch.profiling import watch
+from wallet_watch.tracing import current as current_trace
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Queue entries sort by (-priority, sequence); the stop sentinel sorts last
+_STOP_ENTRY_PRIORITY = math.inf
+
+# Called by a worker with the (delivery, sent) pairs for a batch
+ResultCallback = Callable[[list[tuple[Delivery, bool]]], None]
+
+SEND_SECONDS = REGISTRY.histogram(
+    "wallet_watch_notifier_send_seconds", "Time for one notifier call", ("notifier",)
+)
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "wallet_watch_notifier_queue_wait_seconds", "Time batches wait in a notifier queue", ("notifier",)
+)
+DELIVERIES_TOTAL = REGISTRY.counter(
+    "wallet_watch_deliveries_total", "Notification deliveries by outcome", ("notifier", "result")
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "wallet_watch_notifier_queue_depth", "Batches waiting in a notifier queue", ("notifier",)
+)
+
+
+class NotifierQueue:
+    """Bounded queue and worker pool for a single notifier.
+
+    Each notifier gets its own queue, so a slow or failing channel only
+    backs up its own work. Higher-priority work is delivered first, and
+    once the queue is ``high_water`` full, work below ``shed_below`` is
+    shed. An optional circuit breaker fails calls fast while the
+    notifier's endpoint is unhealthy.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        notifier: NotifierBase,
+        workers: int = 2,
+        queue_size: int = 1000,
+        breaker: CircuitBreaker | None = None,
+        high_water: float = 1.0,
+        shed_below: int = 0,
+    ):
+        self.name = name
+        self.notifier = notifier
+        self.breaker = breaker
+        self.high_water = high_water
+        self.shed_below = shed_below
+        self.queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=queue_size)
+        self._sequence = itertools.count()
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.short_circuited = 0
+        self.shed: dict[int, int] = {}
+        self.queue_wait = Histogram()
+        self.send_latency = Histogram()
+        self._counter_lock = threading.Lock()
+        self._closed = False
+
+        SEND_SECONDS.register(self.send_latency, notifier=name)
+        QUEUE_WAIT_SECONDS.register(self.queue_wait, notifier=name)
+        QUEUE_DEPTH.register(Gauge(self.queue.qsize), notifier=name)
+        for result in ("sent", "failed", "dropped", "short_circuited"):
+            counter = Counter(lambda result=result: getattr(self, result))
+            DELIVERIES_TOTAL.register(counter, notifier=name, result=result)
+        DELIVERIES_TOTAL.register(Counter(self._shed_total), notifier=name, result="shed")
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"notify-{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        deliveries: list[Delivery],
+        callback: ResultCallback | None = None,
+        priority: int = 0,
+        **kwargs,
+    ) -> bool:
+        """Queue deliveries without blocking.
+
+        Args:
+            deliveries: Messages and their recipients
+            callback: Optional hook called with per-delivery results
+            priority: Higher values are delivered first and shed last
+            **kwargs: Passed through to the notifier
+
+        Returns:
+            False if the queue is closed, full or shedding and the work was dropped
+        """
+        if self._closed:
+            logger.warning(f"Dispatcher for {self.name} is closed, dropping {len(deliveries)} deliveries")
+            self._count("dropped", len(deliveries))
+            return False
+
+        if priority < self.shed_below and self.pressure() >= self.high_water:
+            logger.debug(f"Shedding {len(deliveries)} priority {priority} deliveries for {self.name}")
+            with self._counter_lock:
+                self.shed[priority] = self.shed.get(priority, 0) + len(deliveries)
+            return False
+
+        try:
+            # The submitting transaction's trace, if sampled, gets a notify span
+            item = (time.monotonic(), deliveries, callback, kwargs, current_trace())
+            self.queue.put_nowait((-priority, next(self._sequence), item))
+            return True
+        except queue.Full:
+            logger.error(f"Notification queue full for {self.name}, dropping {len(deliveries)} deliveries")
+            self._count("dropped", len(deliveries))
+            return False
+
+    def _work(self):
+        """Worker loop: deliver queued batches until stopped."""
+        while True:
+            item = self.queue.get()[2]
+            if item is _STOP:
+                self.queue.task_done()
+                return
+
+            items = [item]
+            stop = False
+            if self.notifier.max_batch > 1:
+                stop = self._fill(items)
+
+            try:
+                # Merge consecutive items that share send options
+                start = 0
+                for end in range(1, len(items) + 1):
+                    if end == len(items) or items[end][3] != items[start][3]:
+                        self._deliver(items[start:end])
+                        start = end
+            finally:
+                for _ in range(len(items) + stop):
+                    self.queue.task_done()
+
+            if stop:
+                return
+
+    def _fill(self, items: list) -> bool:
+        """Pull more queued items until max_batch deliveries or batch_linger passes.
+
+        Returns:
+            True if the stop sentinel was taken
+        """
+        count = len(items[0][1])
+        deadline = time.monotonic() + self.notifier.batch_linger
+
+        while count < self.notifier.max_batch:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))[2]
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return True
+            items.append(item)
+            count += len(item[1])
+        return False
+
+    def _deliver(self, items: list):
+        """Send one or more queued items as a single notifier call."""
+        started = time.monotonic()
+        started_ns = time.time_ns()
+        for enqueued_at, *_ in items:
+            self.queue_wait.observe(started - enqueued_at)
+
+        deliveries = [delivery for _, batch, *_ in items for delivery in batch]
+        kwargs = items[0][3]
+
+        if self.breaker is not None and not self.breaker.allow():
+            logger.debug(f"Circuit open for {self.name}, failing {len(deliveries)} deliveries fast")
+            self._count("short_circuited", len(deliveries))
+            results = [(delivery, False) for delivery in deliveries]
+        else:
+            try:
+                with watch(f"notify:{self.name}"):
+                    results = self.notifier.send_each(deliveries, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to send notification via {self.name}: {e}")
+                results = [(delivery, False) for delivery in deliveries]
+            duration = time.monotonic() - started
+            self.send_latency.observe(duration)
+
+            sent = sum(1 for _, ok in results if ok)
+            self._count("sent", sent)
+            self._count("failed", len(results) - sent)
+            if self.breaker is not None:
+                self.breaker.record(sent == len(results), duration)
+
+        if len(items) == 1:
+            per_item = [results]
+        else:
+            # Batching notifiers return one result per delivery, in order
+            per_item, offset = [], 0
+            for _, batch, *_ in items:
+                per_item.append(results[offset:offset + len(batch)])
+                offset += len(batch)
+
+        ended_ns = time.time_ns()
+        for (enqueued_at, _, _, _, trace), item_results in zip(items, per_item):
+            if trace is not None:
+                trace.record(
+                    "notify",
+                    started_ns,
+                    ended_ns,
+                    notifier=self.name,
+                    deliveries=len(item_results),
+                    sent=sum(1 for _, ok in item_results if ok),
+                    queue_wait_ms=round((started - enqueued_at) * 1000, 3),
+                )
+
+        for (_, _, callback, _, _), item_results in zip(items, per_item):
+            if callback is not None:
+                try:
+                    callback(item_results)
+                except Exception as e:
+                    logger.error(f"Delivery callback failed for {self.name}: {e}")
+
+    def _count(self, attr: str, value: int):
+        with self._counter_lock:
+            setattr(self, attr, getattr(self, attr) + value)
+
+    def close(self, timeout: float = 10.0) -> int:
+        """Stop accepting work and drain the queue.
+
+        Returns:
+            Number of queued batches abandoned when the deadline passed
+        """
+        self._closed = True
+        deadline = time.monotonic() + timeout
+
+        for _ in self._workers:
+            try:
+                entry = (_STOP_ENTRY_PRIORITY, next(self._sequence), _STOP)
+                self.queue.put(entry, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        abandoned = sum(1 for entry in list(self.queue.queue) if entry[2] is not _STOP)
+
+        try:
+            self.notifier.close()
+        except Exception as e:
+            logger.error(f"Failed to close notifier {self.name}: {e}")
+
+        if abandoned:
+            logger.warning(f"Abandoned {abandoned} queued batches for {self.name} at shutdown")
+        return abandoned
+
+    def _shed_total(self) -> int:
+        with self._counter_lock:
+            return sum(self.shed.values())
+
+    def pressure(self) -> float:
+        """Fraction of the queue in use."""
+        return self.queue.qsize() / self.queue.maxsize if self.queue.maxsize else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, counters and latency histograms."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "workers": len(self._workers),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "short_circuited": self.short_circuited,
+            "shed_by_priority": dict(self.shed),
+            "circuit": self.breaker.snapshot() if self.breaker else None,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "send_latency_seconds": self.send_latency.snapshot(),
+        }
+
+
+class Dispatcher:
+    """Routes delivery batches to per-notifier queues."""
+
+    def __init__(self, high_water: float = 1.0, shed_below: int = 0):
+        self.queues: dict[str, NotifierQueue] = {}
+        self.high_water = high_water
+        self.shed_below = shed_below
+
+    def add(
+        self,
+        name: str,
+        notifier: NotifierBase,
+        workers: int = 2,
+        queue_size: int = 1000,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """Register a notifier with its own queue, workers and optional breaker."""
+        self.queues[name] = NotifierQueue(
+            name,
+            notifier,
+            workers=workers,
+            queue_size=queue_size,
+            breaker=breaker,
+            high_water=self.high_water,
+            shed_below=self.shed_below,
+        )
+
+    def submit(
+        self,
+        name: str,
+        deliveries: list[Delivery],
+        callback: ResultCallback | None = None,
+        priority: int = 0,
+        **kwargs,
+    ) -> bool:
+        """Queue deliveries for a notifier."""
+        notifier_queue = self.queues.get(name)
+        if notifier_queue is None:
+            return False
+        return notifier_queue.submit(deliveries, callback=callback, priority=priority, **kwargs)
+
+    def pressure(self) -> float:
+        """Fill fraction of the fullest notifier queue."""
+        return max((q.pressure() for q in self.queues.values()), default=0.0)
+
+    def circuit_retry_in(self, name: str) -> float | None:
+        """Seconds until a tripped circuit allows a trial call, or None if closed."""
+        notifier_queue = self.queues.get(name)
+        if notifier_queue is None or notifier_queue.breaker is None:
+            return None
+        return notifier_queue.breaker.retry_in()
+
+    def circuits(self) -> dict[str, str]:
+        """Return the circuit state of every notifier with a breaker."""
+        return {
+            name: q.breaker.state for name, q in self.queues.items() if q.breaker is not None
+        }
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return stats for every notifier queue."""
+        return {name: q.stats() for name, q in self.queues.items()}
+
+    def close(self, timeout: float = 10.0) -> int:
+        """Drain all queues within a shared deadline.
+
+        Returns:
+            Total number of batches abandoned
+        """
+        deadline = time.monotonic() + timeout
+        abandoned = 0
+
+        # Stop every queue first so they drain in parallel
+        for notifier_queue in self.queues.values():
+            notifier_queue._closed = True
+
+        for notifier_queue in self.queues.values():
+            abandoned += notifier_queue.close(timeout=max(0.0, deadline - time.monotonic()))
+
+        return abandoned
@@ -0,0 +1,402 @@
+"""Live transaction feed over Server-Sent Events.
+
+Stored transactions are published to ``TransactionFeed``, which hands
+them to a fan-out thread, so the ingest path only pays for a queue put.
+The fan-out thread encodes each event once and appends it to the buffer
+of every subscriber whose address or label filter matches, found through
+indexes rather than by testing every subscriber. Buffers are bounded: a
+subscriber that falls behind skips its oldest events or is disconnected.
+Events carry the transaction's storage ID, so a client reconnecting with
+``Last-Event-ID`` is first replayed what it missed from storage.
+
+Each client's request thread streams a generator response fed by its
+buffer. The thread wakes when events arrive, then lingers for
+``linger`` seconds to batch more, so it writes at most once per linger
+window however fast transactions come in.
+"""
+
+import hmac
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Iterator
+
+from wallet_watch.config import FeedConfig
+from wallet_watch.metrics import REGISTRY, Counter, Gauge
+from wallet_watch.models import Transaction
+from wallet_watch.routing import Route
+from wallet_watch.storage.base import StorageBase
+
+
+logger = logging.getLogger(__name__)
+
+FEED_SUBSCRIBERS = REGISTRY.gauge("wallet_watch_feed_subscribers", "Open live feed connections")
+FEED_EVENTS_TOTAL = REGISTRY.counter(
+    "wallet_watch_feed_events_total",
+    "Live feed events published, skipped by slow clients or lost to drops",
+    ("event",),
+)
+
+# Sent to clients as the reconnect delay, in milliseconds
+RETRY_MS = 3000
+REPLAY_PAGE = 500
+# Most transactions held for one fan-out pass
+FAN_OUT_BATCH = 4096
+# A comment line keeps proxies from timing the stream out and detects gone clients
+PING = ": ping\n\n"
+
+
+def _frame(event_id: int | None, event: str, data: dict) -> str:
+    """Encode one SSE event."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscriber:
+    """One feed client: its filters and a bounded buffer of encoded events.
+
+    With no addresses and no labels every transaction matches; otherwise
+    a transaction matches if its address or any of its labels does.
+    """
+
+    def __init__(
+        self,
+        addresses: frozenset[str] = frozenset(),
+        labels: frozenset[str] = frozenset(),
+        buffer_size: int = 1000,
+        slow_policy: str = "skip",
+    ):
+        self.addresses = addresses
+        self.labels = labels
+        self.buffer_size = buffer_size
+        self.slow_policy = slow_policy
+        self.closed = False
+        self.dropped = False
+        # Highest event ID sent, so live events already replayed are not repeated
+        self.last_id = 0
+        self._events: deque[tuple[int | None, str]] = deque()
+        self._skipped = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def put(self, events: list[tuple[int | None, str]]) -> bool:
+        """Buffer ``(event_id, frame)`` pairs; returns False if this disconnected the subscriber."""
+        with self._lock:
+            if self.closed:
+                return False
+            self._events.extend(events)
+            overflow = len(self._events) - self.buffer_size
+            if overflow > 0:
+                if self.slow_policy == "drop":
+                    self.closed = self.dropped = True
+                    self._events.clear()
+                    self._ready.set()
+                    return False
+                for _ in range(overflow):
+                    self._events.popleft()
+                self._skipped += overflow
+        if not self._ready.is_set():
+            self._ready.set()
+        return True
+
+    def take(self, timeout: float = 0.0, linger: float = 0.0) -> tuple[list[tuple[int | None, str]], int]:
+        """Wait up to ``timeout`` for events, then ``linger`` for more to batch with them.
+
+        Returns:
+            Buffered ``(event_id, frame)`` pairs and the number of events
+            skipped since the last call
+        """
+        if timeout > 0 and self._ready.wait(timeout) and linger > 0 and not self.closed:
+            time.sleep(linger)
+        with self._lock:
+            self._ready.clear()
+            events = list(self._events)
+            self._events.clear()
+            skipped, self._skipped = self._skipped, 0
+        return events, skipped
+
+    def render(self, events: list[tuple[int | None, str]], skipped: int) -> str:
+        """SSE text for taken events, leaving out any already sent."""
+        chunks = []
+        if skipped:
+            chunks.append(_frame(None, "skipped", {"count": skipped, "after": self.last_id}))
+        for event_id, frame in events:
+            if event_id is not None:
+                if event_id <= self.last_id:
+                    continue
+                self.last_id = event_id
+            chunks.append(frame)
+        return "".join(chunks)
+
+    def close(self) -> None:
+        """End the subscriber's stream."""
+        with self._lock:
+            self.closed = True
+        self._ready.set()
+
+
+class TransactionFeed:
+    """Fans stored transactions out to live feed subscribers."""
+
+    def __init__(self, config: FeedConfig, storage: StorageBase | None = None):
+        self.config = config
+        self.storage = storage
+        self.published = 0
+        self.skipped = 0
+        self.dropped = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._subscribers: set[Subscriber] = set()
+        # Subscribers without filters, and the others indexed by filter value
+        self._all: set[Subscriber] = set()
+        self._by_address: dict[str, set[Subscriber]] = {}
+        self._by_label: dict[str, set[Subscriber]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        FEED_SUBSCRIBERS.register(Gauge(lambda: len(self._subscribers)))
+        FEED_EVENTS_TOTAL.register(Counter(lambda: self.published), event="published")
+        FEED_EVENTS_TOTAL.register(Counter(lambda: self.skipped), event="skipped")
+        FEED_EVENTS_TOTAL.register(Counter(lambda: self.dropped), event="dropped")
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def start(self) -> None:
+        """Start the fan-out thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="feed", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop fanning out and end every subscriber's stream."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+
+    def publish(self, tx: Transaction, route: Route) -> None:
+        """Queue a stored transaction for subscribers (called on the ingest path)."""
+        if self._subscribers:
+            self._queue.put((tx, route))
+
+    def subscribe(
+        self, addresses: frozenset[str] = frozenset(), labels: frozenset[str] = frozenset()
+    ) -> Subscriber | None:
+        """Register a subscriber; None if ``max_clients`` are already connected."""
+        subscriber = Subscriber(addresses, labels, self.config.buffer_size, self.config.slow_policy)
+        with self._lock:
+            if len(self._subscribers) >= self.config.max_clients:
+                return None
+            self._subscribers.add(subscriber)
+            if not addresses and not labels:
+                self._all.add(subscriber)
+            for address in addresses:
+                self._by_address.setdefault(address, set()).add(subscriber)
+            for label in labels:
+                self._by_label.setdefault(label, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber and end its stream; safe to call twice."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.discard(subscriber)
+                self._all.discard(subscriber)
+                for values, index in ((subscriber.addresses, self._by_address), (subscriber.labels, self._by_label)):
+                    for value in values:
+                        group = index.get(value)
+                        if group is not None:
+                            group.discard(subscriber)
+                            if not group:
+                                del index[value]
+        subscriber.close()
+
+    def _run(self):
+        """Fan-out loop: every ``linger`` seconds, hand what was queued to subscribers."""
+        items: list[tuple[Transaction, Route]] = []
+        deadline = 0.0
+        stop = False
+        while not stop:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is None:
+                    stop = True
+                else:
+                    items.append(item)
+                    if len(items) < FAN_OUT_BATCH:
+                        continue
+            except queue.Empty:
+                pass
+
+            try:
+                self._fan_out(items)
+            except Exception as e:
+                logger.error(f"Failed to publish to live feed: {e}")
+            items = []
+            deadline = time.monotonic() + self.config.linger
+
+    def _fan_out(self, items: list[tuple[Transaction, Route]]) -> None:
+        """Encode each transaction once and buffer it for every matching subscriber."""
+        batches: dict[Subscriber, list[tuple[int | None, str]]] = {}
+        for tx, route in items:
+            labels = sorted({watch.label for watch in route.watches if watch.label})
+            with self._lock:
+                matched = set(self._all)
+                matched.update(self._by_address.get(tx.address, ()))
+                for label in labels:
+                    matched.update(self._by_label.get(label, ()))
+            if not matched:
+                continue
+
+            data = tx.to_dict()
+            del data["label"]
+            data["id"] = tx.row_id
+            data["labels"] = labels
+            event = (tx.row_id, _frame(tx.row_id, "transaction", data))
+            self.published += 1
+            for subscriber in matched:
+                batches.setdefault(subscriber, []).append(event)
+
+        for subscriber, events in batches.items():
+            if not subscriber.put(events) and subscriber.dropped:
+                self.dropped += 1
+                logger.info("Disconnected a slow live feed client")
+                self.unsubscribe(subscriber)
+
+    def stream(
+        self,
+        subscriber: Subscriber,
+        last_id: int | None = None,
+        replay_addresses: list[str] | None = None,
+        labels_of: Callable[[str], list[str]] = lambda address: [],
+    ) -> Iterator[str]:
+        """SSE text for a subscriber: replay after ``last_id``, then live events.
+
+        Unsubscribes when the client goes away or the stream ends.
+
+        Args:
+            subscriber: Subscriber returned by ``subscribe``
+            last_id: Storage ID the client last saw, to resume after
+            replay_addresses: Addresses to replay; None replays all
+            labels_of: Current labels of an address, for replayed events
+        """
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if last_id is not None and self.storage is not None:
+                yield from self._replay(subscriber, last_id, replay_addresses, labels_of)
+
+            while not subscriber.closed:
+                events, skipped = subscriber.take(self.config.heartbeat, self.config.linger)
+                self.skipped += skipped
+                yield subscriber.render(events, skipped) or PING
+        finally:
+            self.unsubscribe(subscriber)
+
+    def _replay(
+        self,
+        subscriber: Subscriber,
+        last_id: int,
+        addresses: list[str] | None,
+        labels_of: Callable[[str], list[str]],
+    ) -> Iterator[str]:
+        """Stored transactions after ``last_id``, up to ``replay_limit``."""
+        remaining = self.config.replay_limit
+        subscriber.last_id = last_id
+        while remaining > 0:
+            page = min(REPLAY_PAGE, remaining)
+            try:
+                rows = self.storage.get_transactions_after(subscriber.last_id, addresses, page)
+            except NotImplementedError:
+                return
+            if not rows:
+                return
+            yield "".join(_frame(row["id"], "transaction", _row_event(row, labels_of)) for row in rows)
+            subscriber.last_id = rows[-1]["id"]
+            remaining -= len(rows)
+            if len(rows) < page:
+                return
+        # More was missed than the replay limit; the client continues from live events
+        yield _frame(None, "skipped", {"count": None, "after": subscriber.last_id})
+
+
+def _row_event(row: dict, labels_of: Callable[[str], list[str]]) -> dict[str, Any]:
+    """Event data for a stored transaction, shaped like live events."""
+    return {
+        "signature": row["signature"],
+        "chain": row["chain"],
+        "address": row["address"],
+        "tx_type": row["tx_type"],
+        "description": row["description"],
+        "amount_usd": row["amount_usd"],
+        "timestamp": None,
+        "id": row["id"],
+        "labels": labels_of(row["address"]),
+    }
+
+
+def _values(args, name: str) -> frozenset[str]:
+    """Repeated or comma-separated query values."""
+    return frozenset(value.strip() for raw in args.getlist(name) for value in raw.split(",") if value.strip())
+
+
+def create_feed_blueprint(watcher, feed: TransactionFeed):
+    """Create the blueprint serving ``GET /feed``.
+
+    Query parameters ``address`` and ``label`` (repeated or comma
+    separated) filter the feed. ``Last-Event-ID`` (or ``last_event_id``)
+    resumes after a stored transaction. With a token configured, send it
+    as a bearer token or, since browsers' EventSource can't set headers,
+    as ``token``.
+    """
+    from flask import Blueprint, Response, jsonify, request
+
+    bp = Blueprint("feed", __name__)
+    token = feed.config.token
+
+    @bp.route("/feed", methods=["GET"])
+    def stream():
+        if token:
+            auth = request.headers.get("Authorization", "")
+            supplied = auth[7:] if auth.startswith("Bearer ") else request.args.get("token", "")
+            if not hmac.compare_digest(supplied.encode(), token.encode()):
+                return jsonify({"error": "Unauthorized"}), 401
+
+        cursor = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+        try:
+            last_id = int(cursor) if cursor else None
+        except ValueError:
+            return jsonify({"error": "Last-Event-ID must be a transaction ID"}), 400
+
+        addresses = _values(request.args, "address")
+        labels = _values(request.args, "label")
+        subscriber = feed.subscribe(addresses, labels)
+        if subscriber is None:
+            response = jsonify({"error": "Too many feed clients"})
+            response.headers["Retry-After"] = str(RETRY_MS // 1000)
+            return response, 503
+
+        # Subscribed before replaying, so nothing stored meanwhile is missed
+        replay_addresses = None
+        if addresses or labels:
+            replay_addresses = sorted(addresses | {
+                watch.address for watch in watcher.list_watches() if watch.label in labels
+            })
+
+        def labels_of(address: str) -> list[str]:
+            route = watcher.routes.get(address)
+            return sorted({watch.label for watch in route.watches if watch.label}) if route else []
+
+        return Response(
+            feed.stream(subscriber, last_id, replay_addresses, labels_of),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return bp
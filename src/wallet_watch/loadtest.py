@@ -0,0 +1,389 @@
+"""Record and replay webhook traffic for end-to-end load tests.
+
+``WebhookRecorder`` sits in front of (or instead of) an instance and
+appends every ``/webhook`` body, with its arrival time, to a gzipped
+JSON-lines capture. ``Replayer`` sends a capture to a running instance,
+either at the recorded pace scaled by a speed factor or open-loop at a
+fixed request rate, from many connections at once. ``AlertSink`` stands
+in for the Telegram Bot API and webhook receivers so the time from
+sending a transaction to its alert arriving can be measured.
+"""
+
+import gzip
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from urllib.parse import parse_qsl, unquote_plus, urlsplit
+
+import requests
+from flask import Flask, Response, request
+from werkzeug.serving import make_server
+
+
+logger = logging.getLogger(__name__)
+
+# Request headers kept in captures and replayed
+RECORDED_HEADERS = ("Authorization", "Content-Type")
+
+_TOKEN = re.compile(r"\w+")
+
+
+@dataclass
+class CapturedRequest:
+    """One recorded webhook request."""
+
+    offset: float
+    path: str
+    body: str
+    headers: dict[str, str] = field(default_factory=dict)
+    signatures: list[str] = field(default_factory=list)
+
+
+def read_capture(path: str) -> list[CapturedRequest]:
+    """Load a capture written by WebhookRecorder."""
+    entries = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            entries.append(CapturedRequest(
+                offset=record["t"],
+                path=record["path"],
+                body=record["body"],
+                headers=record.get("headers", {}),
+                signatures=_signatures(record["body"]),
+            ))
+    return entries
+
+
+def _signatures(body: str) -> list[str]:
+    """Transaction signatures in a Helius webhook body."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return []
+    items = payload if isinstance(payload, list) else [payload]
+    return [item["signature"] for item in items if isinstance(item, dict) and item.get("signature")]
+
+
+def percentiles(values: list[float], points: tuple[float, ...] = (50, 90, 99)) -> dict[str, float]:
+    """Nearest-rank percentiles (and the max) in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        index = min(len(ordered) - 1, max(0, int(len(ordered) * point / 100 + 0.5) - 1))
+        result[f"p{point:g}"] = round(ordered[index] * 1000, 2)
+    result["max"] = round(ordered[-1] * 1000, 2)
+    return result
+
+
+class WebhookRecorder:
+    """HTTP server that records webhook bodies, optionally forwarding them.
+
+    With ``forward`` set, each request is passed on to that instance and
+    its response returned, so the recorder can sit in front of production.
+    """
+
+    def __init__(self, output: str, forward: str | None = None, timeout: float = 30):
+        self.output = output
+        self.forward = forward.rstrip("/") if forward else None
+        self.timeout = timeout
+        self.recorded = 0
+        self._file = gzip.open(output, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._session = requests.Session()
+        self._server = None
+        self.app = Flask("wallet_watch_recorder")
+        self.app.add_url_rule("/webhook", "webhook", self._handle, methods=["POST"])
+        self.app.add_url_rule("/webhook/<path:chain>", "chain_webhook", self._handle, methods=["POST"])
+
+    def _handle(self, chain: str | None = None):
+        body = request.get_data(as_text=True)
+        headers = {name: request.headers[name] for name in RECORDED_HEADERS if name in request.headers}
+        self.record(request.path, body, headers)
+
+        if self.forward is None:
+            return Response('{"status": "recorded"}', status=200, mimetype="application/json")
+
+        try:
+            upstream = self._session.post(
+                f"{self.forward}{request.path}", data=body.encode(), headers=headers, timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            logger.error(f"Failed to forward webhook: {e}")
+            return Response('{"error": "Upstream unavailable"}', status=502, mimetype="application/json")
+        return Response(upstream.content, status=upstream.status_code, mimetype="application/json")
+
+    def record(self, path: str, body: str, headers: dict[str, str]) -> None:
+        """Append one request to the capture."""
+        line = json.dumps({
+            "t": round(time.monotonic() - self._started, 6),
+            "path": path,
+            "headers": headers,
+            "body": body,
+        })
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+    def serve(self, host: str = "0.0.0.0", port: int = 9000) -> None:
+        """Record until ``shutdown`` is called (blocking)."""
+        self._server = make_server(host, port, self.app, threaded=True)
+        logger.info(f"Recording webhooks on {host}:{self._server.server_port} to {self.output}")
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving and close the capture."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        with self._lock:
+            self._file.close()
+
+
+class _SinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.sink.receive(self.path, body)
+
+        # Telegram Bot API calls expect a Message back
+        if "/bot" in self.path:
+            reply = b'{"ok": true, "result": {"message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}}}'
+        else:
+            reply = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+class AlertSink:
+    """Local stand-in for Telegram and webhook receivers.
+
+    Point a Telegram notifier's ``api_url`` at ``{url}/bot{0}/{1}`` and a
+    webhook notifier at ``{url}/hook``. Each alert is matched to the sent
+    transactions whose signature appears in it, and the time since the
+    transaction was sent is recorded once per signature.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.sent: dict[str, float] = {}
+        self.received: dict[str, float] = {}
+        self.latencies: list[float] = []
+        self.alerts = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _SinkHandler)
+        self._server.daemon_threads = True
+        self._server.sink = self
+        self.url = f"http://{host}:{self._server.server_port}"
+        self._thread: threading.Thread | None = None
+
+    def expect(self, signature: str, sent_at: float) -> None:
+        """Register a transaction sent at ``sent_at`` (``time.monotonic``)."""
+        self.sent.setdefault(signature, sent_at)
+
+    def receive(self, path: str, body: bytes) -> None:
+        """Match an alert's signatures against the sent transactions."""
+        now = time.monotonic()
+        text = unquote_plus(urlsplit(path).query) + " " + body.decode("utf-8", errors="replace")
+        if body[:1] not in (b"{", b"["):
+            text += " " + " ".join(value for _, value in parse_qsl(body.decode("utf-8", errors="replace")))
+
+        with self._lock:
+            self.alerts += 1
+            for token in set(_TOKEN.findall(text)):
+                sent_at = self.sent.get(token)
+                if sent_at is None:
+                    continue
+                if token in self.received:
+                    self.duplicates += 1
+                    continue
+                self.received[token] = now
+                self.latencies.append(now - sent_at)
+
+    def start(self) -> None:
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="alert-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Replayer:
+    """Sends captured webhooks to an instance from a pool of connections.
+
+    With ``rps`` set, requests are sent open-loop at that rate, cycling
+    through the capture for ``duration`` seconds; otherwise the capture is
+    replayed ``loops`` times at its recorded pace divided by ``speed``
+    (0 sends as fast as possible). Latencies are measured from each
+    request's scheduled time, so a backed-up target is not hidden by the
+    sender slowing down. Signatures get a ``_<n>`` suffix on the n-th
+    pass so repeated transactions are not dropped as duplicates.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        entries: list[CapturedRequest],
+        sink: AlertSink | None = None,
+        speed: float = 1.0,
+        rps: float | None = None,
+        duration: float | None = None,
+        loops: int = 1,
+        concurrency: int = 32,
+        timeout: float = 30,
+    ):
+        if not entries:
+            raise ValueError("Capture is empty")
+        self.target = target.rstrip("/")
+        self.entries = entries
+        self.sink = sink
+        self.speed = speed
+        self.rps = rps
+        self.duration = duration
+        self.loops = max(1, loops)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.statuses: dict[str, int] = {}
+        self.response_times: list[float] = []
+        self.accepted: list[str] = []
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def schedule(self) -> Iterator[tuple[float, int, CapturedRequest]]:
+        """Yield ``(offset, pass, entry)`` in send order."""
+        count = len(self.entries)
+        if self.rps:
+            total = int(self.duration * self.rps) if self.duration else count * self.loops
+            for i in range(total):
+                yield i / self.rps, i // count, self.entries[i % count]
+            return
+
+        span = self.entries[-1].offset - self.entries[0].offset
+        gap = span / max(1, count - 1)
+        for n in range(self.loops):
+            for entry in self.entries:
+                offset = n * (span + gap) + entry.offset - self.entries[0].offset
+                yield (offset / self.speed if self.speed > 0 else 0.0), n, entry
+
+    def _prepare(self, n: int, entry: CapturedRequest) -> tuple[bytes, list[str]]:
+        """Body and signatures for the n-th pass over an entry."""
+        if n == 0:
+            return entry.body.encode(), entry.signatures
+        body = entry.body
+        signatures = []
+        for signature in entry.signatures:
+            renamed = f"{signature}_{n}"
+            body = body.replace(f'"{signature}"', f'"{renamed}"')
+            signatures.append(renamed)
+        return body.encode(), signatures
+
+    def _worker(self, jobs: "queue.Queue[tuple | None]") -> None:
+        session = requests.Session()
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            scheduled_at, path, body, headers, signatures = job
+            headers = {"Content-Type": "application/json", **headers}
+            try:
+                response = session.post(f"{self.target}{path}", data=body, headers=headers, timeout=self.timeout)
+                status = str(response.status_code)
+                ok = response.ok
+            except requests.RequestException as e:
+                status, ok = type(e).__name__, False
+            elapsed = time.monotonic() - scheduled_at
+            with self._lock:
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                self.response_times.append(elapsed)
+                if ok:
+                    self.accepted.extend(signatures)
+
+    def run(self) -> float:
+        """Send the schedule (blocking).
+
+        Returns:
+            Seconds taken to send every request
+        """
+        jobs: queue.Queue = queue.Queue(maxsize=self.concurrency * 4)
+        workers = [
+            threading.Thread(target=self._worker, args=(jobs,), name=f"replay-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+
+        started = time.monotonic()
+        for offset, n, entry in self.schedule():
+            scheduled_at = started + offset
+            delay = scheduled_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            body, signatures = self._prepare(n, entry)
+            if self.sink is not None:
+                for signature in signatures:
+                    self.sink.expect(signature, scheduled_at)
+            jobs.put((scheduled_at, entry.path, body, entry.headers, signatures))
+            self.sent += 1
+
+        for _ in workers:
+            jobs.put(None)
+        for worker in workers:
+            worker.join()
+        return time.monotonic() - started
+
+    def wait_for_alerts(self, timeout: float) -> None:
+        """Wait until every accepted transaction alerted, or ``timeout`` passes."""
+        if self.sink is None:
+            return
+        expected = set(self.accepted)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not expected.issubset(self.sink.received):
+            time.sleep(0.05)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        """Summary of the run."""
+        result: dict[str, Any] = {
+            "requests": self.sent,
+            "seconds": round(elapsed, 3),
+            "rps": round(self.sent / elapsed, 1) if elapsed else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+            "response_ms": percentiles(self.response_times),
+            "transactions": len(self.accepted),
+        }
+        if self.sink is not None:
+            accepted = set(self.accepted)
+            alerted = accepted.intersection(self.sink.received)
+            result["alerts"] = {
+                "received": self.sink.alerts,
+                "alerted": len(alerted),
+                "missing": len(accepted) - len(alerted),
+                "loss": round(1 - len(alerted) / len(accepted), 4) if accepted else 0.0,
+                "duplicates": self.sink.duplicates,
+                "latency_ms": percentiles(self.sink.latencies),
+            }
+        return result
@@ -0,0 +1,236 @@
+"""Lightweight in-process metrics for Wallet Watch.
+
+Modules declare metric families on the shared ``REGISTRY`` at import time
+and record into per-label children, which are cached so the hot path is
+a dict lookup plus a locked add. ``REGISTRY.render()`` produces the
+Prometheus text exposition format served at ``/metrics``.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Iterator
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets for in-process stages that take microseconds to milliseconds
+FAST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter.
+
+    With ``function``, the value is read from it at collection time instead,
+    for counts a component already keeps.
+    """
+
+    def __init__(self, function: Callable[[], float] | None = None):
+        self.function = function
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        """Add to the counter."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self.function() if self.function else self._value
+
+
+class Gauge:
+    """Value that can go up and down, or be read from a function."""
+
+    def __init__(self, function: Callable[[], float] | None = None):
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the current value."""
+        self._value = value
+
+    @property
+    def value(self) -> float:
+        return self.function() if self.function else self._value
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def snapshot(self) -> dict:
+        """Return cumulative bucket counts, sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+            count = self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+
+class MetricFamily:
+    """A named metric with one child per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.label_names = labels
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], Counter | Gauge | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _new(self) -> Counter | Gauge | Histogram:
+        if self.kind == "histogram":
+            return Histogram(self.buckets)
+        return Counter() if self.kind == "counter" else Gauge()
+
+    def labels(self, **labels: str) -> Counter | Gauge | Histogram:
+        """Child for the given label values, created on first use."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new())
+        return child
+
+    def register(self, child: Counter | Gauge | Histogram, **labels: str) -> None:
+        """Expose an existing metric object under the given label values.
+
+        A later registration with the same labels replaces the earlier one,
+        so components that keep their own metrics can be recreated.
+        """
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._children[key] = child
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield ``(name, labels, value)`` for every child."""
+        with self._lock:
+            children = list(self._children.items())
+
+        for key, child in children:
+            labels = dict(zip(self.label_names, key))
+            if isinstance(child, Histogram):
+                snapshot = child.snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    yield f"{self.name}_bucket", {**labels, "le": bound}, count
+                yield f"{self.name}_sum", labels, snapshot["sum"]
+                yield f"{self.name}_count", labels, snapshot["count"]
+            else:
+                yield self.name, labels, child.value
+
+
+class Registry:
+    """Collection of metric families."""
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help: str, kind: str, labels: tuple[str, ...], **kwargs) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help, kind, tuple(labels), **kwargs)
+            elif family.kind != kind:
+                raise ValueError(f"Metric {name} already registered as a {family.kind}")
+            return family
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> MetricFamily:
+        """Get or create a counter family."""
+        return self._family(name, help, "counter", labels)
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self._family(name, help, "gauge", labels)
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> MetricFamily:
+        """Get or create a histogram family."""
+        return self._family(name, help, "histogram", labels, buckets=buckets)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                    lines.append(f"{name}{{{rendered}}} {_number(value)}")
+                else:
+                    lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def timed(family: MetricFamily, **labels: str) -> Callable:
+    """Decorator recording a function's duration in a histogram family."""
+    histogram = family.labels(**labels)
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorate
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+# Process-wide registry served at /metrics
+REGISTRY = Registry()
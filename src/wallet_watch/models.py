@@ -1,6 +1,6 @@
 """Data models for Wallet Watch."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -16,28 +16,26 @@ class Transaction:
     amount_usd: float | None = None
     timestamp: datetime | None = None
     raw: dict | None = None
+    # Source JSON of the transaction as received, stored instead of re-serializing ``raw``
+    raw_json: str | None = field(default=None, repr=False)
+    # Storage ID, set when the transaction is saved; the live feed's resume cursor
+    row_id: int | None = field(default=None, repr=False)
+
+    def to_dict(self, label: str = "") -> dict:
+        """Structured fields for machine-readable notifications."""
+        return {
+            "signature": self.signature,
+            "chain": self.chain,
+            "address": self.address,
+            "label": label,
+            "tx_type": self.tx_type,
+            "description": self.description,
+            "amount_usd": self.amount_usd,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+        }
 
     def to_message(self, label: str = "") -> str:
-        """Format transaction as notification message."""
-        wallet_name = label or self.address[:8] + "..."
+        """Format transaction as an HTML notification message."""
+        from wallet_watch.templates import default_renderer
 
-        lines = [
-            f"<b>{self.tx_type.upper()}</b> on {self.chain.title()}",
-            f"Wallet: {wallet_name}",
-        ]
-
-        if self.description:
-            lines.append(f"\n{self.description}")
-
-        if self.amount_usd:
-            lines.append(f"Value: <b>${self.amount_usd:,.2f}</b>")
-
-        # Add explorer link
-        if self.chain == "solana":
-            url = f"https://solscan.io/tx/{self.signature}"
-            lines.append(f"\n<a href='{url}'>View on Solscan</a>")
-        elif self.chain == "ethereum":
-            url = f"https://etherscan.io/tx/{self.signature}"
-            lines.append(f"\n<a href='{url}'>View on Etherscan</a>")
-
-        return "\n".join(lines)
+        return default_renderer.render(self, label=label)
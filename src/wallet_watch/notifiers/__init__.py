@@ -1,21 +1,45 @@
-"""Notification providers."""
+"""Notification providers.
 
-from wallet_watch.notifiers.base import NotifierBase
-from wallet_watch.notifiers.telegram import TelegramNotifier
-from wallet_watch.notifiers.webhook import WebhookNotifier
+Notifiers are registered as ``"module:Class"`` paths and imported the
+first time they are used, so Telegram and HTTP client libraries are only
+loaded when a notifier needs them.
+"""
 
-NOTIFIERS = {
-    "telegram": TelegramNotifier,
-    "webhook": WebhookNotifier,
+import importlib
+
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+
+NOTIFIERS: dict[str, str | type[NotifierBase]] = {
+    "telegram": "wallet_watch.notifiers.telegram:TelegramNotifier",
+    "webhook": "wallet_watch.notifiers.webhook:WebhookNotifier",
 }
 
+_EXPORTS = {"TelegramNotifier": "telegram", "WebhookNotifier": "webhook"}
 
-def get_notifier(name: str, **kwargs) -> NotifierBase:
-    """Get a notifier by name."""
+
+def get_notifier_class(name: str) -> type[NotifierBase]:
+    """Resolve a notifier class by name, importing its module."""
     if name not in NOTIFIERS:
         raise ValueError(f"Unknown notifier: {name}. Available: {list(NOTIFIERS.keys())}")
 
-    return NOTIFIERS[name](**kwargs)
+    notifier = NOTIFIERS[name]
+    if isinstance(notifier, str):
+        module, _, attr = notifier.partition(":")
+        notifier = NOTIFIERS[name] = getattr(importlib.import_module(module), attr)
+    return notifier
+
+
+def get_notifier(name: str, **kwargs) -> NotifierBase:
+    """Get a notifier by name."""
+    return get_notifier_class(name)(**kwargs)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return get_notifier_class(_EXPORTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["NotifierBase", "TelegramNotifier", "WebhookNotifier", "get_notifier"]
+__all__ = [
+    "Delivery", "NotifierBase", "TelegramNotifier", "WebhookNotifier", "get_notifier", "get_notifier_class"
+]
@@ -1,14 +1,41 @@
 """Base class for notification providers."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Any
 
 
+@dataclass(frozen=True)
+class Delivery:
+    """A rendered message bound for one recipient.
+
+    An empty recipient means the notifier's default destination. ``data``
+    carries structured fields for notifiers that want them; it is not part
+    of equality, so deliveries still deduplicate on (message, recipient).
+    """
+
+    message: str
+    recipient: str = ""
+    data: dict | None = field(default=None, compare=False)
+
+
 class NotifierBase(ABC):
     """Abstract base class for notification providers."""
 
     name: str = "base"
 
+    # Message format this notifier renders: html, markdown, plain or json
+    format: str = "html"
+
+    # Whether deliveries should carry structured transaction data
+    structured: bool = False
+
+    # Dispatcher micro-batching: up to max_batch queued batches are merged into
+    # one send_each call, waiting at most batch_linger seconds to fill. A
+    # notifier enabling this must return one result per delivery, in order.
+    max_batch: int = 1
+    batch_linger: float = 0.0
+
     def __init__(self, **kwargs):
         self.config = kwargs
 
@@ -39,6 +66,44 @@ class NotifierBase(ABC):
         """
         pass
 
+    def send_each(self, deliveries: list[Delivery], **kwargs) -> list[tuple[Delivery, bool]]:
+        """Send a group of deliveries and report the outcome of each.
+
+        Override in subclasses that can fan out more efficiently. Deliveries
+        to the default destination may be expanded into concrete recipients,
+        so the result lists what was actually attempted.
+
+        Args:
+            deliveries: Messages and their recipients
+            **kwargs: Additional provider-specific options
+
+        Returns:
+            (delivery, sent) pairs
+        """
+        results = []
+        for delivery in deliveries:
+            if delivery.recipient:
+                ok = self.send_to(delivery.recipient, delivery.message, **kwargs)
+            else:
+                ok = self.send(delivery.message, **kwargs)
+            results.append((delivery, ok))
+        return results
+
+    def send_batch(self, deliveries: list[Delivery], **kwargs) -> int:
+        """Send a group of deliveries.
+
+        Returns:
+            Number of deliveries sent successfully
+        """
+        return sum(1 for _, ok in self.send_each(deliveries, **kwargs) if ok)
+
+    def close(self) -> None:
+        """Release resources and flush pending sends.
+
+        Override in subclasses that hold connections or background workers.
+        """
+        pass
+
     def format_message(self, message: str) -> str:
         """Format message for this notifier.
 
@@ -0,0 +1,233 @@
+"""Rate-limited send scheduling for notifiers with per-recipient limits."""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetryAfter(Exception):
+    """Raised by a send function when the API asks us to back off."""
+
+    def __init__(self, seconds: float):
+        super().__init__(f"Retry after {seconds}s")
+        self.seconds = seconds
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, now: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """Consume one token. Call only after ``wait_time`` returned 0."""
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass
+class _Job:
+    recipient: str
+    message: str
+    kwargs: dict[str, Any]
+    future: Future = field(default_factory=Future)
+    attempts: int = 0
+
+
+@dataclass
+class _Recipient:
+    bucket: TokenBucket
+    jobs: deque = field(default_factory=deque)
+    hold_until: float = 0.0
+
+
+class SendScheduler:
+    """Fair, rate-limited scheduler for outgoing messages.
+
+    A global token bucket caps total throughput and each recipient has its
+    own bucket. Recipients with pending work are served round-robin, so a
+    flooded chat only delays itself. A ``RetryAfter`` from the send function
+    pauses that recipient and requeues the message at the front of its queue.
+    """
+
+    def __init__(
+        self,
+        send_func: Callable[..., bool],
+        global_rate: float = 30.0,
+        recipient_rate: Callable[[str], tuple[float, float]] | None = None,
+        workers: int = 8,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.send_func = send_func
+        self.clock = clock
+        self.max_retries = max_retries
+        self.recipient_rate = recipient_rate or (lambda recipient: (1.0, 1.0))
+
+        self._global = TokenBucket(global_rate, capacity=global_rate, now=clock())
+        self._recipients: dict[str, _Recipient] = {}
+        self._ready: deque[str] = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="send")
+        self._thread = threading.Thread(target=self._run, name="send-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, recipient: str, message: str, **kwargs) -> Future:
+        """Queue a message. The future resolves to the send result."""
+        job = _Job(recipient, message, kwargs)
+        with self._cond:
+            if self._stopped:
+                job.future.set_result(False)
+                return job.future
+            self._enqueue(job)
+            self._cond.notify()
+        return job.future
+
+    def pending(self) -> int:
+        """Number of messages waiting to be sent."""
+        with self._cond:
+            return sum(len(state.jobs) for state in self._recipients.values())
+
+    def _enqueue(self, job: _Job, front: bool = False) -> None:
+        state = self._recipients.get(job.recipient)
+        if state is None:
+            rate, capacity = self.recipient_rate(job.recipient)
+            state = _Recipient(TokenBucket(rate, capacity=capacity, now=self.clock()))
+            self._recipients[job.recipient] = state
+
+        if not state.jobs:
+            self._ready.append(job.recipient)
+        if front:
+            state.jobs.appendleft(job)
+        else:
+            state.jobs.append(job)
+
+    def _next_job(self, now: float) -> tuple[_Job | None, float | None]:
+        """Pick the next sendable job in round-robin order.
+
+        Returns the job, or None and how long to wait before trying again.
+        """
+        global_wait = self._global.wait_time(now)
+        if global_wait > 0:
+            return None, global_wait
+
+        soonest = None
+        for _ in range(len(self._ready)):
+            recipient = self._ready[0]
+            state = self._recipients[recipient]
+            wait = max(state.hold_until - now, state.bucket.wait_time(now))
+
+            if wait <= 0:
+                self._ready.popleft()
+                job = state.jobs.popleft()
+                if state.jobs:
+                    self._ready.append(recipient)
+                self._global.take(now)
+                state.bucket.take(now)
+                return job, None
+
+            self._ready.rotate(-1)
+            soonest = wait if soonest is None else min(soonest, wait)
+
+        return None, soonest
+
+    def _prune(self, now: float) -> None:
+        """Forget idle recipients whose bucket has fully refilled."""
+        idle = [
+            recipient
+            for recipient, state in self._recipients.items()
+            if not state.jobs
+            and state.hold_until <= now
+            and state.bucket.wait_time(now) == 0
+            and state.bucket.tokens >= state.bucket.capacity
+        ]
+        for recipient in idle:
+            del self._recipients[recipient]
+
+    def _run(self):
+        """Scheduler loop: hand sendable jobs to the worker pool."""
+        with self._cond:
+            while not (self._stopped and not self._ready):
+                now = self.clock()
+                job, wait = self._next_job(now)
+                if job is None:
+                    if len(self._recipients) > len(self._ready):
+                        self._prune(now)
+                    self._cond.wait(timeout=wait)
+                    continue
+                self._executor.submit(self._execute, job)
+
+    def _execute(self, job: _Job):
+        """Worker: send one job, requeueing it on RetryAfter."""
+        job.attempts += 1
+        try:
+            result = self.send_func(job.recipient, job.message, **job.kwargs)
+        except RetryAfter as e:
+            with self._cond:
+                if job.attempts <= self.max_retries and not self._stopped:
+                    logger.warning(f"Rate limited on {job.recipient}, retrying in {e.seconds}s")
+                    self.retried += 1
+                    self._enqueue(job, front=True)
+                    state = self._recipients[job.recipient]
+                    state.hold_until = max(state.hold_until, self.clock() + e.seconds)
+                    self._cond.notify()
+                    return
+            logger.error(f"Giving up on message to {job.recipient} after {job.attempts} attempts")
+            result = False
+        except Exception as e:
+            logger.error(f"Send to {job.recipient} failed: {e}")
+            result = False
+
+        with self._cond:
+            if result:
+                self.sent += 1
+            else:
+                self.failed += 1
+        job.future.set_result(bool(result))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Send what is queued within the timeout, then stop."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+        drained = not self._thread.is_alive()
+
+        with self._cond:
+            for state in self._recipients.values():
+                for job in state.jobs:
+                    job.future.set_result(False)
+                state.jobs.clear()
+            self._ready.clear()
+            self._cond.notify()
+
+        # In-flight sends are bounded by the HTTP timeout
+        self._executor.shutdown(wait=drained)
@@ -4,17 +4,30 @@ import logging
 import re
 from typing import Any
 
+import requests
 import telebot
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-from wallet_watch.notifiers.base import NotifierBase
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+from wallet_watch.notifiers.ratelimit import RetryAfter, SendScheduler
 
 
 logger = logging.getLogger(__name__)
 
 
+# Bot API limits: ~30 msg/s overall, 1 msg/s per chat, 20 msg/min per group
+GLOBAL_RATE = 30.0
+CHAT_RATE = 1.0
+GROUP_RATE = 20 / 60
+
+
 class TelegramNotifier(NotifierBase):
-    """Telegram bot notification provider."""
+    """Telegram bot notification provider.
+
+    Sends go through a SendScheduler that keeps within the Bot API rate
+    limits and honors ``retry_after``. Pass ``rate_limit=False`` to send
+    directly.
+    """
 
     name = "telegram"
 
@@ -24,6 +37,11 @@ class TelegramNotifier(NotifierBase):
         if not bot_token:
             raise ValueError("Telegram bot_token is required")
 
+        # A local Bot API server, e.g. "http://localhost:8081/bot{0}/{1}". telebot's
+        # API_URL is process-wide, so this notifier sends to it over its own session.
+        self.api_url = kwargs.get("api_url", "")
+        self.session = requests.Session() if self.api_url else None
+
         self.bot_token = bot_token
         self.default_chat_id = chat_id
         self.bot = telebot.TeleBot(bot_token)
@@ -32,6 +50,27 @@ class TelegramNotifier(NotifierBase):
         if chat_id:
             self.subscribers.add(chat_id)
 
+        # Bound each Bot API request so a hung endpoint cannot stall workers
+        self.timeout = int(kwargs.get("timeout", 10))
+
+        self.chat_rate = float(kwargs.get("chat_rate", CHAT_RATE))
+        self.group_rate = float(kwargs.get("group_rate", GROUP_RATE))
+        self.scheduler: SendScheduler | None = None
+        if kwargs.get("rate_limit", True):
+            self.scheduler = SendScheduler(
+                self._send_now,
+                global_rate=float(kwargs.get("global_rate", GLOBAL_RATE)),
+                recipient_rate=self._chat_limit,
+                workers=int(kwargs.get("send_workers", 8)),
+                max_retries=int(kwargs.get("max_retries", 3)),
+            )
+
+    def _chat_limit(self, chat_id: str) -> tuple[float, float]:
+        """Rate and burst for a chat; group and channel IDs are negative."""
+        if str(chat_id).startswith("-"):
+            return self.group_rate, 1.0
+        return self.chat_rate, 1.0
+
     def send(self, message: str, **kwargs) -> bool:
         """Send message to all subscribers."""
         if not self.subscribers:
@@ -45,8 +84,40 @@ class TelegramNotifier(NotifierBase):
 
         return success
 
+    def send_each(self, deliveries: list[Delivery], **kwargs) -> list[tuple[Delivery, bool]]:
+        """Send a group of deliveries, sending each (chat, message) pair once.
+
+        Default deliveries are expanded to one delivery per subscriber.
+        """
+        pairs: dict[Delivery, None] = {}
+        for delivery in deliveries:
+            chats = [delivery.recipient] if delivery.recipient else list(self.subscribers)
+            for chat_id in chats:
+                pairs[Delivery(delivery.message, chat_id)] = None
+
+        if not pairs:
+            logger.warning("No Telegram subscribers configured")
+            return [(delivery, False) for delivery in deliveries]
+
+        if self.scheduler is None:
+            return [(d, self._send_now(d.recipient, d.message, **kwargs)) for d in pairs]
+
+        # Queue everything first so the scheduler can interleave chats
+        futures = [(d, self.scheduler.submit(d.recipient, d.message, **kwargs)) for d in pairs]
+        return [(d, future.result()) for d, future in futures]
+
     def send_to(self, recipient: str, message: str, **kwargs) -> bool:
         """Send message to a specific chat."""
+        if self.scheduler is None:
+            return self._send_now(recipient, message, **kwargs)
+        return self.scheduler.submit(recipient, message, **kwargs).result()
+
+    def _send_now(self, recipient: str, message: str, **kwargs) -> bool:
+        """Send a single message immediately.
+
+        Raises:
+            RetryAfter: If Telegram answered 429 and a scheduler will retry
+        """
         try:
             # Check for inline keyboard
             keyboard = kwargs.get("keyboard")
@@ -54,17 +125,32 @@ class TelegramNotifier(NotifierBase):
             if keyboard:
                 reply_markup = self._build_keyboard(keyboard)
 
-            self.bot.send_message(
-                chat_id=recipient,
-                text=message,
-                parse_mode="HTML",
-                reply_markup=reply_markup,
-                disable_web_page_preview=True,
-            )
+            if self.api_url:
+                params = {
+                    "chat_id": recipient,
+                    "text": message,
+                    "parse_mode": "HTML",
+                    "disable_web_page_preview": True,
+                }
+                if reply_markup:
+                    params["reply_markup"] = reply_markup.to_json()
+                self._call("sendMessage", params)
+            else:
+                self.bot.send_message(
+                    chat_id=recipient,
+                    text=message,
+                    parse_mode="HTML",
+                    reply_markup=reply_markup,
+                    disable_web_page_preview=True,
+                    timeout=self.timeout,
+                )
             logger.debug(f"Sent Telegram message to {recipient}")
             return True
 
         except telebot.apihelper.ApiTelegramException as e:
+            if e.error_code == 429 and self.scheduler is not None:
+                retry_after = (e.result_json.get("parameters") or {}).get("retry_after", 1)
+                raise RetryAfter(float(retry_after)) from e
             if "blocked" in str(e).lower():
                 logger.warning(f"Bot blocked by user {recipient}")
                 self.subscribers.discard(recipient)
@@ -76,6 +162,26 @@ class TelegramNotifier(NotifierBase):
             logger.error(f"Failed to send Telegram message: {e}")
             return False
 
+    def _call(self, method: str, params: dict[str, Any]) -> dict:
+        """Call a Bot API method on ``api_url``, raising errors like telebot does."""
+        response = self.session.post(
+            self.api_url.format(self.bot_token, method), params=params, timeout=self.timeout
+        )
+        try:
+            result = response.json()
+        except ValueError:
+            raise telebot.apihelper.ApiHTTPException(method, response) from None
+        if not result.get("ok"):
+            raise telebot.apihelper.ApiTelegramException(method, response, result)
+        return result
+
+    def close(self) -> None:
+        """Flush queued sends and stop the scheduler."""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.session is not None:
+            self.session.close()
+
     def format_message(self, message: str) -> str:
         """Escape special characters for Telegram HTML."""
         # Only escape HTML special characters
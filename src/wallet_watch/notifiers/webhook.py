@@ -1,20 +1,33 @@
 """Generic webhook notification provider."""
 
+import gzip
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from wallet_watch.notifiers.base import NotifierBase
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+from wallet_watch.templates import FORMATS
 
 
 logger = logging.getLogger(__name__)
 
 
 class WebhookNotifier(NotifierBase):
-    """Generic HTTP webhook notification provider."""
+    """Generic HTTP webhook notification provider.
+
+    Requests share a keep-alive connection pool. Deliveries for different
+    URLs are sent concurrently, up to ``concurrency`` requests at a time.
+    With ``batch_size`` > 1, events are POSTed as a JSON array per URL, and
+    the dispatcher merges queued work for up to ``batch_interval`` seconds
+    to fill each batch. Set ``gzip`` to compress request bodies, and
+    ``format`` to choose how the message text is rendered.
+    """
 
     name = "webhook"
+    structured = True
 
     def __init__(self, webhook_url: str = "", **kwargs):
         super().__init__(**kwargs)
@@ -25,6 +38,21 @@ class WebhookNotifier(NotifierBase):
         self.webhook_url = webhook_url
         self.headers = kwargs.get("headers", {"Content-Type": "application/json"})
         self.method = kwargs.get("method", "POST").upper()
+        self.timeout = float(kwargs.get("timeout", 10))
+        self.gzip = bool(kwargs.get("gzip", False))
+        self.format = kwargs.get("format", self.format)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown message format: {self.format}")
+
+        self.concurrency = max(1, int(kwargs.get("concurrency", 4)))
+        self.max_batch = max(1, int(kwargs.get("batch_size", 1)))
+        self.batch_linger = float(kwargs.get("batch_interval", 1.0)) if self.max_batch > 1 else 0.0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="webhook")
 
     def send(self, message: str, **kwargs) -> bool:
         """Send notification to webhook URL."""
@@ -32,37 +60,82 @@ class WebhookNotifier(NotifierBase):
 
     def send_to(self, recipient: str, message: str, **kwargs) -> bool:
         """Send notification to a specific webhook URL."""
+        payload = {
+            "message": message,
+            "timestamp": kwargs.get("timestamp"),
+            **kwargs.get("extra", {}),
+        }
+        if kwargs.get("data"):
+            payload["transaction"] = kwargs["data"]
+
+        return self._request(recipient, payload, params={"message": message})
+
+    def send_each(self, deliveries: list[Delivery], **kwargs) -> list[tuple[Delivery, bool]]:
+        """Send deliveries concurrently, batching per URL when enabled."""
+        requests_to_send: list[tuple[list[int], str]] = []
+        batching = self.max_batch > 1 and self.method == "POST"
+
+        if batching:
+            by_url: dict[str, list[int]] = {}
+            for index, delivery in enumerate(deliveries):
+                by_url.setdefault(delivery.recipient or self.webhook_url, []).append(index)
+            for url, indexes in by_url.items():
+                for start in range(0, len(indexes), self.max_batch):
+                    requests_to_send.append((indexes[start:start + self.max_batch], url))
+        else:
+            requests_to_send = [
+                ([index], delivery.recipient or self.webhook_url)
+                for index, delivery in enumerate(deliveries)
+            ]
+
+        def run(indexes: list[int], url: str) -> bool:
+            if not batching:
+                delivery = deliveries[indexes[0]]
+                return self.send_to(url, delivery.message, data=delivery.data, **kwargs)
+            events = [self._event(deliveries[i], **kwargs) for i in indexes]
+            return self._request(url, events)
+
+        if len(requests_to_send) == 1:
+            outcomes = [run(*requests_to_send[0])]
+        else:
+            outcomes = list(self._executor.map(lambda job: run(*job), requests_to_send))
+
+        results = [False] * len(deliveries)
+        for (indexes, _), ok in zip(requests_to_send, outcomes):
+            for index in indexes:
+                results[index] = ok
+        return list(zip(deliveries, results))
+
+    def _event(self, delivery: Delivery, **kwargs) -> dict:
+        """Build one event of a batched payload."""
+        event = {"message": delivery.message, "timestamp": kwargs.get("timestamp"), **kwargs.get("extra", {})}
+        if delivery.data:
+            event["transaction"] = delivery.data
+        return event
+
+    def _request(self, url: str, payload: dict | list, params: dict | None = None) -> bool:
+        """Perform one HTTP request on the pooled session."""
         try:
-            payload = {
-                "message": message,
-                "timestamp": kwargs.get("timestamp"),
-                **kwargs.get("extra", {}),
-            }
-
             if self.method == "POST":
-                response = requests.post(
-                    recipient,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=10,
-                )
+                body = json.dumps(payload).encode()
+                headers = dict(self.headers)
+                headers.setdefault("Content-Type", "application/json")
+                if self.gzip:
+                    body = gzip.compress(body)
+                    headers["Content-Encoding"] = "gzip"
+                response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
             elif self.method == "GET":
-                response = requests.get(
-                    recipient,
-                    params={"message": message},
-                    headers=self.headers,
-                    timeout=10,
-                )
+                response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
             else:
                 logger.error(f"Unsupported HTTP method: {self.method}")
                 return False
 
             response.raise_for_status()
-            logger.debug(f"Webhook notification sent to {recipient}")
+            logger.debug(f"Webhook notification sent to {url}")
             return True
 
         except requests.exceptions.Timeout:
-            logger.error(f"Webhook request timed out: {recipient}")
+            logger.error(f"Webhook request timed out: {url}")
             return False
 
         except requests.exceptions.RequestException as e:
@@ -72,3 +145,8 @@ class WebhookNotifier(NotifierBase):
         except Exception as e:
             logger.error(f"Failed to send webhook notification: {e}")
             return False
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
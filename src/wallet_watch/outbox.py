@@ -0,0 +1,242 @@
+"""Durable notification outbox with retry and backoff."""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict
+from typing import Any
+
+from wallet_watch.config import OutboxConfig
+from wallet_watch.coordination import LeaseManager
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.metrics import REGISTRY, Counter
+from wallet_watch.models import Transaction
+from wallet_watch.notifiers.base import Delivery
+from wallet_watch.profiling import watch
+from wallet_watch.storage.base import StorageBase
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_EVENTS_TOTAL = REGISTRY.counter(
+    "wallet_watch_outbox_events_total", "Outbox rows retried, deferred, dead-lettered or sent unstored", ("event",)
+)
+
+
+class Outbox:
+    """Persists notification intents and retries failed deliveries.
+
+    Intents are written together with their transaction and handed to the
+    dispatcher straight away under a lease. Deliveries that fail are
+    rescheduled with exponential backoff and jitter, as are rows the
+    dispatcher sheds or has no room for. After ``max_attempts``
+    the row becomes a dead letter. Work rejected by an open circuit is
+    deferred until the circuit allows a trial call, without using up an
+    attempt. A poller claims due rows, including rows
+    left pending by a previous process. If the intents cannot be stored,
+    they are handed to the dispatcher directly, without retries.
+
+    With ``leases``, rows are tagged with their address partition and
+    only the replica holding a partition's lease dispatches them; other
+    replicas just store them for the owner's poller. Delivered rows are
+    then kept for the dedupe window, so a transaction received by two
+    replicas is sent once.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBase,
+        dispatcher: Dispatcher,
+        config: OutboxConfig,
+        leases: LeaseManager | None = None,
+    ):
+        self.storage = storage
+        self.dispatcher = dispatcher
+        self.config = config
+        self.leases = leases
+
+        self.retried = 0
+        self.deferred = 0
+        self.dead = 0
+        self.unstored = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        OUTBOX_EVENTS_TOTAL.register(Counter(lambda: self.retried), event="retried")
+        OUTBOX_EVENTS_TOTAL.register(Counter(lambda: self.deferred), event="deferred")
+        OUTBOX_EVENTS_TOTAL.register(Counter(lambda: self.dead), event="dead_lettered")
+        OUTBOX_EVENTS_TOTAL.register(Counter(lambda: self.unstored), event="unstored")
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt, with equal jitter."""
+        delay = min(self.config.max_delay, self.config.base_delay * 2 ** max(0, attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def send(
+        self,
+        batches: dict[str, list[Delivery]],
+        transaction: Transaction | None = None,
+        priority: int = 0,
+        address: str | None = None,
+    ) -> None:
+        """Persist intents (with the transaction, if given) and dispatch them.
+
+        ``address`` places transaction-less intents, such as digests, in a
+        partition; otherwise the transaction's address is used.
+        """
+        if not batches and transaction is None:
+            return
+
+        signature = transaction.signature if transaction else None
+        address = address or (transaction.address if transaction else None)
+        partition = self.leases.partition_of(address) if self.leases and address else None
+        intents = [
+            {
+                "signature": signature,
+                "notifier": name,
+                "deliveries": [asdict(d) for d in deliveries],
+                "priority": priority,
+                "partition": partition,
+                # The same transaction may reach more than one replica
+                "dedupe_key": f"{signature}:{address}:{name}" if signature and self.leases else None,
+            }
+            for name, deliveries in batches.items()
+        ]
+
+        owned = self.leases is None or self.leases.owns(partition or 0)
+        lease_until = time.time() + self.config.lease if owned else None
+
+        try:
+            if transaction is not None:
+                ids = self.storage.save_transaction_with_outbox(transaction, intents, lease_until)
+            else:
+                ids = self.storage.save_outbox(intents, lease_until)
+        except Exception as e:
+            # Better a delivery without retries than a lost alert
+            logger.error(f"Failed to store {len(intents)} outbox rows, sending directly: {e}")
+            self.unstored += len(batches)
+            for name, deliveries in batches.items():
+                self.dispatcher.submit(name, deliveries, priority=priority)
+            return
+
+        if not owned:
+            return
+        for outbox_id, (name, deliveries) in zip(ids, batches.items()):
+            if outbox_id is not None:
+                self._dispatch(outbox_id, name, deliveries, attempts=0, priority=priority)
+
+    def _dispatch(
+        self, outbox_id: int, name: str, deliveries: list[Delivery], attempts: int, priority: int = 0
+    ) -> None:
+        """Submit a row to the dispatcher.
+
+        If the queue is full or shedding this priority, the rejection counts
+        as a failed attempt and the row is retried with backoff.
+        """
+        submitted = self.dispatcher.submit(
+            name,
+            deliveries,
+            callback=lambda results: self._on_result(outbox_id, name, attempts, results),
+            priority=priority,
+        )
+        if not submitted:
+            self._fail(outbox_id, [asdict(d) for d in deliveries], attempts, f"rejected by the {name} queue")
+
+    def _on_result(
+        self, outbox_id: int, name: str, attempts: int, results: list[tuple[Delivery, bool]]
+    ) -> None:
+        """Dispatcher callback: complete the row or schedule the failures."""
+        failed = [delivery for delivery, ok in results if not ok]
+        if not failed:
+            self.storage.complete_outbox(outbox_id)
+            return
+
+        remaining = [asdict(d) for d in failed]
+
+        retry_in = self.dispatcher.circuit_retry_in(name)
+        if retry_in is not None:
+            delay = max(retry_in, self.config.poll_interval)
+            self.storage.retry_outbox(
+                outbox_id, remaining, f"circuit open for {name}", time.time() + delay, count_attempt=False
+            )
+            self.deferred += 1
+            return
+
+        self._fail(outbox_id, remaining, attempts, f"{len(failed)}/{len(results)} deliveries failed")
+
+    def _fail(self, outbox_id: int, remaining: list[dict], attempts: int, error: str) -> None:
+        """Count a failed attempt and reschedule the row, or dead-letter it."""
+        attempts += 1
+        if attempts >= self.config.max_attempts:
+            logger.error(f"Outbox {outbox_id} dead-lettered after {attempts} attempts: {error}")
+            self.storage.retry_outbox(outbox_id, remaining, error, None)
+            self.dead += 1
+            return
+
+        delay = self.backoff(attempts)
+        logger.warning(f"Outbox {outbox_id} attempt {attempts} failed ({error}), retrying in {delay:.1f}s")
+        self.storage.retry_outbox(outbox_id, remaining, error, time.time() + delay)
+        self.retried += 1
+
+    def poll(self) -> int:
+        """Claim due rows and dispatch them.
+
+        Returns:
+            Number of rows claimed
+        """
+        now = time.time()
+        fence = self.leases.fence() if self.leases else None
+        if fence is not None and not fence[1]:
+            return 0
+        rows = self.storage.claim_outbox(now, now + self.config.lease, limit=self.config.batch_size, fence=fence)
+        for row in rows:
+            deliveries = [Delivery(**d) for d in row["deliveries"]]
+            self._dispatch(
+                row["id"], row["notifier"], deliveries, attempts=row["attempts"], priority=row["priority"]
+            )
+        return len(rows)
+
+    def _run(self):
+        """Poller loop."""
+        while not self._stop.is_set():
+            try:
+                # Keep claiming while there is a backlog
+                with watch("outbox_poll"):
+                    while self.poll() >= self.config.batch_size and not self._stop.is_set():
+                        pass
+                if self.leases:
+                    self.storage.prune_outbox(time.time() - self.leases.config.dedupe_window)
+            except Exception as e:
+                logger.error(f"Outbox poll failed: {e}")
+            self._stop.wait(self.config.poll_interval)
+
+    def start(self) -> None:
+        """Recover leases from a previous run and start polling.
+
+        Replicas sharing storage leave row leases alone, since another
+        replica may be delivering them; they expire on their own.
+        """
+        if self.leases is None:
+            released = self.storage.release_outbox_leases()
+            if released:
+                logger.info(f"Recovered {released} pending notifications from the outbox")
+
+        self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling. Pending rows stay in storage for the next run."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def stats(self) -> dict[str, Any]:
+        """Return outbox counters and row counts."""
+        return {
+            "retried": self.retried,
+            "deferred": self.deferred,
+            "dead_lettered": self.dead,
+            "unstored": self.unstored,
+            "rows": self.storage.outbox_counts(),
+        }
@@ -0,0 +1,81 @@
+"""Address partitioning and duplicate suppression."""
+
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash, identical across processes and restarts."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to nodes.
+
+    Each node owns ``replicas`` points on the ring, so keys spread evenly
+    and adding or removing a node only moves about 1/N of the keys.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = 64):
+        if not nodes:
+            raise ValueError("HashRing needs at least one node")
+
+        self.nodes = list(nodes)
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        """Node that owns a key."""
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class Partition:
+    """This process's share of the address space in a multi-worker setup."""
+
+    def __init__(self, index: int, count: int, replicas: int = 64):
+        self.index = index
+        self.count = count
+        self.ring = HashRing([str(i) for i in range(count)], replicas=replicas)
+
+    def owner(self, address: str) -> int:
+        """Index of the worker that owns an address."""
+        return int(self.ring.node_for(address))
+
+    def owns(self, address: str) -> bool:
+        """Whether this worker owns an address."""
+        return self.owner(address) == self.index
+
+
+class SignatureDeduper:
+    """Bounded LRU of recently seen keys, e.g. (signature, address).
+
+    Webhook senders retry deliveries they consider failed, so the same
+    transaction can arrive more than once.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self._seen: OrderedDict[Hashable, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def add(self, key: Hashable) -> bool:
+        """Record a key.
+
+        Returns:
+            False if the key was already seen
+        """
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                self.duplicates += 1
+                return False
+            self._seen[key] = None
+            if len(self._seen) > self.capacity:
+                self._seen.popitem(last=False)
+            return True
@@ -0,0 +1,149 @@
+"""Cheap spam and dust pre-filter for Helius webhook payloads."""
+
+import logging
+import threading
+import time
+from typing import Callable, Container
+
+from wallet_watch.config import PrefilterConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class CountMinSketch:
+    """Approximate per-key counts in fixed memory.
+
+    Estimates never undercount; with ``width`` counters per row and
+    ``depth`` rows, an estimate overshoots by more than 2N/width with
+    probability about 2^-depth, where N is the total count.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count a key and return its new estimate."""
+        estimate = None
+        for seed, row in enumerate(self.rows):
+            index = hash((seed, key)) % self.width
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        """Estimated count for a key."""
+        return min(row[hash((seed, key)) % self.width] for seed, row in enumerate(self.rows))
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        for row in self.rows:
+            row[:] = [0] * self.width
+
+
+class PreFilter:
+    """Drops obvious noise before transactions are parsed and routed.
+
+    Rules run on the raw Helius payload, in order:
+
+    - ``mint_denylist``: every token transfer is of a denied mint
+    - ``mint_allowlist``: token transfers exist, none is of an allowed mint,
+      and no native transfer is above the dust threshold
+    - ``dust``: no token transfers and every native transfer is below
+      ``dust_lamports``
+    - ``counterparty_rate``: a sender that is not itself watched has sent
+      more than ``counterparty_limit`` transactions in the current
+      ``counterparty_window``, counted with a count-min sketch
+
+    ``counterparty_rate`` is lossy: the sketch can only overcount, and a
+    busy sender such as an exchange hot wallet really does cross the limit,
+    so genuine payouts to watched addresses get dropped. Every such drop
+    is logged with its sender and count.
+    """
+
+    def __init__(self, config: PrefilterConfig, clock: Callable[[], float] = time.monotonic):
+        self.config = config
+        self.clock = clock
+        self.denied = frozenset(config.mint_denylist)
+        self.allowed = frozenset(config.mint_allowlist)
+
+        self.sketch = CountMinSketch(config.sketch_width, config.sketch_depth)
+        self._window_start = clock()
+        self._lock = threading.Lock()
+
+        self.checked = 0
+        self.dropped = {
+            "mint_denylist": 0,
+            "mint_allowlist": 0,
+            "dust": 0,
+            "counterparty_rate": 0,
+        }
+
+    def check(self, tx_data: dict, watched: Container[str] = ()) -> str | None:
+        """Check a raw transaction.
+
+        Args:
+            tx_data: One transaction from a Helius enhanced webhook
+            watched: Addresses being watched, never rate limited as senders
+
+        Returns:
+            Name of the rule that drops the transaction, or None to keep it
+        """
+        rule = self._match(tx_data, watched)
+        with self._lock:
+            self.checked += 1
+            if rule:
+                self.dropped[rule] += 1
+        return rule
+
+    def _match(self, tx_data: dict, watched: Container[str]) -> str | None:
+        token_transfers = tx_data.get("tokenTransfers") or []
+        native_transfers = tx_data.get("nativeTransfers") or []
+
+        largest_native = max((t.get("amount") or 0 for t in native_transfers), default=0)
+        above_dust = largest_native >= self.config.dust_lamports
+
+        if token_transfers:
+            mints = {t.get("mint", "") for t in token_transfers}
+            if self.denied and mints <= self.denied:
+                return "mint_denylist"
+            if self.allowed and not (mints & self.allowed) and not (native_transfers and above_dust):
+                return "mint_allowlist"
+        elif native_transfers and self.config.dust_lamports and not above_dust:
+            return "dust"
+
+        if self.config.counterparty_limit:
+            senders = {
+                t.get("fromUserAccount")
+                for t in (*native_transfers, *token_transfers)
+                if t.get("fromUserAccount") and t.get("fromUserAccount") not in watched
+            }
+            if senders:
+                sender, count = self._busiest(senders)
+                if count > self.config.counterparty_limit:
+                    logger.info(
+                        f"Dropped {tx_data.get('signature', '')[:16]}... from {sender}: about {count} "
+                        f"transactions this window, limit {self.config.counterparty_limit}"
+                    )
+                    return "counterparty_rate"
+
+        return None
+
+    def _busiest(self, senders: set[str]) -> tuple[str, int]:
+        """Count senders in the current window; returns the one with the highest estimate."""
+        with self._lock:
+            now = self.clock()
+            if now - self._window_start >= self.config.counterparty_window:
+                self.sketch.clear()
+                self._window_start = now
+            counts = [(self.sketch.add(sender), sender) for sender in senders]
+        count, sender = max(counts)
+        return sender, count
+
+    def stats(self) -> dict[str, int | dict[str, int]]:
+        """Return the number checked and drops per rule."""
+        with self._lock:
+            return {"checked": self.checked, "dropped": dict(self.dropped)}
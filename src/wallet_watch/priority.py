@@ -0,0 +1,28 @@
+"""Transaction priority scoring for load shedding."""
+
+from wallet_watch.config import PriorityConfig
+from wallet_watch.models import Transaction
+
+
+class PriorityPolicy:
+    """Scores transactions so urgent notifications are kept under overload.
+
+    The score is the watch's own priority, plus one point for every USD
+    tier the transaction reaches, plus any bonus configured for its type.
+    Higher scores are delivered first and shed last.
+    """
+
+    def __init__(self, config: PriorityConfig | None = None):
+        self.config = config or PriorityConfig()
+        self.usd_tiers = sorted(self.config.usd_tiers)
+
+    def score(self, tx: Transaction, watch_priority: int = 0) -> int:
+        """Priority of a transaction for a watch."""
+        score = watch_priority + self.config.tx_types.get(tx.tx_type, 0)
+        if tx.amount_usd:
+            score += sum(1 for tier in self.usd_tiers if tx.amount_usd >= tier)
+        return score
+
+    def score_many(self, txs: list[Transaction], watch_priority: int = 0) -> int:
+        """Priority of a group of transactions: that of the most urgent one."""
+        return max(self.score(tx, watch_priority) for tx in txs)
@@ -0,0 +1,183 @@
+"""On-demand sampling profiler and stall detection."""
+
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+NOOP = nullcontext()
+
+
+def _thread_names() -> dict[int, str]:
+    return {thread.ident: thread.name for thread in threading.enumerate() if thread.ident is not None}
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval.
+
+    Runs in its own thread, costs nothing when not running, and reports
+    folded stacks (``thread;file:function;...``) as used by flame graph
+    tools. Only one profile runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> dict[str, Any] | None:
+        """Sample for ``seconds`` (blocking).
+
+        Returns:
+            Dict with ``samples`` taken and folded ``stacks`` with their
+            counts, most frequent first, or None if a profile is already
+            running
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            stacks: Counter[str] = Counter()
+            samples = 0
+            me = threading.get_ident()
+            deadline = time.monotonic() + seconds
+
+            while time.monotonic() < deadline:
+                names = _thread_names()
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == me:
+                        continue
+                    frames = []
+                    while frame is not None:
+                        code = frame.f_code
+                        frames.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                        frame = frame.f_back
+                    frames.append(names.get(thread_id, str(thread_id)))
+                    stacks[";".join(reversed(frames))] += 1
+                samples += 1
+                time.sleep(interval)
+
+            return {
+                "seconds": seconds,
+                "interval": interval,
+                "samples": samples,
+                "stacks": [{"stack": stack, "count": count} for stack, count in stacks.most_common()],
+            }
+        finally:
+            self._lock.release()
+
+
+class StallDetector:
+    """Logs the stack of any thread stuck in one stage longer than a threshold.
+
+    Stages are marked with ``watch(stage)``. A monitor thread checks them
+    every ``threshold / 2`` seconds and logs each stall once.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.stalls = 0
+        self._active: dict[int, tuple[int, str, float]] = {}
+        self._reported: set[int] = set()
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, stage: str) -> "_Watch":
+        """Context manager marking the calling thread as inside a stage."""
+        return _Watch(self, stage)
+
+    def check(self) -> int:
+        """Log stages running past the threshold.
+
+        Returns:
+            Number of new stalls found
+        """
+        now = time.monotonic()
+        with self._lock:
+            stalled = [
+                (token, thread_id, stage, started)
+                for token, (thread_id, stage, started) in self._active.items()
+                if now - started > self.threshold and token not in self._reported
+            ]
+            self._reported.update(token for token, *_ in stalled)
+
+        if not stalled:
+            return 0
+
+        frames = sys._current_frames()
+        names = _thread_names()
+        for _, thread_id, stage, started in stalled:
+            frame = frames.get(thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(thread finished)\n"
+            logger.warning(
+                f"Stage {stage} blocked for {now - started:.1f}s in thread "
+                f"{names.get(thread_id, thread_id)}:\n{stack}"
+            )
+        self.stalls += len(stalled)
+        return len(stalled)
+
+    def _run(self):
+        """Monitor loop."""
+        while not self._stop.wait(self.threshold / 2):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Stall check failed: {e}")
+
+    def start(self) -> None:
+        """Start the monitor thread."""
+        self._thread = threading.Thread(target=self._run, name="stall-detector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the monitor thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class _Watch:
+    def __init__(self, detector: StallDetector, stage: str):
+        self.detector = detector
+        self.stage = stage
+
+    def __enter__(self):
+        self.token = next(self.detector._tokens)
+        with self.detector._lock:
+            self.detector._active[self.token] = (threading.get_ident(), self.stage, time.monotonic())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.detector._lock:
+            self.detector._active.pop(self.token, None)
+            self.detector._reported.discard(self.token)
+        return False
+
+
+# Set by install_stall_detector; stages are not watched until then
+_detector: StallDetector | None = None
+
+
+def install_stall_detector(detector: StallDetector | None) -> None:
+    """Make ``watch`` report to a detector, or to nothing with None."""
+    global _detector
+    _detector = detector
+
+
+def watch(stage: str):
+    """Mark the enclosed block as a stage for the installed stall detector."""
+    detector = _detector
+    if detector is None:
+        return NOOP
+    return detector.watch(stage)
@@ -0,0 +1,134 @@
+"""Address to delivery routing for Wallet Watch."""
+
+from dataclasses import dataclass, field
+
+from wallet_watch.config import DigestConfig, WatchConfig
+
+
+@dataclass(frozen=True)
+class Target:
+    """A single delivery destination for a watched address."""
+
+    notifier: str
+    recipient: str = ""
+    label: str = ""
+    template: str = ""
+
+
+def _add_targets(targets: dict[str, dict[Target, None]], watch: WatchConfig) -> None:
+    """Add a watch's (notifier, recipient) targets, keeping first-seen order."""
+    recipients = watch.recipients or [""]
+    for notifier in watch.notify:
+        group = targets.setdefault(notifier, {})
+        for recipient in recipients:
+            group[Target(notifier, recipient, watch.label, watch.template)] = None
+
+
+@dataclass
+class DigestGroup:
+    """Targets on one address that share a label and coalescing settings."""
+
+    address: str
+    label: str
+    settings: DigestConfig
+    targets: dict[str, list[Target]] = field(default_factory=dict)
+    priority: int = 0
+
+    @property
+    def key(self) -> tuple:
+        return (self.address, self.label, self.settings.window, self.settings.max_delay, self.settings.top_n)
+
+
+@dataclass
+class Route:
+    """Precomputed delivery plan for one address.
+
+    Targets are grouped by notifier and deduplicated, and the distinct
+    labels are kept so each message is rendered once per label. Watches
+    with a digest window are split into digest groups instead.
+    """
+
+    address: str
+    chain: str
+    watches: list[WatchConfig]
+    targets: dict[str, list[Target]] = field(default_factory=dict)
+    labels: tuple[str, ...] = ()
+    digests: list[DigestGroup] = field(default_factory=list)
+    priority: int = 0
+
+    @classmethod
+    def build(cls, address: str, watches: list[WatchConfig]) -> "Route":
+        """Build a route from all watches on an address."""
+        targets: dict[str, dict[Target, None]] = {}
+        labels: dict[str, None] = {}
+        digest_targets: dict[tuple, tuple[WatchConfig, dict[str, dict[Target, None]]]] = {}
+        digest_priority: dict[tuple, int] = {}
+        priorities = []
+
+        for watch in watches:
+            if watch.digest.window > 0:
+                settings = watch.digest
+                key = (watch.label, settings.window, settings.max_delay, settings.top_n)
+                _, group_targets = digest_targets.setdefault(key, (watch, {}))
+                _add_targets(group_targets, watch)
+                digest_priority[key] = max(digest_priority.get(key, watch.priority), watch.priority)
+            else:
+                labels[watch.label] = None
+                _add_targets(targets, watch)
+                priorities.append(watch.priority)
+
+        digests = [
+            DigestGroup(
+                address=address,
+                label=watch.label,
+                settings=watch.digest,
+                targets={name: list(group) for name, group in group_targets.items()},
+                priority=digest_priority[key],
+            )
+            for key, (watch, group_targets) in digest_targets.items()
+        ]
+
+        return cls(
+            address=address,
+            chain=watches[0].chain,
+            watches=list(watches),
+            targets={name: list(group) for name, group in targets.items()},
+            labels=tuple(labels),
+            digests=digests,
+            priority=max(priorities, default=0),
+        )
+
+
+class RoutingTable:
+    """Maps watched addresses to their precomputed routes.
+
+    Routes are rebuilt per address when its watches change, so updates are
+    incremental and lookups on the hot path are a single dict access.
+    """
+
+    def __init__(self):
+        self._routes: dict[str, Route] = {}
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._routes
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def get(self, address: str) -> Route | None:
+        """Get the route for an address."""
+        return self._routes.get(address)
+
+    def set(self, address: str, watches: list[WatchConfig]) -> Route:
+        """Replace the watches on an address and rebuild its route."""
+        route = Route.build(address, watches)
+        self._routes[address] = route
+        return route
+
+    def remove(self, address: str) -> Route | None:
+        """Remove an address, returning its previous route."""
+        return self._routes.pop(address, None)
+
+    def routes(self) -> list[Route]:
+        """Return a snapshot of all routes."""
+        return list(self._routes.values())
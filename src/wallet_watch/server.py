@@ -0,0 +1,221 @@
+"""Shared ingest server and provider lifecycle for Wallet Watch."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer, make_server
+
+from wallet_watch.chains.base import ChainBase
+from wallet_watch.metrics import REGISTRY
+from wallet_watch.profiling import watch
+
+
+logger = logging.getLogger(__name__)
+
+WEBHOOKS_TOTAL = REGISTRY.counter(
+    "wallet_watch_webhooks_total", "Webhook requests by chain and response status", ("chain", "status")
+)
+
+
+class IngestServer:
+    """One HTTP server that receives webhooks for every chain provider.
+
+    Each mounted provider gets ``/webhook/<chain>``. The bare ``/webhook``
+    route is kept for existing Helius configurations and goes to the first
+    provider mounted. Webhooks being handled are counted so shutdown can
+    wait for them.
+    """
+
+    def __init__(
+        self,
+        health_check: Callable[[], dict] | None = None,
+        admission_check: Callable[[], int | None] | None = None,
+    ):
+        self.health_check = health_check
+        self.admission_check = admission_check
+        self.providers: dict[str, ChainBase] = {}
+        self.app = Flask("wallet_watch")
+        self.port: int | None = None
+        self._server: BaseWSGIServer | None = None
+        self._server_lock = threading.Lock()
+        self._closed = False
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self._setup_routes()
+
+    def mount(self, provider: ChainBase) -> None:
+        """Route ``/webhook/<provider.name>`` to a provider."""
+        self.providers[provider.name] = provider
+        logger.info(f"Webhook route mounted: /webhook/{provider.name}")
+
+    def _setup_routes(self):
+        """Setup webhook and health routes."""
+
+        @self.app.route("/webhook/<chain>", methods=["POST"])
+        def chain_webhook(chain: str):
+            provider = self.providers.get(chain)
+            if provider is None:
+                return jsonify({"error": f"Unknown chain: {chain}"}), 404
+            return self._handle(provider)
+
+        @self.app.route("/webhook", methods=["POST"])
+        def default_webhook():
+            if not self.providers:
+                return jsonify({"error": "No chains configured"}), 404
+            return self._handle(next(iter(self.providers.values())))
+
+        @self.app.route("/metrics", methods=["GET"])
+        def metrics():
+            return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+        @self.app.route("/health", methods=["GET"])
+        def health():
+            if self.health_check is None:
+                return jsonify({"status": "healthy"}), 200
+            # Load balancers and orchestrators only look at the status code
+            report = self.health_check()
+            return jsonify(report), 200 if report.get("status") == "healthy" else 503
+
+    def _handle(self, provider: ChainBase):
+        """Authenticate, apply admission control, then let the provider handle the request."""
+        # Unauthenticated callers learn nothing, including whether we are overloaded
+        if not provider.authorize_webhook(request):
+            WEBHOOKS_TOTAL.labels(chain=provider.name, status=401).inc()
+            return jsonify({"error": "Unauthorized"}), 401
+
+        # Shed load before parsing; webhook senders retry rejected deliveries
+        if self.admission_check is not None:
+            retry_after = self.admission_check()
+            if retry_after is not None:
+                WEBHOOKS_TOTAL.labels(chain=provider.name, status=503).inc()
+                response = jsonify({"error": "Overloaded"})
+                response.headers["Retry-After"] = str(retry_after)
+                return response, 503
+
+        with self._idle:
+            self._in_flight += 1
+        try:
+            with watch(f"webhook:{provider.name}"):
+                body, status = provider.handle_webhook(request)
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+        WEBHOOKS_TOTAL.labels(chain=provider.name, status=status).inc()
+        return jsonify(body), status
+
+    def serve(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        """Serve requests until ``shutdown`` is called (blocking)."""
+        with self._server_lock:
+            if self._closed:
+                return
+            self._server = make_server(host, port, self.app, threaded=True)
+            self.port = self._server.server_port
+        logger.info(f"Ingest server listening on {host}:{self.port}")
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop accepting requests and return from ``serve``.
+
+        Safe to call more than once, and before ``serve``.
+        """
+        with self._server_lock:
+            self._closed = True
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def drain(self, timeout: float) -> int:
+        """Wait for webhooks still being handled.
+
+        Returns:
+            Number of webhooks still in flight when the timeout passed
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+            return self._in_flight
+
+
+class ProviderSupervisor:
+    """Starts, watches and stops the background work of chain providers.
+
+    Providers are started and stopped concurrently. Every ``interval``
+    seconds an unhealthy provider is restarted, backing off exponentially
+    up to ``max_backoff`` between attempts.
+    """
+
+    def __init__(self, providers: dict[str, ChainBase], interval: float = 5.0, max_backoff: float = 60.0):
+        self.providers = providers
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.restarts = {name: 0 for name in providers}
+        self._failures = {name: 0 for name in providers}
+        self._next_restart = {name: 0.0 for name in providers}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _each(self, action: str) -> None:
+        """Call start or stop on every provider in parallel."""
+        if not self.providers:
+            return
+
+        def call(name: str, provider: ChainBase):
+            try:
+                getattr(provider, action)()
+            except Exception as e:
+                logger.error(f"Failed to {action} chain provider {name}: {e}")
+
+        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
+            for name, provider in self.providers.items():
+                executor.submit(call, name, provider)
+
+    def start(self) -> None:
+        """Start all providers and the supervision loop."""
+        self._each("start")
+        self._thread = threading.Thread(target=self._run, name="supervisor", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Supervision loop."""
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> None:
+        """Restart unhealthy providers whose backoff has passed."""
+        now = time.monotonic()
+        for name, provider in self.providers.items():
+            if provider.healthy():
+                self._failures[name] = 0
+                continue
+            if now < self._next_restart[name]:
+                continue
+
+            self.restarts[name] += 1
+            self._failures[name] += 1
+            delay = min(self.max_backoff, self.interval * 2 ** (self._failures[name] - 1))
+            self._next_restart[name] = now + delay
+            logger.warning(f"Chain provider {name} is unhealthy, restarting (attempt {self.restarts[name]})")
+            try:
+                provider.stop()
+                provider.start()
+            except Exception as e:
+                logger.error(f"Failed to restart chain provider {name}: {e}")
+
+    def stop(self) -> None:
+        """Stop supervising, then stop all providers."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._each("stop")
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return health and restart counts per provider."""
+        return {
+            name: {"healthy": provider.healthy(), "restarts": self.restarts[name]}
+            for name, provider in self.providers.items()
+        }
@@ -1,8 +1,12 @@
 """Storage providers."""
 
+from typing import TYPE_CHECKING
+
 from wallet_watch.storage.base import StorageBase
 from wallet_watch.storage.sqlite import SQLiteStorage
-from wallet_watch.config import StorageConfig
+
+if TYPE_CHECKING:
+    from wallet_watch.config import StorageConfig
 
 STORAGE_PROVIDERS = {
     "sqlite": SQLiteStorage,
@@ -16,7 +20,7 @@ except ImportError:
     pass
 
 
-def get_storage(config: StorageConfig) -> StorageBase:
+def get_storage(config: "StorageConfig") -> StorageBase:
     """Get a storage provider from config."""
     storage_type = config.type
 
@@ -1,14 +1,28 @@
 """Base class for storage providers."""
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Any
 
+from wallet_watch.metrics import FAST_BUCKETS, REGISTRY
+
+
+STORAGE_SECONDS = REGISTRY.histogram(
+    "wallet_watch_storage_seconds", "Time per storage operation", ("op",), FAST_BUCKETS
+)
+
 
 class StorageBase(ABC):
     """Abstract base class for storage providers."""
 
     name: str = "base"
 
+    # Providers that implement the notification outbox set this to True
+    supports_outbox: bool = False
+
+    # Providers with a full-text index over descriptions set this to True
+    supports_search: bool = False
+
     @abstractmethod
     def save_watch(self, address: str, chain: str, label: str = "", **kwargs) -> bool:
         """Save a watch configuration.
@@ -48,6 +62,38 @@ class StorageBase(ABC):
         """
         pass
 
+    def save_watches(self, watches: list[dict]) -> int:
+        """Save many watch configurations at once.
+
+        The watches given for an address replace all stored watches on it.
+        Providers should override this with a single bulk write; the default
+        falls back to one ``save_watch`` call per entry, so it keeps only the
+        last watch per address.
+
+        Args:
+            watches: Watch dicts with ``address``, ``chain`` and optional fields
+
+        Returns:
+            Number of watches saved
+        """
+        saved = 0
+        for watch in watches:
+            fields = dict(watch)
+            if self.save_watch(fields.pop("address"), fields.pop("chain"), **fields):
+                saved += 1
+        return saved
+
+    def delete_watches(self, addresses: list[str]) -> int:
+        """Delete many watches by address.
+
+        Args:
+            addresses: Wallet addresses to delete
+
+        Returns:
+            Number of watches deleted
+        """
+        return sum(1 for address in addresses if self.delete_watch(address))
+
     @abstractmethod
     def save_transaction(self, transaction: Any) -> bool:
         """Save a transaction record.
@@ -73,6 +119,168 @@ class StorageBase(ABC):
         """
         pass
 
+    def get_transactions_after(
+        self, after_id: int, addresses: list[str] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """Get transactions stored after a cursor, oldest first.
+
+        Args:
+            after_id: Storage ID of the last transaction already seen
+            addresses: Optional address filter; an empty list matches nothing
+            limit: Maximum number of transactions to return
+
+        Returns:
+            Transaction records, each with its ``id``
+        """
+        raise NotImplementedError(f"{self.name} storage does not support transaction cursors")
+
+    def search_transactions(
+        self,
+        query: str,
+        address: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 20,
+        order: str = "rank",
+        raw: bool = False,
+    ) -> list[dict]:
+        """Search transaction descriptions.
+
+        Args:
+            query: Words and "quoted phrases" that must all appear; ``word*``
+                matches a prefix
+            address: Optional address filter
+            since: Only transactions stored at or after this time
+            until: Only transactions stored before this time
+            limit: Maximum number of transactions to return
+            order: "rank" for best matches first, "newest" for most recent first
+            raw: Pass ``query`` to the search engine unchanged
+
+        Returns:
+            Transaction records with a highlighted ``snippet``
+
+        Raises:
+            ValueError: If the query is not valid
+        """
+        raise NotImplementedError(f"{self.name} storage does not support search")
+
+    def save_transaction_with_outbox(
+        self, transaction: Any, intents: list[dict], lease_until: float | None
+    ) -> list[int | None]:
+        """Save a transaction and its notification intents atomically.
+
+        Args:
+            transaction: Transaction object to save
+            intents: Dicts with ``signature``, ``notifier``, ``deliveries`` and
+                optional ``priority``, ``partition`` and ``dedupe_key``
+            lease_until: Time until which the new rows are claimed by the
+                caller, or None to leave them for the poller
+
+        Returns:
+            Outbox IDs, in the same order as ``intents``; None for intents
+            whose ``dedupe_key`` is already in the outbox
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def save_outbox(self, intents: list[dict], lease_until: float | None) -> list[int | None]:
+        """Save notification intents that have no transaction row.
+
+        Returns:
+            Outbox IDs, in the same order as ``intents``
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def claim_outbox(
+        self,
+        now: float,
+        lease_until: float,
+        limit: int = 100,
+        fence: tuple[str, dict[int, int]] | None = None,
+    ) -> list[dict]:
+        """Claim pending intents that are due and not leased, highest priority first.
+
+        Args:
+            now: Current time (epoch seconds)
+            lease_until: Time until which the claimed rows are leased
+            limit: Maximum rows to claim
+            fence: ``(holder, {partition: token})`` to claim only rows of
+                partitions whose lease the holder still has with that token
+
+        Returns:
+            Claimed outbox rows
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def complete_outbox(self, outbox_id: int) -> None:
+        """Remove a delivered intent.
+
+        Intents with a ``dedupe_key`` are kept as ``sent`` until pruned, so
+        a later copy of the same intent is ignored.
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def prune_outbox(self, before: float) -> int:
+        """Delete ``sent`` intents completed before a time.
+
+        Returns:
+            Number of rows deleted
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def retry_outbox(
+        self,
+        outbox_id: int,
+        deliveries: list[dict],
+        error: str,
+        next_attempt_at: float | None,
+        count_attempt: bool = True,
+    ) -> None:
+        """Record a failed attempt.
+
+        Args:
+            outbox_id: Outbox row ID
+            deliveries: Deliveries still outstanding
+            error: Description of the failure
+            next_attempt_at: When to retry, or None to move the row to dead letters
+            count_attempt: False to defer the row without using up an attempt
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def release_outbox_leases(self) -> int:
+        """Release all leases after a restart so pending rows are retried promptly.
+
+        Returns:
+            Number of rows released
+        """
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def outbox_counts(self) -> dict[str, int]:
+        """Return the number of outbox rows per status."""
+        raise NotImplementedError(f"{self.name} storage does not support the outbox")
+
+    def acquire_lease(self, name: str, holder: str, now: float, expires_at: float) -> int | None:
+        """Take a free or expired lease, or renew one the holder already has.
+
+        Args:
+            name: Lease name
+            holder: Unique ID of the caller
+            now: Current time (epoch seconds)
+            expires_at: New expiry time
+
+        Returns:
+            Fencing token, which increases every time the lease changes
+            hands, or None if another holder has the lease
+        """
+        raise NotImplementedError(f"{self.name} storage does not support leases")
+
+    def release_lease(self, name: str, holder: str) -> None:
+        """Give up a lease if the holder still has it."""
+        raise NotImplementedError(f"{self.name} storage does not support leases")
+
+    def get_leases(self, prefix: str = "") -> list[dict]:
+        """Return leases whose name starts with ``prefix``."""
+        raise NotImplementedError(f"{self.name} storage does not support leases")
+
     @abstractmethod
     def close(self) -> None:
         """Close any open connections."""
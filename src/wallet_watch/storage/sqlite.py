@@ -2,21 +2,67 @@
 
 import json
 import logging
+import re
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from wallet_watch.storage.base import StorageBase
+from wallet_watch.metrics import timed
+from wallet_watch.storage.base import STORAGE_SECONDS, StorageBase
 
 
 logger = logging.getLogger(__name__)
 
+# Watch fields stored in their own columns; anything else goes in ``settings``
+WATCH_COLUMNS = ("address", "chain", "label", "notify", "recipients", "filters")
+
+WATCHES_SCHEMA = """
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    address TEXT NOT NULL,
+    chain TEXT NOT NULL,
+    label TEXT,
+    notify TEXT,
+    recipients TEXT,
+    filters TEXT,
+    settings TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+"""
+
+# A quoted phrase or a bare word, either optionally followed by * for a prefix
+_QUERY_TERMS = re.compile(r'"[^"]*"\*?|[^\s"]+')
+
+
+def fts_query(text: str) -> str:
+    """Turn search box text into an FTS5 query that matches all of its terms.
+
+    Words and ``"quoted phrases"`` are quoted so punctuation and FTS5
+    operators in them are taken literally; a trailing ``*`` makes a term
+    a prefix match, as in ``BON*``.
+    """
+    terms = []
+    for term in _QUERY_TERMS.findall(text):
+        prefix = term.endswith("*")
+        words = term.rstrip("*").strip('"')
+        if words.strip():
+            terms.append('"' + words.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _sql_time(value: datetime) -> str:
+    """A time in the UTC text format of ``CURRENT_TIMESTAMP``; naive times are taken as UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class SQLiteStorage(StorageBase):
     """SQLite storage provider."""
 
     name = "sqlite"
+    supports_outbox = True
 
     def __init__(self, path: str = "./data/wallet_watch.db"):
         self.path = Path(path)
@@ -24,6 +70,7 @@ class SQLiteStorage(StorageBase):
 
         self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
         self._init_tables()
 
         logger.info(f"SQLite storage initialized at {self.path}")
@@ -32,17 +79,8 @@ class SQLiteStorage(StorageBase):
         """Create tables if they don't exist."""
         cursor = self.conn.cursor()
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS watches (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                address TEXT NOT NULL UNIQUE,
-                chain TEXT NOT NULL,
-                label TEXT,
-                notify TEXT,
-                filters TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        # One row per watch; an address can have several (one per target)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS watches ({WATCHES_SCHEMA})")
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS transactions (
@@ -63,38 +101,204 @@ class SQLiteStorage(StorageBase):
             ON transactions(address)
         """)
 
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                signature TEXT,
+                notifier TEXT NOT NULL,
+                deliveries TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                leased_until REAL,
+                last_error TEXT,
+                priority INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Only pending rows are indexed, so recovery never scans dead letters
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbox_pending
+            ON outbox(next_attempt_at) WHERE status = 'pending'
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL DEFAULT '',
+                token INTEGER NOT NULL DEFAULT 0,
+                expires_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+
+        self._add_missing_columns(cursor, "watches", {"recipients": "TEXT", "settings": "TEXT"})
+        self._drop_unique_watch_address(cursor)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_watches_address ON watches(address)")
+        self._add_missing_columns(cursor, "outbox", {
+            "priority": "INTEGER NOT NULL DEFAULT 0",
+            "partition_id": "INTEGER",
+            "dedupe_key": "TEXT",
+        })
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbox_sent
+            ON outbox(next_attempt_at) WHERE status = 'sent'
+        """)
+
+        # Replicas sharing the database may both receive the same transaction
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_outbox_dedupe
+            ON outbox(dedupe_key) WHERE dedupe_key IS NOT NULL
+        """)
+
+        self.supports_search = self._init_search(cursor)
         self.conn.commit()
 
-    def save_watch(self, address: str, chain: str, label: str = "", **kwargs) -> bool:
-        """Save a watch configuration."""
+    def _init_search(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the full-text index over descriptions, kept in sync by triggers.
+
+        The index is an external-content FTS5 table, so descriptions are
+        not stored twice. Triggers update it in the same transaction as
+        every write to ``transactions``. A database created before the
+        index existed is indexed once here.
+
+        Returns:
+            False if this SQLite was built without FTS5
+        """
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'"
+        ).fetchone()
         try:
-            cursor = self.conn.cursor()
             cursor.execute("""
-                INSERT OR REPLACE INTO watches (address, chain, label, notify, filters)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                address,
-                chain,
-                label,
-                json.dumps(kwargs.get("notify", [])),
-                json.dumps(kwargs.get("filters", {})),
-            ))
-            self.conn.commit()
+                CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+                    description, content='transactions', content_rowid='id', prefix='3'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5 ({e}); searches will scan all descriptions")
+            return False
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+                INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+                INSERT INTO transactions_fts (transactions_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN
+                INSERT INTO transactions_fts (transactions_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+                INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);
+            END
+        """)
+
+        if not existed and cursor.execute("SELECT 1 FROM transactions LIMIT 1").fetchone():
+            started = time.perf_counter()
+            cursor.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+            logger.info(f"Indexed existing transaction descriptions in {time.perf_counter() - started:.1f}s")
+        return True
+
+    def _drop_unique_watch_address(self, cursor: sqlite3.Cursor):
+        """Rebuild a watches table from before an address could have several watches."""
+        cursor.execute("PRAGMA index_list(watches)")
+        if not any(row["unique"] and row["origin"] == "u" for row in cursor.fetchall()):
+            return
+        cursor.execute(f"CREATE TABLE watches_new ({WATCHES_SCHEMA})")
+        cursor.execute("""
+            INSERT INTO watches_new (id, address, chain, label, notify, recipients, filters, settings, created_at)
+            SELECT id, address, chain, label, notify, recipients, filters, settings, created_at FROM watches
+        """)
+        cursor.execute("DROP TABLE watches")
+        cursor.execute("ALTER TABLE watches_new RENAME TO watches")
+        logger.info("Allowed several watches per address in the watches table")
+
+    def _add_missing_columns(self, cursor: sqlite3.Cursor, table: str, columns: dict[str, str]):
+        """Add columns introduced after a database was first created."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in cursor.fetchall()}
+
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                logger.info(f"Added column {table}.{name}")
+
+    def save_watch(self, address: str, chain: str, label: str = "", **kwargs) -> bool:
+        """Save a watch configuration, replacing any watches on the same address."""
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute("DELETE FROM watches WHERE address = ?", (address,))
+                cursor.execute("""
+                    INSERT INTO watches
+                    (address, chain, label, notify, recipients, filters, settings)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    address,
+                    chain,
+                    label,
+                    json.dumps(kwargs.get("notify", [])),
+                    json.dumps(kwargs.get("recipients", [])),
+                    json.dumps(kwargs.get("filters", {})),
+                    json.dumps({k: v for k, v in kwargs.items() if k not in WATCH_COLUMNS}),
+                ))
+                self.conn.commit()
             logger.debug(f"Saved watch: {address}")
             return True
         except Exception as e:
             logger.error(f"Failed to save watch: {e}")
             return False
 
+    @timed(STORAGE_SECONDS, op="save_watches")
+    def save_watches(self, watches: list[dict]) -> int:
+        """Save many watch configurations in one transaction.
+
+        The watches given for an address replace all stored watches on it.
+        """
+        rows = [
+            (
+                watch["address"],
+                watch["chain"],
+                watch.get("label", ""),
+                json.dumps(watch.get("notify", [])),
+                json.dumps(watch.get("recipients", [])),
+                json.dumps(watch.get("filters", {})),
+                json.dumps({k: v for k, v in watch.items() if k not in WATCH_COLUMNS}),
+            )
+            for watch in watches
+        ]
+
+        try:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "DELETE FROM watches WHERE address = ?",
+                    [(address,) for address in dict.fromkeys(row[0] for row in rows)],
+                )
+                self.conn.executemany("""
+                    INSERT INTO watches
+                    (address, chain, label, notify, recipients, filters, settings)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            logger.debug(f"Saved {len(rows)} watches")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to save watches: {e}")
+            return 0
+
     def get_watches(self, chain: str = None) -> list[dict]:
         """Get all watches."""
         try:
             cursor = self.conn.cursor()
 
             if chain:
-                cursor.execute("SELECT * FROM watches WHERE chain = ?", (chain,))
+                cursor.execute("SELECT * FROM watches WHERE chain = ? ORDER BY id", (chain,))
             else:
-                cursor.execute("SELECT * FROM watches")
+                cursor.execute("SELECT * FROM watches ORDER BY id")
 
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
@@ -105,38 +309,238 @@ class SQLiteStorage(StorageBase):
     def delete_watch(self, address: str) -> bool:
         """Delete a watch by address."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM watches WHERE address = ?", (address,))
-            self.conn.commit()
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute("DELETE FROM watches WHERE address = ?", (address,))
+                self.conn.commit()
             logger.debug(f"Deleted watch: {address}")
             return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Failed to delete watch: {e}")
             return False
 
+    def delete_watches(self, addresses: list[str]) -> int:
+        """Delete many watches in one transaction."""
+        try:
+            with self._lock, self.conn:
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    "DELETE FROM watches WHERE address = ?",
+                    [(address,) for address in addresses],
+                )
+                deleted = self.conn.total_changes - before
+            logger.debug(f"Deleted {deleted} watches")
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to delete watches: {e}")
+            return 0
+
+    @timed(STORAGE_SECONDS, op="save_transaction")
     def save_transaction(self, transaction: Any) -> bool:
         """Save a transaction record."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT OR IGNORE INTO transactions
-                (signature, chain, address, tx_type, description, amount_usd, raw)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                transaction.signature,
-                transaction.chain,
-                transaction.address,
-                transaction.tx_type,
-                transaction.description,
-                transaction.amount_usd,
-                json.dumps(transaction.raw) if transaction.raw else None,
-            ))
-            self.conn.commit()
+            with self._lock, self.conn:
+                self._insert_transaction(transaction)
             return True
         except Exception as e:
             logger.error(f"Failed to save transaction: {e}")
             return False
 
+    def _insert_transaction(self, transaction: Any):
+        cursor = self.conn.execute("""
+            INSERT OR IGNORE INTO transactions
+            (signature, chain, address, tx_type, description, amount_usd, raw)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            transaction.signature,
+            transaction.chain,
+            transaction.address,
+            transaction.tx_type,
+            transaction.description,
+            transaction.amount_usd,
+            getattr(transaction, "raw_json", None) or (json.dumps(transaction.raw) if transaction.raw else None),
+        ))
+        if cursor.rowcount and hasattr(transaction, "row_id"):
+            transaction.row_id = cursor.lastrowid
+
+    def _insert_outbox(self, intents: list[dict], lease_until: float | None) -> list[int | None]:
+        ids = []
+        for intent in intents:
+            cursor = self.conn.execute("""
+                INSERT OR IGNORE INTO outbox
+                (signature, notifier, deliveries, next_attempt_at, leased_until, priority, partition_id, dedupe_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                intent.get("signature"),
+                intent["notifier"],
+                json.dumps(intent["deliveries"]),
+                time.time(),
+                lease_until,
+                intent.get("priority", 0),
+                intent.get("partition"),
+                intent.get("dedupe_key"),
+            ))
+            ids.append(cursor.lastrowid if cursor.rowcount else None)
+        return ids
+
+    @timed(STORAGE_SECONDS, op="save_transaction_with_outbox")
+    def save_transaction_with_outbox(
+        self, transaction: Any, intents: list[dict], lease_until: float | None
+    ) -> list[int | None]:
+        """Save a transaction and its notification intents in one transaction."""
+        with self._lock, self.conn:
+            self._insert_transaction(transaction)
+            return self._insert_outbox(intents, lease_until)
+
+    @timed(STORAGE_SECONDS, op="save_outbox")
+    def save_outbox(self, intents: list[dict], lease_until: float | None) -> list[int | None]:
+        """Save notification intents without a transaction row."""
+        with self._lock, self.conn:
+            return self._insert_outbox(intents, lease_until)
+
+    @timed(STORAGE_SECONDS, op="claim_outbox")
+    def claim_outbox(
+        self,
+        now: float,
+        lease_until: float,
+        limit: int = 100,
+        fence: tuple[str, dict[int, int]] | None = None,
+    ) -> list[dict]:
+        """Claim due, unleased pending rows using the pending index, most urgent first."""
+        with self._lock, self.conn:
+            partition_filter = ""
+            params: list[Any] = [now, now]
+            if fence is not None:
+                # Take the write lock first so no lease can change hands mid-claim
+                self.conn.execute("BEGIN IMMEDIATE")
+                partitions = self._fenced_partitions(*fence, now)
+                if not partitions:
+                    return []
+                partition_filter = f"AND COALESCE(partition_id, 0) IN ({', '.join('?' * len(partitions))})"
+                params.extend(partitions)
+
+            rows = self.conn.execute(f"""
+                SELECT * FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                  AND (leased_until IS NULL OR leased_until <= ?)
+                  {partition_filter}
+                ORDER BY priority DESC, next_attempt_at
+                LIMIT ?
+            """, (*params, limit)).fetchall()
+
+            self.conn.executemany(
+                "UPDATE outbox SET leased_until = ? WHERE id = ?",
+                [(lease_until, row["id"]) for row in rows],
+            )
+
+        claimed = []
+        for row in rows:
+            record = dict(row)
+            record["deliveries"] = json.loads(record["deliveries"])
+            claimed.append(record)
+        return claimed
+
+    def _fenced_partitions(self, holder: str, tokens: dict[int, int], now: float) -> list[int]:
+        """Partitions whose lease the holder still has with the given token."""
+        rows = self.conn.execute(
+            "SELECT name, token FROM leases WHERE holder = ? AND expires_at > ? AND name LIKE 'partition:%'",
+            (holder, now),
+        ).fetchall()
+        current = {int(row["name"].split(":", 1)[1]): row["token"] for row in rows}
+        return [partition for partition, token in tokens.items() if current.get(partition) == token]
+
+    @timed(STORAGE_SECONDS, op="complete_outbox")
+    def complete_outbox(self, outbox_id: int) -> None:
+        """Delete a delivered row, or keep it as a tombstone if it has a dedupe key."""
+        with self._lock, self.conn:
+            self.conn.execute("""
+                UPDATE outbox SET status = 'sent', deliveries = '[]', leased_until = NULL, next_attempt_at = ?
+                WHERE id = ? AND dedupe_key IS NOT NULL
+            """, (time.time(), outbox_id))
+            self.conn.execute("DELETE FROM outbox WHERE id = ? AND dedupe_key IS NULL", (outbox_id,))
+
+    def prune_outbox(self, before: float) -> int:
+        """Delete tombstones completed before a time."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND next_attempt_at < ?", (before,)
+            )
+            return cursor.rowcount
+
+    @timed(STORAGE_SECONDS, op="retry_outbox")
+    def retry_outbox(
+        self,
+        outbox_id: int,
+        deliveries: list[dict],
+        error: str,
+        next_attempt_at: float | None,
+        count_attempt: bool = True,
+    ) -> None:
+        """Schedule a retry, or dead-letter the row when next_attempt_at is None."""
+        with self._lock, self.conn:
+            self.conn.execute("""
+                UPDATE outbox
+                SET deliveries = ?, attempts = attempts + ?, last_error = ?,
+                    status = ?, next_attempt_at = COALESCE(?, next_attempt_at), leased_until = NULL
+                WHERE id = ?
+            """, (
+                json.dumps(deliveries),
+                int(count_attempt),
+                error,
+                "pending" if next_attempt_at is not None else "dead",
+                next_attempt_at,
+                outbox_id,
+            ))
+
+    def release_outbox_leases(self) -> int:
+        """Clear leases held by a previous process."""
+        # The next_attempt_at bound lets SQLite use the pending index
+        with self._lock, self.conn:
+            cursor = self.conn.execute("""
+                UPDATE outbox SET leased_until = NULL
+                WHERE status = 'pending' AND next_attempt_at >= 0 AND leased_until IS NOT NULL
+            """)
+            return cursor.rowcount
+
+    def outbox_counts(self) -> dict[str, int]:
+        """Count outbox rows per status."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) AS n FROM outbox GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def acquire_lease(self, name: str, holder: str, now: float, expires_at: float) -> int | None:
+        """Take or renew a lease in one write transaction."""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO leases (name) VALUES (?)", (name,))
+            cursor = self.conn.execute("""
+                UPDATE leases
+                SET token = CASE WHEN holder = ? THEN token ELSE token + 1 END,
+                    holder = ?, expires_at = ?
+                WHERE name = ? AND (holder = ? OR expires_at <= ?)
+            """, (holder, holder, expires_at, name, holder, now))
+            if cursor.rowcount == 0:
+                return None
+            return self.conn.execute("SELECT token FROM leases WHERE name = ?", (name,)).fetchone()["token"]
+
+    def release_lease(self, name: str, holder: str) -> None:
+        """Free a lease, keeping its token so the next holder gets a higher one."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE leases SET holder = '', expires_at = 0 WHERE name = ? AND holder = ?",
+                (name, holder),
+            )
+
+    def get_leases(self, prefix: str = "") -> list[dict]:
+        """Return leases by name prefix."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM leases WHERE substr(name, 1, ?) = ? ORDER BY name",
+                (len(prefix), prefix),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
     def get_transactions(self, address: str = None, limit: int = 100) -> list[dict]:
         """Get transactions."""
         try:
@@ -159,6 +563,160 @@ class SQLiteStorage(StorageBase):
             logger.error(f"Failed to get transactions: {e}")
             return []
 
+    # Longer address filters are applied while scanning instead of as an IN list
+    MAX_ADDRESS_PARAMS = 500
+
+    def get_transactions_after(
+        self, after_id: int, addresses: list[str] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """Get transactions with IDs above a cursor, oldest first."""
+        params: list[Any] = [after_id]
+        address_filter = ""
+        wanted = None
+        if addresses is not None and len(addresses) <= self.MAX_ADDRESS_PARAMS:
+            address_filter = f"AND address IN ({', '.join('?' * len(addresses))})"
+            params.extend(addresses)
+        elif addresses is not None:
+            wanted = set(addresses)
+
+        if wanted is None:
+            with self._lock:
+                rows = self.conn.execute(f"""
+                    SELECT id, signature, chain, address, tx_type, description, amount_usd, created_at
+                    FROM transactions WHERE id > ? {address_filter} ORDER BY id LIMIT ?
+                """, (*params, limit)).fetchall()
+            return [dict(row) for row in rows]
+
+        results: list[dict] = []
+        while len(results) < limit:
+            with self._lock:
+                rows = self.conn.execute("""
+                    SELECT id, signature, chain, address, tx_type, description, amount_usd, created_at
+                    FROM transactions WHERE id > ? ORDER BY id LIMIT ?
+                """, (after_id, limit)).fetchall()
+            if not rows:
+                break
+            results.extend(dict(row) for row in rows if row["address"] in wanted)
+            after_id = rows[-1]["id"]
+        return results[:limit]
+
+    @timed(STORAGE_SECONDS, op="search_transactions")
+    def search_transactions(
+        self,
+        query: str,
+        address: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 20,
+        order: str = "rank",
+        raw: bool = False,
+    ) -> list[dict]:
+        """Full-text search over descriptions with the FTS5 index."""
+        if order not in ("rank", "newest"):
+            raise ValueError(f"Unknown search order {order!r}")
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+
+        filters = []
+        params: list[Any] = []
+        if address:
+            filters.append("t.address = ?")
+            params.append(address)
+        if since:
+            filters.append("t.created_at >= ?")
+            params.append(_sql_time(since))
+        if until:
+            filters.append("t.created_at < ?")
+            params.append(_sql_time(until))
+
+        if not self.supports_search:
+            return self._scan_descriptions(query, filters, params, limit)
+
+        # Newest matches for one address come from its rows in the address index;
+        # otherwise the full-text index drives and other filters are checked per match
+        if address and order == "newest":
+            tables = "transactions t CROSS JOIN transactions_fts f ON f.rowid = t.id"
+            key = "t.id"
+        elif filters or order == "newest":
+            tables = "transactions_fts f CROSS JOIN transactions t ON t.id = f.rowid"
+            key = "f.rowid"
+        else:
+            tables = "transactions_fts f"
+            key = "f.rowid"
+
+        with self._lock:
+            # Row IDs grow with created_at, so a time window is also an ID range
+            # the index can skip to
+            if since:
+                filters.append(f"{key} >= ?")
+                params.append(self._first_id_at(since))
+            if until:
+                filters.append(f"{key} < ?")
+                params.append(self._first_id_at(until))
+            where = "".join(f" AND {condition}" for condition in filters)
+
+            columns = """t.id, t.signature, t.chain, t.address, t.tx_type, t.description, t.amount_usd,
+                t.created_at, snippet(transactions_fts, 0, '[', ']', '...', 12) AS snippet"""
+            try:
+                if order == "newest":
+                    rows = self.conn.execute(f"""
+                        SELECT {columns}, NULL AS rank FROM {tables}
+                        WHERE transactions_fts MATCH ?{where} ORDER BY {key} DESC LIMIT ?
+                    """, (match, *params, limit)).fetchall()
+                    return [dict(row) for row in rows]
+
+                # bm25() has to score every match, so rank IDs alone and read the
+                # rows and snippets for the top few afterwards
+                hits = self.conn.execute(f"""
+                    SELECT {key} AS id, bm25(transactions_fts) AS rank FROM {tables}
+                    WHERE transactions_fts MATCH ?{where} ORDER BY rank LIMIT ?
+                """, (match, *params, limit)).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query {match!r}: {e}") from None
+            if not hits:
+                return []
+
+            rows = self.conn.execute(f"""
+                SELECT {columns} FROM transactions_fts f CROSS JOIN transactions t ON t.id = f.rowid
+                WHERE transactions_fts MATCH ? AND f.rowid IN ({", ".join("?" * len(hits))})
+            """, (match, *(hit["id"] for hit in hits))).fetchall()
+
+        found = {row["id"]: dict(row) for row in rows}
+        return [{**found[hit["id"]], "rank": hit["rank"]} for hit in hits]
+
+    def _first_id_at(self, value: datetime) -> int:
+        """ID of the first transaction stored at or after a time, by binary search on ``id``."""
+        low, high = self.conn.execute("SELECT (SELECT MIN(id) FROM transactions), (SELECT MAX(id) FROM transactions)").fetchone()
+        if low is None:
+            return 0
+        high += 1
+        target = _sql_time(value)
+        while low < high:
+            middle = (low + high) // 2
+            row = self.conn.execute(
+                "SELECT id, created_at FROM transactions WHERE id >= ? ORDER BY id LIMIT 1", (middle,)
+            ).fetchone()
+            if row["created_at"] < target:
+                low = row["id"] + 1
+            else:
+                high = middle
+        return low
+
+    def _scan_descriptions(self, query: str, filters: list[str], params: list[Any], limit: int) -> list[dict]:
+        """Newest transactions whose description contains every query word, without FTS5."""
+        words = [word.strip('"').rstrip("*") for word in _QUERY_TERMS.findall(query)]
+        words = [word for word in words if word]
+        conditions = ["t.description LIKE ?" for _ in words] + filters
+        with self._lock:
+            rows = self.conn.execute(f"""
+                SELECT t.id, t.signature, t.chain, t.address, t.tx_type, t.description, t.amount_usd,
+                       t.created_at, t.description AS snippet, NULL AS rank
+                FROM transactions t WHERE {" AND ".join(conditions) or "1 = 1"}
+                ORDER BY t.id DESC LIMIT ?
+            """, (*(f"%{word}%" for word in words), *params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
     def close(self) -> None:
         """Close the database connection."""
         if self.conn:
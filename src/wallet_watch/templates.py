@@ -0,0 +1,245 @@
+"""Message templates and per-format rendering for Wallet Watch.
+
+Templates use ``str.format`` fields, e.g. ``{TYPE} on {Chain}``. Text inside
+``[[...]]`` is an optional section: it is left out when any field in it is
+empty. Field values are escaped for the notifier's format; the template's
+own markup is not.
+"""
+
+import html
+import json
+import re
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Any
+
+from wallet_watch.models import Transaction
+
+
+HTML = "html"
+MARKDOWN = "markdown"
+PLAIN = "plain"
+JSON = "json"
+FORMATS = (HTML, MARKDOWN, PLAIN, JSON)
+
+EXPLORERS = {
+    "solana": ("Solscan", "https://solscan.io/tx/{}"),
+    "ethereum": ("Etherscan", "https://etherscan.io/tx/{}"),
+}
+
+FIELDS = (
+    "signature", "chain", "Chain", "address", "short_address", "label", "wallet",
+    "tx_type", "TYPE", "description", "amount_usd", "timestamp", "explorer_name", "explorer_url",
+)
+
+# Free-text fields that may contain markup characters
+TEXT_FIELDS = {"label", "wallet", "description"}
+
+DEFAULT_TEMPLATES = {
+    HTML: (
+        "<b>{TYPE}</b> on {Chain}\nWallet: {wallet}"
+        "[[\n\n{description}]]"
+        "[[\nValue: <b>${amount_usd:,.2f}</b>]]"
+        "[[\n\n<a href='{explorer_url}'>View on {explorer_name}</a>]]"
+    ),
+    MARKDOWN: (
+        "*{TYPE}* on {Chain}\nWallet: {wallet}"
+        "[[\n\n{description}]]"
+        "[[\nValue: *${amount_usd:,.2f}*]]"
+        "[[\n\n[View on {explorer_name}]({explorer_url})]]"
+    ),
+    PLAIN: (
+        "{TYPE} on {Chain}\nWallet: {wallet}"
+        "[[\n\n{description}]]"
+        "[[\nValue: ${amount_usd:,.2f}]]"
+        "[[\n\n{explorer_url}]]"
+    ),
+}
+
+_SECTION = re.compile(r"\[\[(.*?)\]\]", re.DOTALL)
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]()])")
+
+
+def escape(text: str, fmt: str) -> str:
+    """Escape free text for a message format."""
+    if fmt == HTML:
+        return html.escape(text, quote=False)
+    if fmt == MARKDOWN:
+        return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+    return text
+
+
+def bold(text: str, fmt: str) -> str:
+    """Emphasize text in a message format."""
+    if fmt == HTML:
+        return f"<b>{text}</b>"
+    if fmt == MARKDOWN:
+        return f"*{text}*"
+    return text
+
+
+def link(text: str, url: str, fmt: str) -> str:
+    """Link text to a URL in a message format."""
+    if fmt == HTML:
+        return f"<a href='{url}'>{text}</a>"
+    if fmt == MARKDOWN:
+        return f"[{text}]({url})"
+    return f"{text}: {url}"
+
+
+def explorer_url(tx: Transaction) -> str:
+    """Block explorer URL for a transaction, or "" for unknown chains."""
+    explorer = EXPLORERS.get(tx.chain)
+    return explorer[1].format(tx.signature) if explorer else ""
+
+
+def context(tx: Transaction, label: str = "") -> dict[str, Any]:
+    """Template fields for a transaction."""
+    short_address = tx.address[:8] + "..."
+    explorer_name, url = EXPLORERS.get(tx.chain, ("", ""))
+    return {
+        "signature": tx.signature,
+        "chain": tx.chain,
+        "Chain": tx.chain.title(),
+        "address": tx.address,
+        "short_address": short_address,
+        "label": label,
+        "wallet": label or short_address,
+        "tx_type": tx.tx_type,
+        "TYPE": tx.tx_type.upper(),
+        "description": tx.description,
+        "amount_usd": tx.amount_usd,
+        "timestamp": tx.timestamp.isoformat() if tx.timestamp else "",
+        "explorer_name": explorer_name,
+        "explorer_url": url.format(tx.signature) if url else "",
+    }
+
+
+class Template:
+    """A template parsed once into literal text and field references."""
+
+    def __init__(self, source: str, fmt: str = HTML):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown message format: {fmt}")
+
+        self.source = source
+        self.format = fmt
+        self.sections: list[tuple[bool, list[tuple[str, str | None, str]]]] = []
+
+        position = 0
+        for match in _SECTION.finditer(source):
+            if match.start() > position:
+                self.sections.append((False, self._parse(source[position:match.start()])))
+            self.sections.append((True, self._parse(match.group(1))))
+            position = match.end()
+        if position < len(source):
+            self.sections.append((False, self._parse(source[position:])))
+
+    @staticmethod
+    def _parse(text: str) -> list[tuple[str, str | None, str]]:
+        """Split text into (literal, field, format_spec) parts."""
+        parts = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if field is not None:
+                if field not in FIELDS:
+                    raise ValueError(f"Unknown template field: {{{field}}}")
+                if conversion:
+                    raise ValueError(f"Conversions are not supported: {{{field}!{conversion}}}")
+            parts.append((literal, field, spec or ""))
+        return parts
+
+    def render(self, fields: dict[str, Any]) -> str:
+        """Render the template with the given field values."""
+        out = []
+        for optional, parts in self.sections:
+            if optional and any(field and not fields.get(field) for _, field, _ in parts):
+                continue
+            for literal, field, spec in parts:
+                out.append(literal)
+                if field is None:
+                    continue
+                value = fields.get(field)
+                # A missing value renders empty, whatever its format spec
+                if value is None:
+                    continue
+                if field in TEXT_FIELDS:
+                    value = escape(value, self.format)
+                out.append(format(value, spec))
+        return "".join(out)
+
+
+class Renderer:
+    """Compiles templates once and memoizes rendered messages.
+
+    A template reference is either the name of a configured template or
+    the template text itself; "" selects the built-in default for the
+    format. Rendered messages are cached per (signature, address,
+    template, label, format).
+    """
+
+    def __init__(self, templates: dict[str, str] | None = None, cache_size: int = 4096):
+        self.named = dict(templates or {})
+        self.cache_size = cache_size
+        self._compiled: dict[tuple[str, str], Template] = {}
+        self._cache: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        for name in self.named:
+            for fmt in DEFAULT_TEMPLATES:
+                self.template(name, fmt)
+
+    def template(self, ref: str, fmt: str) -> Template:
+        """Get the compiled template for a reference and format.
+
+        Raises:
+            ValueError: If the template is invalid or the format unknown
+        """
+        key = (ref, fmt)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if ref:
+                source = self.named.get(ref, ref)
+            else:
+                source = DEFAULT_TEMPLATES.get(fmt, "")
+            compiled = Template(source, fmt)
+            self._compiled[key] = compiled
+        return compiled
+
+    def render(self, tx: Transaction, label: str = "", ref: str = "", fmt: str = HTML) -> str:
+        """Render a transaction, reusing an earlier rendering when possible."""
+        key = (tx.signature, tx.address, ref, label, fmt)
+        with self._lock:
+            message = self._cache.get(key)
+            if message is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return message
+            self.misses += 1
+
+        if fmt == JSON:
+            message = json.dumps(tx.to_dict(label=label))
+        else:
+            message = self.template(ref, fmt).render(context(tx, label))
+
+        with self._lock:
+            self._cache[key] = message
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return message
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "templates": len(self._compiled),
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Renders Transaction.to_message with the built-in HTML template
+default_renderer = Renderer(cache_size=0)
@@ -0,0 +1,170 @@
+"""Sampled per-transaction trace spans written as JSON lines.
+
+A trace covers one transaction from ingest through dedup, filtering,
+rendering and persisting, plus the later notifier call. Each finished
+span is appended to the trace file as one JSON object using OTLP span
+field names (``traceId``, ``spanId``, ``parentSpanId``,
+``startTimeUnixNano`` ...), so it can be read directly or converted for
+an OTLP collector.
+
+Code on the hot path calls ``span(name)``; it does nothing unless the
+current transaction was sampled.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from wallet_watch.config import TracingConfig
+
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar("wallet_watch_trace", default=None)
+
+NOOP = nullcontext()
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Trace:
+    """Spans recorded for one sampled transaction."""
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict[str, Any]):
+        self.tracer = tracer
+        self.trace_id = _new_id(16)
+        self.root_id = _new_id(8)
+        self.name = name
+        self.attributes = attributes
+        self._stack = [self.root_id]
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        parent_id: str | None = None,
+        span_id: str | None = None,
+        **attributes: Any,
+    ) -> None:
+        """Write a finished span; the parent defaults to the trace's root."""
+        self.tracer.export({
+            "traceId": self.trace_id,
+            "spanId": span_id or _new_id(8),
+            "parentSpanId": parent_id if parent_id is not None else self.root_id,
+            "name": name,
+            "startTimeUnixNano": start_ns,
+            "endTimeUnixNano": end_ns,
+            "attributes": attributes,
+        })
+
+
+class _Span:
+    """Context manager timing a child span of the current trace."""
+
+    def __init__(self, trace: Trace, name: str, attributes: dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.span_id = _new_id(8)
+        self.parent_id = self.trace._stack[-1]
+        self.trace._stack.append(self.span_id)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.time_ns()
+        self.trace._stack.pop()
+        if exc_type is not None:
+            self.attributes["error"] = repr(exc)
+        self.trace.record(self.name, self.start_ns, end_ns, self.parent_id, self.span_id, **self.attributes)
+        return False
+
+
+class _TraceScope:
+    """Context manager that makes a new trace current and records its root span."""
+
+    def __init__(self, trace: Trace):
+        self.trace = trace
+
+    def __enter__(self) -> Trace:
+        self.token = _current.set(self.trace)
+        self.start_ns = time.time_ns()
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.time_ns()
+        _current.reset(self.token)
+        trace = self.trace
+        if exc_type is not None:
+            trace.attributes["error"] = repr(exc)
+        trace.record(trace.name, self.start_ns, end_ns, "", trace.root_id, **trace.attributes)
+        return False
+
+
+class Tracer:
+    """Samples transactions and appends their spans to a JSONL file.
+
+    Without a config nothing is sampled and no file is opened.
+    """
+
+    def __init__(self, config: "TracingConfig | None" = None):
+        self.sample_rate = config.sample_rate if config else 0.0
+        self.path = config.path if config else ""
+        self.exported = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def trace(self, name: str, **attributes: Any):
+        """Start a trace for the enclosed block if it is sampled."""
+        rate = self.sample_rate
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return NOOP
+        return _TraceScope(Trace(self, name, attributes))
+
+    def export(self, span: dict) -> None:
+        """Append a finished span to the trace file."""
+        line = json.dumps(span, default=str) + "\n"
+        try:
+            with self._lock:
+                if self._file is None:
+                    path = Path(self.path)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = path.open("a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self.exported += 1
+        except OSError as e:
+            logger.error(f"Failed to write trace span: {e}")
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def current() -> Trace | None:
+    """The trace of the transaction being processed, if it was sampled."""
+    return _current.get()
+
+
+def span(name: str, **attributes: Any):
+    """Time the enclosed block as a child span of the current trace, if any."""
+    trace = _current.get()
+    if trace is None:
+        return NOOP
+    return _Span(trace, name, attributes)
@@ -0,0 +1,230 @@
+"""Streaming loader for large CSV and JSON-lines watch lists.
+
+Rows are read in chunks and turned into ``WatchConfig`` objects from one
+validated prototype per file, so a row only has its own fields checked
+instead of going through full pydantic validation. Parsed rows
+are cached as JSON keyed by the file's content hash; the cached size and
+mtime let an unchanged file skip even the hashing on the next start.
+"""
+
+import csv
+import gc
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+from wallet_watch.config import WatchConfig, WatchFileConfig
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10_000
+
+# Columns a row may set, in cache order
+COLUMNS = ("address", "chain", "label", "notify", "recipients", "priority", "template")
+LIST_COLUMNS = ("notify", "recipients")
+
+CACHE_VERSION = 1
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _row(record: dict[str, Any], where: str) -> tuple:
+    """Normalize one raw row to a tuple in COLUMNS order; empty means default."""
+    address = str(record.get("address") or "").strip()
+    if not address:
+        raise ValueError(f"{where}: missing address")
+
+    values: list[Any] = [address]
+    for column in COLUMNS[1:]:
+        value = record.get(column)
+        if value in (None, ""):
+            values.append(None)
+        elif column in LIST_COLUMNS:
+            items = value.split(";") if isinstance(value, str) else value
+            values.append([str(item).strip() for item in items if str(item).strip()])
+        elif column == "priority":
+            try:
+                values.append(int(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"{where}: priority must be an integer, got {value!r}") from None
+        else:
+            values.append(str(value))
+    return tuple(values)
+
+
+def iter_rows(path: Path) -> Iterator[tuple]:
+    """Parse a CSV (with a header row) or JSON-lines watch file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.suffix in (".jsonl", ".ndjson"):
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield _row(json.loads(line), f"{path}:{number}")
+            return
+
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or "address" not in reader.fieldnames:
+            raise ValueError(f"{path}: CSV watch files need a header row with an 'address' column")
+        for number, record in enumerate(reader, 2):
+            yield _row(record, f"{path}:{number}")
+
+
+class WatchFileCache:
+    """Parsed rows of watch files, stored as JSON under ``directory``."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _entry(self, path: Path) -> Path:
+        key = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:32]
+        return self.directory / f"{key}.json"
+
+    def get(self, path: Path) -> list[tuple] | None:
+        """Cached rows for a file, or None if it changed or was never cached."""
+        entry = self._entry(path)
+        try:
+            with open(entry, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("version") != CACHE_VERSION:
+            return None
+
+        stat = path.stat()
+        if cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return [tuple(row) for row in cached["rows"]]
+
+        # Touched but possibly unchanged; compare contents before reparsing
+        if cached["sha256"] != _file_digest(path):
+            return None
+        cached["mtime_ns"], cached["size"] = stat.st_mtime_ns, stat.st_size
+        self._write(entry, cached)
+        return [tuple(row) for row in cached["rows"]]
+
+    def put(self, path: Path, rows: list[tuple], stat: os.stat_result) -> None:
+        """Cache the rows parsed from a file as it was at ``stat``."""
+        self._write(self._entry(path), {
+            "version": CACHE_VERSION,
+            "path": str(path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _file_digest(path),
+            "rows": rows,
+        })
+
+    def _write(self, entry: Path, data: dict) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            tmp.replace(entry)
+        except OSError as e:
+            logger.warning(f"Failed to write watch file cache {entry}: {e}")
+
+
+def build_watches(rows: list[tuple], spec: WatchFileConfig) -> list[WatchConfig]:
+    """Turn normalized rows into watches, taking missing fields from ``spec``.
+
+    The file defaults are validated once as a prototype; each row then
+    fills in a copy of its field dict the way ``model_construct`` does,
+    without pydantic's per-instance default handling. Fields a row leaves
+    empty share the prototype's (read-only) default objects.
+    """
+    prototype = WatchConfig(
+        address="-",
+        chain=spec.chain,
+        label=spec.label,
+        notify=spec.notify,
+        recipients=spec.recipients,
+        priority=spec.priority,
+        template=spec.template,
+    )
+    defaults = prototype.__dict__
+    fields_set = set(COLUMNS)
+    new = WatchConfig.__new__
+    set_attr = object.__setattr__
+
+    watches = []
+    for row in rows:
+        values = dict(defaults)
+        for column, value in zip(COLUMNS, row):
+            if value is not None:
+                values[column] = value
+        watch = new(WatchConfig)
+        set_attr(watch, "__dict__", values)
+        set_attr(watch, "__pydantic_fields_set__", set(fields_set))
+        set_attr(watch, "__pydantic_extra__", None)
+        set_attr(watch, "__pydantic_private__", None)
+        watches.append(watch)
+    return watches
+
+
+def iter_watch_chunks(
+    spec: WatchFileConfig,
+    base_dir: str | Path = ".",
+    cache: WatchFileCache | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[list[WatchConfig]]:
+    """Yield the watches of one file in chunks of up to ``chunk_size``."""
+    path = Path(spec.path)
+    if not path.is_absolute():
+        path = Path(base_dir) / path
+    if not path.exists():
+        raise FileNotFoundError(f"Watch file not found: {path}")
+
+    rows = cache.get(path) if cache is not None else None
+    if rows is not None:
+        logger.info(f"Loaded {len(rows)} watches from cache for {path}")
+        for start in range(0, len(rows), chunk_size):
+            yield build_watches(rows[start:start + chunk_size], spec)
+        return
+
+    stat = path.stat()
+    parsed: list[tuple] = []
+    chunk: list[tuple] = []
+    for row in iter_rows(path):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield build_watches(chunk, spec)
+            parsed.extend(chunk)
+            chunk = []
+    if chunk:
+        yield build_watches(chunk, spec)
+        parsed.extend(chunk)
+
+    logger.info(f"Loaded {len(parsed)} watches from {path}")
+    if cache is not None:
+        cache.put(path, parsed, stat)
+
+
+def load_watch_files(
+    specs: list[WatchFileConfig],
+    base_dir: str | Path = ".",
+    cache_dir: str | Path = "",
+) -> list[WatchConfig]:
+    """Load every watch file; ``cache_dir`` "" disables the parsed-row cache."""
+    cache = WatchFileCache(cache_dir) if cache_dir else None
+    watches: list[WatchConfig] = []
+
+    # Rows create no reference cycles; collections while allocating
+    # hundreds of thousands of objects would only rescan them
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for spec in specs:
+            for chunk in iter_watch_chunks(spec, base_dir, cache):
+                watches.extend(chunk)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return watches
@@ -0,0 +1,31 @@
+"""Shared fixtures for Wallet Watch tests."""
+
+import base58
+import pytest
+
+from wallet_watch.config import ChainConfig, Config, StorageConfig
+from wallet_watch.core import WalletWatch
+
+
+def make_address(seed: int) -> str:
+    """Build a valid Solana address from an integer seed."""
+    return base58.b58encode(seed.to_bytes(32, "big")).decode()
+
+
+@pytest.fixture
+def config(tmp_path) -> Config:
+    """Config with one Solana chain and SQLite storage in a temp dir."""
+    return Config(
+        chains=[ChainConfig(name="solana", provider="helius", api_key="test")],
+        storage=StorageConfig(path=str(tmp_path / "test.db")),
+    )
+
+
+@pytest.fixture
+def watcher(config) -> WalletWatch:
+    """WalletWatch with immediate (non-debounced) chain syncs."""
+    watcher = WalletWatch(config)
+    watcher.chains["solana"].sync_delay = 0
+    yield watcher
+    watcher.stop(timeout=1)
+    watcher.storage.close()
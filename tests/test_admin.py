@@ -0,0 +1,59 @@
+"""Tests for the admin HTTP API."""
+
+import pytest
+from flask import Flask
+
+from wallet_watch.admin import create_admin_blueprint
+
+from tests.conftest import make_address
+
+
+@pytest.fixture
+def client(watcher):
+    """Flask test client with the admin API mounted."""
+    app = Flask(__name__)
+    app.register_blueprint(create_admin_blueprint(watcher, "secret"))
+    return app.test_client()
+
+
+AUTH = {"Authorization": "Bearer secret"}
+
+
+class TestAdminAPI:
+    """Tests for /admin/watches."""
+
+    def test_requires_token(self, client):
+        """Test requests without the token are rejected."""
+        assert client.get("/admin/watches").status_code == 401
+        assert client.get("/admin/watches", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    def test_add_list_remove(self, client):
+        """Test the add, list and remove round trip."""
+        watches = [{"address": make_address(i), "chain": "solana"} for i in range(1, 1001)]
+        watches.append({"address": "bad", "chain": "solana"})
+        watches.append({"chain": "solana"})
+
+        response = client.post("/admin/watches", json={"watches": watches}, headers=AUTH)
+        assert response.status_code == 200
+        assert response.json["added"] == 1000
+        assert len(response.json["rejected"]) == 2
+
+        response = client.get("/admin/watches", headers=AUTH)
+        assert response.json["count"] == 1000
+
+        addresses = [w["address"] for w in watches[:10]]
+        response = client.delete("/admin/watches", json={"addresses": addresses}, headers=AUTH)
+        assert response.json["removed"] == 10
+
+    def test_rejects_bad_body(self, client):
+        """Test malformed bodies return 400."""
+        assert client.post("/admin/watches", json={"watches": "x"}, headers=AUTH).status_code == 400
+        assert client.delete("/admin/watches", json={"addresses": [1]}, headers=AUTH).status_code == 400
+
+    def test_profile(self, client):
+        """Test the profiler endpoint samples for the requested time."""
+        response = client.post("/admin/profile?seconds=0.05&interval=0.005", headers=AUTH)
+        assert response.status_code == 200
+        assert response.json["samples"] > 0
+
+        assert client.post("/admin/profile?seconds=600", headers=AUTH).status_code == 400
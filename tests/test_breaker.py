@@ -0,0 +1,117 @@
+"""Tests for the notifier circuit breaker."""
+
+from wallet_watch.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from wallet_watch.config import BreakerConfig
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.notifiers.base import Delivery
+
+from tests.test_dispatcher import RecordingNotifier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(**overrides) -> tuple[CircuitBreaker, FakeClock]:
+    clock = FakeClock()
+    config = BreakerConfig(min_calls=4, open_seconds=10, **overrides)
+    return CircuitBreaker("test", config, clock=clock), clock
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_on_error_rate(self):
+        """Test the breaker opens once enough calls fail."""
+        breaker, _ = make_breaker(error_rate=0.5)
+
+        for ok in (True, False, True):
+            breaker.record(ok, 0.1)
+        assert breaker.state == CLOSED
+
+        breaker.record(False, 0.1)
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_opens_on_slow_calls(self):
+        """Test calls that succeed slowly also trip the breaker."""
+        breaker, _ = make_breaker(slow_call=1.0, slow_rate=0.75)
+
+        for _ in range(4):
+            breaker.record(True, 2.0)
+
+        assert breaker.state == OPEN
+
+    def test_half_open_recovers_or_reopens(self):
+        """Test a trial call closes the breaker on success and reopens it on failure."""
+        breaker, clock = make_breaker()
+        for _ in range(4):
+            breaker.record(False, 0.1)
+
+        clock.now = 10
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()
+        breaker.record(False, 0.1)
+        assert breaker.state == OPEN
+        assert breaker.retry_in() == 10
+
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record(True, 0.1)
+        assert breaker.state == CLOSED
+        assert breaker.retry_in() is None
+
+    def test_old_calls_leave_window(self):
+        """Test failures outside the window are forgotten."""
+        breaker, clock = make_breaker(window=5)
+        for _ in range(3):
+            breaker.record(False, 0.1)
+
+        clock.now = 10
+        breaker.record(False, 0.1)
+
+        assert breaker.state == CLOSED
+
+
+class TestDispatcherBreaker:
+    """Tests for fail-fast dispatch."""
+
+    def test_open_circuit_fails_fast(self):
+        """Test work for a tripped notifier is failed without calling it."""
+        notifier = RecordingNotifier(fail=True)
+        breaker = CircuitBreaker("broken", BreakerConfig(min_calls=2, open_seconds=60))
+        dispatcher = Dispatcher()
+        dispatcher.add("broken", notifier, workers=1, breaker=breaker)
+
+        results = []
+        for i in range(5):
+            dispatcher.submit("broken", [Delivery(f"m{i}")], callback=results.append)
+        dispatcher.close(timeout=2)
+
+        stats = dispatcher.stats()["broken"]
+        assert dispatcher.circuits() == {"broken": OPEN}
+        assert stats["failed"] == 2
+        assert stats["short_circuited"] == 3
+        assert all(not ok for item in results for _, ok in item)
+
+    def test_partial_failure_counts_as_failure(self):
+        """Test a call where some recipients fail is recorded as a failed call."""
+
+        class PartlyDown(RecordingNotifier):
+            def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+                return recipient != "down" and super().send_to(recipient, message)
+
+        breaker = CircuitBreaker("partly", BreakerConfig(min_calls=2, open_seconds=60))
+        dispatcher = Dispatcher()
+        dispatcher.add("partly", PartlyDown(), workers=1, breaker=breaker)
+
+        for i in range(2):
+            dispatcher.submit("partly", [Delivery(f"m{i}", "up"), Delivery(f"m{i}", "down")])
+        dispatcher.close(timeout=2)
+
+        assert dispatcher.circuits() == {"partly": OPEN}
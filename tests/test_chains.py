@@ -1,9 +1,18 @@
 """Tests for chain providers."""
 
+import json
+import os
+
+import base58
 import pytest
 
 from wallet_watch.chains import get_chain_provider
-from wallet_watch.chains.solana import SolanaProvider
+from wallet_watch.chains.addresses import AddressValidator, is_solana_address, validate_file
+from wallet_watch.chains.decode import iter_json_items
+from wallet_watch.chains.solana import SolanaProvider, project_transaction
+from wallet_watch.config import WatchConfig
+
+from tests.conftest import make_address
 
 
 class TestSolanaProvider:
@@ -48,3 +57,98 @@ class TestSolanaProvider:
         """Test getting unknown chain provider raises error."""
         with pytest.raises(ValueError, match="Unknown chain provider"):
             get_chain_provider("unknown-chain")
+
+
+class TestAddressValidation:
+    """Tests for the fast base58 address check."""
+
+    def test_matches_base58_decoding(self):
+        """Test the decoded length agrees with base58 for leading zeros and odd lengths."""
+        samples = [base58.b58encode(b"\0" * zeros + os.urandom(32 - zeros)).decode() for zeros in range(33)]
+        samples += [base58.b58encode(os.urandom(size)).decode() for size in (1, 31, 33, 40)]
+        samples += ["1" * 31, "1" * 33, "z" * 44, "2" * 32]
+
+        for address in samples:
+            assert is_solana_address(address) == (len(base58.b58decode(address)) == 32), address
+
+    def test_memoizes_valid_addresses(self):
+        """Test an address found valid is not checked again."""
+        calls = []
+        validator = AddressValidator(lambda address: calls.append(address) or address != "bad")
+
+        assert validator.validate_many(["a", "a", "bad", "b"]) == [True, True, False, True]
+        assert validator("a") and not validator("bad")
+        assert calls == ["a", "bad", "b", "bad"]
+
+    def test_validate_file_in_parallel(self, tmp_path):
+        """Test a file split across processes reports every invalid line in order."""
+        path = tmp_path / "addresses.txt"
+        lines = [base58.b58encode(os.urandom(32)).decode() for _ in range(50)]
+        lines[7], lines[42] = "bad-1", "bad-2"
+        path.write_text("# comment\n" + "\n".join(lines) + "\n\n")
+
+        results = list(validate_file(str(path), workers=2, chunk_size=10))
+
+        assert sum(valid for valid, _ in results) == 48
+        assert [address for _, invalid in results for address in invalid] == ["bad-1", "bad-2"]
+
+
+class TestWebhookDecoding:
+    """Tests for incremental decoding and field projection of webhook bodies."""
+
+    def test_iter_items_with_source(self):
+        """Test array elements come back one by one with their exact source text."""
+        body = b' [ {"a": 1, "b": [1, 2]} ,\n{"c": "x"}] '
+
+        assert list(iter_json_items(body)) == [
+            ({"a": 1, "b": [1, 2]}, '{"a": 1, "b": [1, 2]}'),
+            ({"c": "x"}, '{"c": "x"}'),
+        ]
+        assert list(iter_json_items(b'{"a": 1}')) == [({"a": 1}, '{"a": 1}')]
+        assert list(iter_json_items(b"[]")) == []
+
+    def test_malformed_after_valid_items(self):
+        """Test items before a syntax error are yielded before it is raised."""
+        items = iter_json_items(b'[{"a": 1}, {"b": ]')
+
+        assert next(items) == ({"a": 1}, '{"a": 1}')
+        with pytest.raises(ValueError):
+            next(items)
+        with pytest.raises(ValueError):
+            list(iter_json_items(b'[{"a": 1}] trailing'))
+
+    def test_projection_drops_unused_sections(self):
+        """Test instructions and events are dropped and accountData keeps only accounts."""
+        provider = SolanaProvider(api_key="test")
+        tx = {
+            "signature": "sig1",
+            "type": "SWAP",
+            "nativeTransfers": [{"fromUserAccount": "a", "toUserAccount": "b", "amount": 5}],
+            "accountData": [{"account": "c", "nativeBalanceChange": 1, "tokenBalanceChanges": [{"x": 1}]}],
+            "instructions": [{"programId": "p", "innerInstructions": []}],
+            "events": {"swap": {}},
+        }
+
+        ((projected, source),) = provider.decode_webhook(json.dumps([tx]).encode())
+
+        assert set(projected) == {"signature", "type", "nativeTransfers", "accountData"}
+        assert projected["accountData"] == [{"account": "c"}]
+        assert json.loads(source) == tx
+        assert provider.involved_addresses(projected) == provider.involved_addresses(tx)
+
+    def test_stores_source_json(self, watcher):
+        """Test a notified transaction is stored with the JSON it arrived as."""
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana")])
+        tx = {
+            "signature": "sig1",
+            "type": "TRANSFER",
+            "nativeTransfers": [{"fromUserAccount": make_address(2), "toUserAccount": address, "amount": 1}],
+            "instructions": [{"programId": "p"}],
+        }
+        source = json.dumps(tx, indent=1)
+
+        watcher.chains["solana"].process_items([(project_transaction(tx), source)])
+
+        (row,) = watcher.storage.get_transactions(address)
+        assert row["raw"] == source
@@ -0,0 +1,164 @@
+"""Tests for address partitioning and the multi-process cluster."""
+
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from wallet_watch.cluster import Cluster, worker_storage_path
+from wallet_watch.config import CoordinationConfig, NotifierConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.partition import HashRing, Partition, SignatureDeduper
+
+from tests.conftest import make_address
+
+
+def payload(signature: str, address: str) -> dict:
+    return {
+        "signature": signature,
+        "type": "TRANSFER",
+        "nativeTransfers": [{"fromUserAccount": make_address(999), "toUserAccount": address, "amount": 10**9}],
+    }
+
+
+class Sink(BaseHTTPRequestHandler):
+    """Records the signatures of webhook notifications it receives."""
+
+    received: list[str] = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        Sink.received.append(body["transaction"]["signature"])
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPartitioning:
+    """Tests for the hash ring and deduplication."""
+
+    def test_ring_is_balanced_and_stable(self):
+        """Test keys spread evenly and adding a node moves few of them."""
+        keys = [make_address(i) for i in range(2000)]
+        ring = HashRing(["0", "1", "2", "3"])
+        owners = {key: ring.node_for(key) for key in keys}
+
+        counts = [list(owners.values()).count(node) for node in ring.nodes]
+        assert min(counts) > 300
+
+        grown = HashRing(["0", "1", "2", "3", "4"])
+        moved = sum(1 for key in keys if grown.node_for(key) != owners[key])
+        assert moved < len(keys) * 0.35
+
+    def test_deduper(self):
+        """Test repeated keys are reported once and old keys are evicted."""
+        deduper = SignatureDeduper(capacity=2)
+
+        assert deduper.add("a") and deduper.add("b")
+        assert not deduper.add("a")
+        assert deduper.add("c")
+        assert deduper.add("b")
+        assert deduper.duplicates == 1
+
+    def test_worker_keeps_only_owned_watches(self, config):
+        """Test a partitioned watcher subscribes only to its own addresses."""
+        partition = Partition(1, 3)
+        watcher = WalletWatch(config, partition=partition)
+        addresses = [make_address(i) for i in range(30)]
+
+        watcher.add_watches([WatchConfig(address=a, chain="solana") for a in addresses])
+
+        owned = {a for a in addresses if partition.owner(a) == 1}
+        assert set(watcher.chains["solana"].subscriptions) == owned
+        watcher.stop(timeout=1)
+        watcher.storage.close()
+
+    def test_duplicate_deliveries_ignored(self, watcher):
+        """Test a retried webhook does not notify twice."""
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana")])
+
+        watcher.chains["solana"].process_payload([payload("sig1", address), payload("sig1", address)])
+
+        assert watcher.stats()["duplicates_ignored"] == 1
+
+
+class TestCluster:
+    """End-to-end test with worker processes."""
+
+    def test_routes_transactions_to_owning_workers(self, config, tmp_path):
+        """Test each transaction is stored once, by the worker owning its address."""
+        addresses = [make_address(i) for i in range(8)]
+        config.watches = [WatchConfig(address=a, chain="solana") for a in addresses]
+        config.outbox.enabled = False
+        cluster = Cluster(config, workers=2, log_level="WARNING")
+        client = cluster.start().app.test_client()
+
+        batch = [payload(f"sig{i}", a) for i, a in enumerate(addresses)]
+        assert client.post("/webhook/solana", json=batch).status_code == 200
+        assert client.post("/webhook/solana", json=batch[:2]).status_code == 200
+        assert client.post("/webhook/solana", json=[payload("other", make_address(500))]).status_code == 200
+        cluster.stop(timeout=30)
+
+        stored = {}
+        for index in range(2):
+            conn = sqlite3.connect(worker_storage_path(config.storage.path, index))
+            stored[index] = {row[0] for row in conn.execute("SELECT address FROM transactions")}
+            conn.close()
+
+        assert stored[0] | stored[1] == set(addresses)
+        assert not stored[0] & stored[1]
+        assert all(cluster.partition.owner(a) == index for index in stored for a in stored[index])
+
+    def test_stop_terminates_worker_with_full_queue(self, config):
+        """Test shutdown does not block on a full worker queue and terminates that worker."""
+        cluster = Cluster(config, workers=1, log_level="WARNING", queue_size=1)
+        cluster.inboxes[0].put(("solana", []))
+        worker = MagicMock()
+        worker.is_alive.return_value = True
+        cluster.processes[0] = worker
+
+        started = time.monotonic()
+        cluster.stop(timeout=0.5)
+
+        assert time.monotonic() - started < 5
+        worker.terminate.assert_called_once()
+
+    def test_refuses_admin_api(self, config):
+        """Test the admin API is refused rather than silently missing from the front."""
+        config.server.admin_token = "secret"
+
+        with pytest.raises(ValueError, match="admin API"):
+            Cluster(config, workers=2)
+
+    def test_workers_deliver_with_coordination(self, config):
+        """Test workers start their leases, so outbox rows are delivered in cluster mode."""
+        sink = ThreadingHTTPServer(("127.0.0.1", 0), Sink)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        Sink.received = []
+
+        addresses = [make_address(i) for i in range(8)]
+        config.notifiers = [NotifierConfig(type="webhook", webhook_url=f"http://127.0.0.1:{sink.server_port}/")]
+        config.watches = [WatchConfig(address=a, chain="solana", notify=["webhook"]) for a in addresses]
+        config.coordination = CoordinationConfig(enabled=True, lease_seconds=5, renew_interval=0.5)
+        config.outbox.poll_interval = 0.1
+        cluster = Cluster(config, workers=2, log_level="WARNING")
+        client = cluster.start().app.test_client()
+
+        try:
+            batch = [payload(f"sig{i}", a) for i, a in enumerate(addresses)]
+            assert client.post("/webhook/solana", json=batch).status_code == 200
+            deadline = time.monotonic() + 30
+            while len(Sink.received) < len(addresses) and time.monotonic() < deadline:
+                time.sleep(0.1)
+        finally:
+            cluster.stop(timeout=30)
+            sink.shutdown()
+
+        assert sorted(Sink.received) == sorted(f"sig{i}" for i in range(8))
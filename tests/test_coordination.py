@@ -0,0 +1,153 @@
+"""Tests for lease-based notification ownership."""
+
+import time
+
+import pytest
+
+from wallet_watch.config import CoordinationConfig, OutboxConfig
+from wallet_watch.coordination import LeaseManager
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.models import Transaction
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+from wallet_watch.outbox import Outbox
+from wallet_watch.storage.sqlite import SQLiteStorage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingNotifier(NotifierBase):
+    name = "rec"
+
+    def __init__(self):
+        super().__init__()
+        self.sent: list[str] = []
+
+    def send(self, message: str, **kwargs) -> bool:
+        self.sent.append(message)
+        return True
+
+    def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+        return self.send(message)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "shared.db")
+
+
+@pytest.fixture
+def replicas(db):
+    """Two replicas with their own connections to one database."""
+    storages = [SQLiteStorage(path=db), SQLiteStorage(path=db)]
+    yield storages
+    for storage in storages:
+        storage.close()
+
+
+def make_manager(storage, node_id, clock, partitions=4):
+    config = CoordinationConfig(enabled=True, node_id=node_id, partitions=partitions, lease_seconds=10)
+    return LeaseManager(storage, config, clock=clock)
+
+
+class TestLeases:
+    def test_lease_is_exclusive_until_expiry(self, replicas):
+        a, b = replicas
+        assert a.acquire_lease("partition:0", "a", 0, 10) == 1
+        assert b.acquire_lease("partition:0", "b", 5, 15) is None
+        # Renewal keeps the token
+        assert a.acquire_lease("partition:0", "a", 5, 15) == 1
+        # Takeover after expiry bumps it
+        assert b.acquire_lease("partition:0", "b", 20, 30) == 2
+
+    def test_release_frees_lease(self, replicas):
+        a, b = replicas
+        a.acquire_lease("partition:0", "a", 0, 10)
+        a.release_lease("partition:0", "a")
+        assert b.acquire_lease("partition:0", "b", 1, 11) == 2
+
+
+class TestLeaseManager:
+    def test_replicas_split_partitions(self, replicas):
+        clock = FakeClock()
+        a = make_manager(replicas[0], "a", clock)
+        b = make_manager(replicas[1], "b", clock)
+
+        a.tick()
+        assert a.stats()["partitions"] == [0, 1, 2, 3]
+
+        # b joins: a sheds its surplus, b takes it
+        b.tick()
+        a.tick()
+        b.tick()
+        assert sorted(a.stats()["partitions"] + b.stats()["partitions"]) == [0, 1, 2, 3]
+        assert len(a.stats()["partitions"]) == 2
+
+    def test_failover_after_lease_expiry(self, replicas):
+        clock = FakeClock()
+        a = make_manager(replicas[0], "a", clock)
+        b = make_manager(replicas[1], "b", clock)
+        a.tick()
+        b.tick()
+        assert b.stats()["partitions"] == []
+
+        # a stops renewing
+        clock.now += 11
+        b.tick()
+        assert b.stats()["partitions"] == [0, 1, 2, 3]
+        assert not a.owns(0)
+
+    def test_stale_owner_is_fenced(self, replicas):
+        clock = FakeClock()
+        a = make_manager(replicas[0], "a", clock, partitions=1)
+        a.tick()
+        fence = a.fence()
+
+        replicas[0].save_outbox(
+            [{"notifier": "rec", "deliveries": [], "partition": 0}], lease_until=None
+        )
+        # b takes over after a's lease expired; a's old token no longer claims
+        replicas[1].acquire_lease("partition:0", "b", clock.now + 11, clock.now + 21)
+        assert replicas[0].claim_outbox(clock.now, clock.now + 60, fence=fence) == []
+
+    def test_stop_releases_leases(self, replicas):
+        clock = FakeClock()
+        a = make_manager(replicas[0], "a", clock)
+        b = make_manager(replicas[1], "b", clock)
+        a.tick()
+        a.stop()
+        b.tick()
+        assert b.stats()["partitions"] == [0, 1, 2, 3]
+
+
+class TestCoordinatedOutbox:
+    def test_only_owner_delivers(self, replicas):
+        outboxes = []
+        notifiers = []
+        for storage, node_id in zip(replicas, "ab"):
+            manager = make_manager(storage, node_id, time.time, partitions=1)
+            manager.tick()
+            notifier = RecordingNotifier()
+            dispatcher = Dispatcher()
+            dispatcher.add("rec", notifier, workers=1)
+            outboxes.append((Outbox(storage, dispatcher, OutboxConfig(), leases=manager), dispatcher))
+            notifiers.append(notifier)
+
+        tx = Transaction(signature="sig", chain="solana", address="addr", tx_type="transfer", description="")
+        # Both replicas receive the same webhook
+        for outbox, _ in outboxes:
+            outbox.send({"rec": [Delivery("hello")]}, transaction=tx)
+        for outbox, _ in outboxes:
+            outbox.poll()
+        for _, dispatcher in outboxes:
+            dispatcher.close(timeout=2)
+
+        assert notifiers[0].sent == ["hello"]
+        assert notifiers[1].sent == []
+        assert replicas[0].outbox_counts() == {"sent": 1}
+
@@ -0,0 +1,157 @@
+"""Tests for the WalletWatch orchestrator."""
+
+from unittest.mock import MagicMock, patch
+
+from wallet_watch.breaker import CircuitBreaker
+from wallet_watch.config import BreakerConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.models import Transaction
+
+from tests.conftest import make_address
+
+
+class TestRuntimeWatches:
+    """Tests for adding and removing watches while running."""
+
+    def test_add_watches_subscribes_and_persists(self, watcher):
+        """Test bulk add subscribes every address and saves to storage."""
+        watches = [WatchConfig(address=make_address(i), chain="solana") for i in range(1, 501)]
+
+        result = watcher.add_watches(watches)
+
+        assert result == {"added": 500, "rejected": []}
+        assert len(watcher.chains["solana"].subscriptions) == 500
+        assert len(watcher.storage.get_watches()) == 500
+
+    def test_add_watches_syncs_chain_once(self, watcher):
+        """Test a bulk add triggers a single chain-side update."""
+        watches = [WatchConfig(address=make_address(i), chain="solana") for i in range(1, 101)]
+
+        with patch.object(watcher.chains["solana"], "_update_webhook") as update:
+            watcher.add_watches(watches)
+
+        assert update.call_count == 1
+
+    def test_add_watches_rejects_invalid(self, watcher):
+        """Test invalid addresses and unknown chains are reported."""
+        result = watcher.add_watches([
+            WatchConfig(address="not-valid", chain="solana"),
+            WatchConfig(address=make_address(1), chain="ethereum"),
+        ])
+
+        assert result["added"] == 0
+        assert len(result["rejected"]) == 2
+        assert watcher.storage.get_watches() == []
+
+    def test_add_watches_replaces_by_address(self, watcher):
+        """Test re-adding an address replaces its watch without resubscribing."""
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana", label="old")])
+        watcher.add_watches([WatchConfig(address=address, chain="solana", label="new")])
+
+        assert [w.label for w in watcher.list_watches()] == ["new"]
+        assert len(watcher.chains["solana"].subscriptions[address]) == 1
+
+    def test_remove_watches(self, watcher):
+        """Test bulk remove unsubscribes and deletes from storage."""
+        addresses = [make_address(i) for i in range(1, 11)]
+        watcher.add_watches([WatchConfig(address=a, chain="solana") for a in addresses])
+
+        removed = watcher.remove_watches(addresses[:5])
+
+        assert removed == 5
+        assert set(watcher.chains["solana"].subscriptions) == set(addresses[5:])
+        assert len(watcher.storage.get_watches()) == 5
+
+    def test_routes_transaction_to_added_watch(self, watcher):
+        """Test transactions reach watches added at runtime."""
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana", label="Live")])
+
+        tx = Transaction(signature="sig1", chain="solana", address=address, tx_type="transfer", description="")
+        with patch.object(watcher, "_handle_transaction") as handle:
+            watcher.chains["solana"].notify_callbacks(address, tx)
+
+        handle.assert_called_once()
+        assert handle.call_args.args[1].labels == ("Live",)
+
+    def test_stored_watches_loaded_on_start(self, config):
+        """Test watches persisted by a previous run are loaded again."""
+        first = WalletWatch(config)
+        first.chains["solana"].sync_delay = 0
+        first.add_watches([WatchConfig(address=make_address(7), chain="solana", label="Saved")])
+        first.storage.close()
+
+        second = WalletWatch(config)
+        loaded = second._load_watches()
+        second.storage.close()
+
+        assert [(w.address, w.label) for w in loaded] == [(make_address(7), "Saved")]
+
+    def test_stored_watch_group_survives_restart(self, config):
+        """Test several watches on one address are all stored and reloaded."""
+        config.watches = [WatchConfig(address=make_address(7), chain="solana", label="Config")]
+        first = WalletWatch(config)
+        first.chains["solana"].sync_delay = 0
+        first.add_watches([
+            WatchConfig(address=make_address(7), chain="solana", label="Desk", recipients=["1"]),
+            WatchConfig(address=make_address(7), chain="solana", label="Ops", recipients=["2"]),
+        ])
+        first.storage.close()
+
+        second = WalletWatch(config)
+        loaded = second._load_watches()
+        second.storage.close()
+
+        assert [(w.label, w.recipients) for w in loaded] == [("Desk", ["1"]), ("Ops", ["2"])]
+
+
+class TestFanOut:
+    """Tests for delivery along precomputed routes."""
+
+    def test_renders_once_per_label_and_batches(self, watcher):
+        """Test a popular address renders per label and sends one batch per notifier."""
+        address = make_address(1)
+        watches = [
+            WatchConfig(address=address, chain="solana", label="Whale", notify=["telegram"],
+                        recipients=[str(chat) for chat in range(1000)]),
+            WatchConfig(address=address, chain="solana", label="Other", notify=["telegram"],
+                        recipients=["1", "2"]),
+        ]
+        watcher.add_watches(watches)
+        notifier = MagicMock(max_batch=1, structured=False, format="html")
+        notifier.send_each.side_effect = lambda deliveries: [(d, True) for d in deliveries]
+        watcher.notifiers["telegram"] = notifier
+        watcher.dispatcher.add("telegram", notifier)
+
+        tx = Transaction(signature="sig1", chain="solana", address=address, tx_type="transfer", description="")
+        with patch.object(watcher.renderer, "render", return_value="msg") as render:
+            watcher.chains["solana"].notify_callbacks(address, tx)
+        watcher.stop()
+
+        assert render.call_count == 2
+        notifier.send_each.assert_called_once()
+        deliveries = notifier.send_each.call_args.args[0]
+        assert len(deliveries) == 1002
+        assert {d.recipient for d in deliveries} == {str(chat) for chat in range(1000)}
+
+
+class TestHealth:
+    """Tests for the health endpoint."""
+
+    def test_reports_open_circuit(self, watcher):
+        """Test /health reports a degraded instance with 503 while a circuit is open."""
+        notifier = MagicMock(max_batch=1, structured=False)
+        breaker = CircuitBreaker("webhook", BreakerConfig(min_calls=1))
+        watcher.dispatcher.add("webhook", notifier, breaker=breaker)
+        client = watcher.create_server().app.test_client()
+
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "healthy", "circuits": {"webhook": "closed"}}
+
+        breaker.record(False, 0.1)
+        response = client.get("/health")
+
+        assert response.status_code == 503
+        assert response.get_json() == {"status": "degraded", "circuits": {"webhook": "open"}}
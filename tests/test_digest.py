@@ -0,0 +1,133 @@
+"""Tests for burst coalescing and digest messages."""
+
+import threading
+import time
+
+from wallet_watch.config import DigestConfig, WatchConfig
+from wallet_watch.digest import Coalescer, Digest
+from wallet_watch.models import Transaction
+from wallet_watch.routing import Route
+
+ADDRESS = "Wallet1111111111111111111111111111111111111"
+
+
+def make_tx(i: int, tx_type: str = "swap", lamports: int = 0, mint: str = "", tokens: float = 0) -> Transaction:
+    raw = {"nativeTransfers": [], "tokenTransfers": []}
+    if lamports:
+        raw["nativeTransfers"].append({"fromUserAccount": "other", "toUserAccount": ADDRESS, "amount": lamports})
+    if mint:
+        raw["tokenTransfers"].append({"fromUserAccount": ADDRESS, "toUserAccount": "other", "mint": mint, "tokenAmount": tokens})
+    return Transaction(
+        signature=f"sig{i}",
+        chain="solana",
+        address=ADDRESS,
+        tx_type=tx_type,
+        description=f"tx {i}",
+        raw=raw,
+    )
+
+
+def digest_group(window: float, max_delay: float):
+    watch = WatchConfig(
+        address=ADDRESS,
+        chain="solana",
+        label="Trader",
+        notify=["telegram"],
+        digest=DigestConfig(window=window, max_delay=max_delay),
+    )
+    return Route.build(ADDRESS, [watch]).digests[0]
+
+
+class Recorder:
+    """Collects coalescer deliveries."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches: list[tuple[float, int]] = []
+
+    def __call__(self, group, txs):
+        with self.lock:
+            self.batches.append((time.monotonic(), len(txs)))
+
+
+class TestCoalescer:
+    """Tests for the coalescer."""
+
+    def test_burst_becomes_one_digest(self):
+        """Test a burst sends the first transaction and one digest."""
+        recorder = Recorder()
+        coalescer = Coalescer(recorder)
+        group = digest_group(window=0.2, max_delay=5)
+
+        for i in range(40):
+            coalescer.add(group, make_tx(i))
+        time.sleep(0.5)
+        coalescer.close()
+
+        assert [size for _, size in recorder.batches] == [1, 39]
+        assert coalescer.stats()["digests"] == 1
+
+    def test_max_delay_bounds_sustained_burst(self):
+        """Test a continuous burst still flushes every max_delay."""
+        recorder = Recorder()
+        coalescer = Coalescer(recorder)
+        group = digest_group(window=0.2, max_delay=0.3)
+
+        started = time.monotonic()
+        for i in range(20):
+            coalescer.add(group, make_tx(i))
+            time.sleep(0.05)
+        coalescer.close()
+
+        flush_times = [at - started for at, size in recorder.batches[1:]]
+        assert sum(size for _, size in recorder.batches) == 20
+        assert 2 <= len(flush_times) <= 5
+        assert flush_times[0] < 0.45
+
+    def test_close_flushes_buffer(self):
+        """Test buffered transactions are delivered on close."""
+        recorder = Recorder()
+        coalescer = Coalescer(recorder)
+        group = digest_group(window=60, max_delay=60)
+
+        for i in range(3):
+            coalescer.add(group, make_tx(i))
+        coalescer.close()
+
+        assert [size for _, size in recorder.batches] == [1, 2]
+
+
+class TestDigest:
+    """Tests for digest rendering."""
+
+    def test_summary(self):
+        """Test counts, net deltas and the top-N cutoff."""
+        txs = [
+            make_tx(0, "swap", lamports=2_000_000_000),
+            make_tx(1, "swap", mint="BonkMint11111111", tokens=100),
+            make_tx(2, "transfer", lamports=500_000_000),
+        ]
+        message = Digest(txs, top_n=2).to_message(label="Trader")
+
+        assert "Wallet: Trader" in message
+        assert "3 transactions" in message
+        assert "2 swap, 1 transfer" in message
+        assert "Net SOL: <b>+2.5000</b>" in message
+        assert "Net Bonk...1111: -100.0000" in message
+        assert message.index("tx 0") < message.index("tx 2")
+        assert "…and 1 more" in message
+
+
+class TestDigestRouting:
+    """Tests for splitting digest watches out of a route."""
+
+    def test_route_splits_digest_watches(self):
+        """Test digest watches don't receive immediate deliveries."""
+        route = Route.build(ADDRESS, [
+            WatchConfig(address=ADDRESS, chain="solana", label="Live", notify=["telegram"]),
+            WatchConfig(address=ADDRESS, chain="solana", label="Batched", notify=["telegram"],
+                        digest=DigestConfig(window=30)),
+        ])
+
+        assert route.labels == ("Live",)
+        assert [group.label for group in route.digests] == ["Batched"]
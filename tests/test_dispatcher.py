@@ -0,0 +1,127 @@
+"""Tests for the notification dispatcher."""
+
+import threading
+import time
+
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+
+
+class RecordingNotifier(NotifierBase):
+    """Notifier that records messages, optionally blocking on an event."""
+
+    name = "recording"
+
+    def __init__(self, gate: threading.Event | None = None, fail: bool = False):
+        super().__init__()
+        self.gate = gate
+        self.fail = fail
+        self.messages: list[str] = []
+
+    def send(self, message: str, **kwargs) -> bool:
+        return self.send_to("", message)
+
+    def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+        if self.gate:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("boom")
+        self.messages.append(message)
+        return True
+
+
+class TestDispatcher:
+    """Tests for per-notifier queues."""
+
+    def test_slow_notifier_does_not_block_others(self):
+        """Test a stalled notifier leaves other notifiers unaffected."""
+        gate = threading.Event()
+        slow, fast = RecordingNotifier(gate=gate), RecordingNotifier()
+        dispatcher = Dispatcher()
+        dispatcher.add("slow", slow, workers=1)
+        dispatcher.add("fast", fast, workers=1)
+
+        for i in range(5):
+            dispatcher.submit("slow", [Delivery(f"s{i}")])
+            dispatcher.submit("fast", [Delivery(f"f{i}")])
+
+        deadline = time.monotonic() + 2
+        while len(fast.messages) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(fast.messages) == 5
+        assert slow.messages == []
+
+        gate.set()
+        assert dispatcher.close(timeout=2) == 0
+        assert len(slow.messages) == 5
+
+    def test_full_queue_drops(self):
+        """Test submissions beyond the bound are dropped and counted."""
+        gate = threading.Event()
+        dispatcher = Dispatcher()
+        dispatcher.add("slow", RecordingNotifier(gate=gate), workers=1, queue_size=2)
+
+        results = [dispatcher.submit("slow", [Delivery(str(i))]) for i in range(10)]
+        gate.set()
+        dispatcher.close(timeout=2)
+
+        assert results.count(False) >= 7
+        assert dispatcher.stats()["slow"]["dropped"] == results.count(False)
+
+    def test_stats_and_failures(self):
+        """Test counters and latency histograms are reported."""
+        dispatcher = Dispatcher()
+        dispatcher.add("ok", RecordingNotifier())
+        dispatcher.add("bad", RecordingNotifier(fail=True))
+
+        dispatcher.submit("ok", [Delivery("a"), Delivery("b")])
+        dispatcher.submit("bad", [Delivery("a")])
+        dispatcher.close(timeout=2)
+
+        stats = dispatcher.stats()
+        assert stats["ok"]["sent"] == 2
+        assert stats["ok"]["send_latency_seconds"]["count"] == 1
+        assert stats["bad"]["failed"] == 1
+        assert stats["ok"]["queue_depth"] == 0
+
+    def test_closed_dispatcher_rejects(self):
+        """Test submissions after close are rejected."""
+        dispatcher = Dispatcher()
+        dispatcher.add("ok", RecordingNotifier())
+        dispatcher.close(timeout=1)
+
+        assert not dispatcher.submit("ok", [Delivery("late")])
+
+    def test_higher_priority_delivered_first(self):
+        """Test queued work is taken in priority order, FIFO within a priority."""
+        gate = threading.Event()
+        notifier = RecordingNotifier(gate=gate)
+        dispatcher = Dispatcher()
+        dispatcher.add("slow", notifier, workers=1)
+
+        dispatcher.submit("slow", [Delivery("first")])
+        time.sleep(0.05)  # the worker is now blocked on "first"
+        for message, priority in (("low1", 0), ("high", 2), ("low2", 0), ("mid", 1)):
+            dispatcher.submit("slow", [Delivery(message)], priority=priority)
+        gate.set()
+        dispatcher.close(timeout=2)
+
+        assert notifier.messages == ["first", "high", "mid", "low1", "low2"]
+
+    def test_sheds_low_priority_at_high_water(self):
+        """Test low-priority work is shed once the queue passes the high-water mark."""
+        gate = threading.Event()
+        dispatcher = Dispatcher(high_water=0.5, shed_below=1)
+        dispatcher.add("slow", RecordingNotifier(gate=gate), workers=1, queue_size=4)
+
+        dispatcher.submit("slow", [Delivery("busy")])
+        time.sleep(0.05)
+        accepted = [dispatcher.submit("slow", [Delivery(str(i))]) for i in range(4)]
+        urgent = dispatcher.submit("slow", [Delivery("urgent")], priority=1)
+        gate.set()
+        dispatcher.close(timeout=2)
+
+        assert accepted == [True, True, False, False]
+        assert urgent
+        assert dispatcher.stats()["slow"]["shed_by_priority"] == {0: 2}
@@ -0,0 +1,183 @@
+"""Tests for the live transaction feed."""
+
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from wallet_watch.config import FeedConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.feed import TransactionFeed
+from wallet_watch.models import Transaction
+from wallet_watch.routing import Route
+
+from tests.conftest import make_address
+
+
+def make_tx(address: str, signature: str = "sig1", row_id: int | None = None) -> Transaction:
+    return Transaction(
+        signature=signature, chain="solana", address=address, tx_type="TRANSFER",
+        description="Transfer", row_id=row_id,
+    )
+
+
+def make_route(address: str, label: str = "") -> Route:
+    return Route.build(address, [WatchConfig(address=address, chain="solana", label=label)])
+
+
+def events(chunk: str) -> list[dict]:
+    """Parse the transaction events in a chunk of SSE text."""
+    return [
+        json.loads(block.split("data: ", 1)[1])
+        for block in chunk.split("\n\n")
+        if "event: transaction" in block
+    ]
+
+
+class TestTransactionFeed:
+    """Tests for fan-out and slow subscribers."""
+
+    def test_fan_out_by_address_and_label(self):
+        """Test each subscriber gets only the transactions its filters match."""
+        feed = TransactionFeed(FeedConfig(enabled=True))
+        everything = feed.subscribe()
+        by_address = feed.subscribe(addresses=frozenset({make_address(1)}))
+        by_label = feed.subscribe(labels=frozenset({"Whale"}))
+
+        feed._fan_out([
+            (make_tx(make_address(1), "a", 1), make_route(make_address(1))),
+            (make_tx(make_address(2), "b", 2), make_route(make_address(2), "Whale")),
+        ])
+
+        assert [event_id for event_id, _ in everything.take(0)[0]] == [1, 2]
+        assert [event_id for event_id, _ in by_address.take(0)[0]] == [1]
+        ((_, frame),) = by_label.take(0)[0]
+        assert events(frame)[0]["labels"] == ["Whale"] and events(frame)[0]["id"] == 2
+
+    def test_slow_subscribers_skip_or_drop(self):
+        """Test a full buffer skips its oldest events, or disconnects with the drop policy."""
+        skipping = TransactionFeed(FeedConfig(enabled=True, buffer_size=2)).subscribe()
+        skipping.put([(0, "event 0")])
+        skipping.put([(1, "event 1"), (2, "event 2")])
+        frames, skipped = skipping.take(0)
+        assert [event_id for event_id, _ in frames] == [1, 2] and skipped == 1
+
+        feed = TransactionFeed(FeedConfig(enabled=True, buffer_size=2, slow_policy="drop"))
+        dropping = feed.subscribe()
+        feed._fan_out([(make_tx(make_address(1), f"s{i}", i), make_route(make_address(1))) for i in range(3)])
+        assert dropping.closed and len(feed) == 0 and feed.dropped == 1
+
+    def test_max_clients(self):
+        """Test subscribing past max_clients is refused until a client leaves."""
+        feed = TransactionFeed(FeedConfig(enabled=True, max_clients=1))
+        first = feed.subscribe()
+
+        assert feed.subscribe() is None
+        feed.unsubscribe(first)
+        feed.unsubscribe(first)
+        assert feed.subscribe() is not None
+
+
+class TestFeedEndpoint:
+    """Tests for /feed on the ingest server."""
+
+    @pytest.fixture
+    def feed_watcher(self, config):
+        config.feed = FeedConfig(enabled=True, token="secret", heartbeat=0.05)
+        feed_watcher = WalletWatch(config)
+        feed_watcher.add_watches([WatchConfig(address=make_address(1), chain="solana", label="Whale")])
+        yield feed_watcher
+        feed_watcher.stop(timeout=1)
+
+    def test_requires_token(self, feed_watcher):
+        """Test the feed rejects clients without the configured token."""
+        client = feed_watcher.create_server().app.test_client()
+
+        assert client.get("/feed").status_code == 401
+        assert client.get("/feed?token=wrong").status_code == 401
+
+    def test_resume_from_storage_then_live(self, feed_watcher):
+        """Test a client resuming from a cursor gets stored transactions, then live ones once."""
+        address = make_address(1)
+        route = feed_watcher.routes.get(address)
+        for i in range(3):
+            feed_watcher._on_transaction(make_tx(address, f"old{i}"))
+        client = feed_watcher.create_server().app.test_client()
+
+        response = client.get(
+            "/feed?label=Whale",
+            headers={"Authorization": "Bearer secret", "Last-Event-ID": "1"},
+            buffered=False,
+        )
+        assert response.status_code == 200 and response.mimetype == "text/event-stream"
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b"retry:")
+        replayed = events(next(chunks).decode())
+        assert [(e["id"], e["signature"], e["labels"]) for e in replayed] == [
+            (2, "old1", ["Whale"]),
+            (3, "old2", ["Whale"]),
+        ]
+
+        # A live copy of a replayed transaction is not repeated
+        feed_watcher.feed.publish(make_tx(address, "old2", 3), route)
+        feed_watcher._on_transaction(make_tx(address, "new"))
+        live = []
+        while not live:
+            live = events(next(chunks).decode())
+        assert [(e["id"], e["signature"]) for e in live] == [(4, "new")]
+        response.close()
+
+    def test_server_streams_and_releases_client(self, feed_watcher):
+        """Test a real connection gets chunked events and is released after the client leaves."""
+        server = feed_watcher.create_server()
+        threading.Thread(target=server.serve, kwargs={"host": "127.0.0.1", "port": 0}, daemon=True).start()
+        while server.port is None:
+            time.sleep(0.01)
+
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        connection.request("GET", f"/feed?address={make_address(1)}", headers={"Authorization": "Bearer secret"})
+        response = connection.getresponse()
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        assert response.readline().startswith(b"retry:")
+
+        while not len(feed_watcher.feed):
+            time.sleep(0.01)
+        feed_watcher._on_transaction(make_tx(make_address(1), "live"))
+        line = b""
+        while not line.startswith(b"data:"):
+            line = response.readline()
+        assert json.loads(line[5:])["signature"] == "live"
+
+        response.close()
+        connection.close()
+        deadline = time.monotonic() + 5
+        while len(feed_watcher.feed) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert len(feed_watcher.feed) == 0
+
+    def test_http10_client_gets_events(self, feed_watcher):
+        """Test an HTTP/1.0 request gets well-formed events."""
+        server = feed_watcher.create_server()
+        threading.Thread(target=server.serve, kwargs={"host": "127.0.0.1", "port": 0}, daemon=True).start()
+        while server.port is None:
+            time.sleep(0.01)
+
+        connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+        connection._http_vsn, connection._http_vsn_str = 10, "HTTP/1.0"
+        connection.request("GET", f"/feed?address={make_address(1)}", headers={"Authorization": "Bearer secret"})
+        response = connection.getresponse()
+        assert response.readline().startswith(b"retry:")
+
+        while not len(feed_watcher.feed):
+            time.sleep(0.01)
+        feed_watcher._on_transaction(make_tx(make_address(1), "live"))
+        lines = []
+        while not lines or not lines[-1].startswith(b"data:"):
+            lines.append(response.readline())
+        assert json.loads(lines[-1][5:])["signature"] == "live"
+        assert all(line.startswith((b"id:", b"event:", b":", b"\n")) for line in lines[:-1])
+
+        response.close()
+        connection.close()
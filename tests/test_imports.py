@@ -0,0 +1,55 @@
+"""Import-time budgets for CLI subcommands.
+
+Each case imports what a subcommand loads in a fresh interpreter under
+``-X importtime`` and checks which heavy modules came in and how long
+imports took beyond interpreter startup. Budgets are several times the
+measured cost so slow machines pass; pulling Flask or telebot into
+``health`` blows them.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY = {"flask", "telebot", "requests", "pydantic", "yaml", "base58"}
+
+CASES = {
+    "health": ("from wallet_watch.cli import main", set(), 0.15),
+    "check": (
+        "from wallet_watch.cli import main\n"
+        "from wallet_watch.chains import get_chain_provider\n"
+        "get_chain_provider('solana').validate_address('11111111111111111111111111111111')",
+        set(),
+        0.25,
+    ),
+    "start": ("from wallet_watch.cli import main\nimport wallet_watch.core", {"flask", "pydantic", "yaml"}, 1.5),
+}
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Self import time in microseconds per module imported by ``code``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize("command", list(CASES))
+def test_import_budget(command):
+    """Test a subcommand loads only the heavy modules it needs, within its budget."""
+    code, allowed, budget = CASES[command]
+    startup = import_times("pass")
+
+    times = import_times(code)
+
+    assert HEAVY.intersection(times) == allowed
+    seconds = sum(us for module, us in times.items() if module not in startup) / 1e6
+    assert seconds < budget, f"{command} imports took {seconds:.3f}s"
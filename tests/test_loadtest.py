@@ -0,0 +1,103 @@
+"""Tests for webhook recording and replay."""
+
+import json
+import threading
+import time
+
+from wallet_watch.config import NotifierConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.loadtest import AlertSink, CapturedRequest, Replayer, WebhookRecorder, read_capture
+
+from tests.conftest import make_address
+
+
+def make_payload(signature: str, address: str) -> dict:
+    return {
+        "signature": signature,
+        "type": "TRANSFER",
+        "nativeTransfers": [{"fromUserAccount": make_address(2), "toUserAccount": address, "amount": 10**9}],
+    }
+
+
+class TestRecorder:
+    """Tests for capturing webhooks."""
+
+    def test_record_and_read(self, tmp_path):
+        """Test recorded bodies are read back with their paths and signatures."""
+        path = str(tmp_path / "capture.jsonl.gz")
+        recorder = WebhookRecorder(path)
+        client = recorder.app.test_client()
+
+        response = client.post("/webhook/solana", json=[make_payload("sig1", "a"), make_payload("sig2", "a")])
+        client.post("/webhook", json=make_payload("sig3", "a"), headers={"Authorization": "secret"})
+        recorder.shutdown()
+
+        assert response.status_code == 200
+        first, second = read_capture(path)
+        assert first.path == "/webhook/solana" and first.signatures == ["sig1", "sig2"]
+        assert second.signatures == ["sig3"] and second.headers["Authorization"] == "secret"
+        assert second.offset >= first.offset
+
+
+class TestReplay:
+    """Tests for replaying captures against a running instance."""
+
+    def test_schedule_scales_speed_and_loops(self):
+        """Test offsets follow the capture divided by the speed, one pass after another."""
+        entries = [CapturedRequest(offset=t, path="/webhook", body="[]") for t in (10.0, 11.0, 12.0)]
+        replayer = Replayer("http://localhost", entries, speed=2, loops=2)
+
+        offsets = [(offset, n) for offset, n, _ in replayer.schedule()]
+
+        assert offsets == [(0.0, 0), (0.5, 0), (1.0, 0), (1.5, 1), (2.0, 1), (2.5, 1)]
+
+    def test_open_loop_rate(self):
+        """Test --rps spaces requests evenly and cycles the capture."""
+        entries = [CapturedRequest(offset=0, path="/webhook", body="[]")] * 2
+        replayer = Replayer("http://localhost", entries, rps=10, duration=0.5)
+
+        assert [(round(offset, 3), n) for offset, n, _ in replayer.schedule()] == [
+            (0.0, 0), (0.1, 0), (0.2, 1), (0.3, 1), (0.4, 2)
+        ]
+
+    def test_end_to_end_latency_and_loss(self, config):
+        """Test alerts for replayed transactions reach the sink with no loss."""
+        sink = AlertSink()
+        sink.start()
+
+        address = make_address(1)
+        config.server.host = "127.0.0.1"
+        config.server.port = 0
+        config.notifiers = [NotifierConfig(type="webhook", webhook_url=f"{sink.url}/hook")]
+        config.watches = [WatchConfig(address=address, chain="solana", notify=["webhook"])]
+        watcher = WalletWatch(config)
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        while watcher.server is None or watcher.server.port is None:
+            time.sleep(0.01)
+
+        entries = [
+            CapturedRequest(
+                offset=i * 0.01,
+                path="/webhook/solana",
+                body=json.dumps([make_payload(f"sig{i}", address)]),
+                signatures=[f"sig{i}"],
+            )
+            for i in range(10)
+        ]
+        try:
+            replayer = Replayer(
+                f"http://127.0.0.1:{watcher.server.port}", entries, sink=sink, speed=0, loops=2, concurrency=4
+            )
+            elapsed = replayer.run()
+            replayer.wait_for_alerts(10)
+            report = replayer.report(elapsed)
+        finally:
+            watcher.request_shutdown()
+            thread.join(timeout=10)
+            sink.stop()
+
+        assert report["requests"] == 20 and report["statuses"] == {"200": 20}
+        assert report["alerts"]["alerted"] == 20
+        assert report["alerts"]["loss"] == 0
+        assert report["alerts"]["latency_ms"]["p50"] > 0
@@ -0,0 +1,59 @@
+"""Tests for the metrics registry and /metrics endpoint."""
+
+from wallet_watch.config import WatchConfig
+from wallet_watch.metrics import Counter, Registry
+
+from tests.conftest import make_address
+
+
+class TestRegistry:
+    """Tests for metric families and the text format."""
+
+    def test_renders_prometheus_text(self):
+        """Test counters, callback gauges and histograms render with labels."""
+        registry = Registry()
+        registry.counter("requests_total", "Requests", ("status",)).labels(status=200).inc(3)
+        registry.gauge("depth", "Queue depth").register(Counter(lambda: 7))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        latency.labels().observe(0.05)
+        latency.labels().observe(0.5)
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{status="200"} 3' in text
+        assert "depth 7" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+        assert "latency_seconds_count 2" in text
+
+    def test_family_is_shared_by_name(self):
+        """Test declaring a family twice returns the same one."""
+        registry = Registry()
+        first = registry.counter("events_total", "Events")
+        assert registry.counter("events_total", "Events") is first
+
+
+class TestEndpoint:
+    """Tests for the /metrics endpoint."""
+
+    def test_exposes_pipeline_metrics(self, watcher):
+        """Test processing a webhook shows up in the exposed metrics."""
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana")])
+        client = watcher.create_server().app.test_client()
+
+        client.post("/webhook/solana", json=[{
+            "signature": "sig1",
+            "type": "TRANSFER",
+            "nativeTransfers": [{"fromUserAccount": make_address(2), "toUserAccount": address, "amount": 1}],
+        }])
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        text = response.get_data(as_text=True)
+        assert 'wallet_watch_webhooks_total{chain="solana",status="200"}' in text
+        assert 'wallet_watch_webhook_parse_seconds_count{chain="solana"}' in text
+        assert 'wallet_watch_storage_seconds_count{op="save_transaction_with_outbox"}' in text
+        assert "wallet_watch_watched_addresses 1" in text
@@ -0,0 +1,144 @@
+"""Tests for notification providers."""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.notifiers import Delivery
+from wallet_watch.notifiers.telegram import TelegramNotifier
+from wallet_watch.notifiers.webhook import WebhookNotifier
+
+
+class TestTelegramNotifier:
+    """Tests for the Telegram notifier."""
+
+    def test_send_batch_expands_default_and_dedupes(self):
+        """Test default deliveries go to subscribers and duplicates are sent once."""
+        notifier = TelegramNotifier(bot_token="123:abc", chat_id="100", rate_limit=False)
+        notifier.add_subscriber("200")
+
+        deliveries = [
+            Delivery("hello"),
+            Delivery("hello", "100"),
+            Delivery("hello", "300"),
+            Delivery("other", "300"),
+        ]
+        with patch.object(notifier, "_send_now", return_value=True) as send_to:
+            sent = notifier.send_batch(deliveries)
+
+        assert sent == 4
+        assert sorted(call.args[:2] for call in send_to.call_args_list) == [
+            ("100", "hello"),
+            ("200", "hello"),
+            ("300", "hello"),
+            ("300", "other"),
+        ]
+
+
+class WebhookSink(ThreadingHTTPServer):
+    """Local HTTP endpoint that records webhook requests."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), WebhookSinkHandler)
+        self.lock = threading.Lock()
+        self.requests: list[tuple[int, dict]] = []
+        self.client_ports: set[int] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+
+class WebhookSinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        with self.server.lock:
+            self.server.requests.append(json.loads(body))
+            self.server.client_ports.add(self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sink():
+    server = WebhookSink()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+
+class TestWebhookNotifier:
+    """Tests for the webhook notifier."""
+
+    def test_reuses_connections(self, sink):
+        """Test sequential sends share one keep-alive connection."""
+        notifier = WebhookNotifier(webhook_url=sink.url, concurrency=1)
+
+        for i in range(5):
+            assert notifier.send(f"m{i}")
+        notifier.close()
+
+        assert len(sink.requests) == 5
+        assert len(sink.client_ports) == 1
+
+    def test_structured_fields(self, sink):
+        """Test transaction fields are included alongside the message."""
+        notifier = WebhookNotifier(webhook_url=sink.url)
+
+        results = notifier.send_each([Delivery("msg", data={"signature": "sig1", "tx_type": "swap"})])
+        notifier.close()
+
+        assert results[0][1]
+        assert sink.requests[0]["message"] == "msg"
+        assert sink.requests[0]["transaction"]["signature"] == "sig1"
+
+    def test_batch_mode_gzip(self, sink):
+        """Test batch mode posts gzip-compressed arrays split by size."""
+        notifier = WebhookNotifier(webhook_url=sink.url, batch_size=10, gzip=True)
+
+        deliveries = [Delivery(f"m{i}", data={"signature": f"s{i}"}) for i in range(25)]
+        results = notifier.send_each(deliveries)
+        notifier.close()
+
+        assert all(ok for _, ok in results)
+        assert sorted(len(batch) for batch in sink.requests) == [5, 10, 10]
+        assert {event["transaction"]["signature"] for batch in sink.requests for event in batch} == {
+            f"s{i}" for i in range(25)
+        }
+
+    def test_dispatcher_merges_batches(self, sink):
+        """Test queued work is merged into one request within the batch interval."""
+        notifier = WebhookNotifier(webhook_url=sink.url, batch_size=50, batch_interval=0.2)
+        dispatcher = Dispatcher()
+        dispatcher.add("webhook", notifier, workers=1)
+
+        results = []
+        for i in range(20):
+            dispatcher.submit("webhook", [Delivery(f"m{i}")], callback=results.append)
+        dispatcher.close(timeout=2)
+
+        assert len(results) == 20
+        assert all(item_results[0][1] for item_results in results)
+        assert len(sink.requests) <= 2
+
+    def test_failure_reported(self):
+        """Test an unreachable endpoint is reported as failed."""
+        notifier = WebhookNotifier(webhook_url="http://127.0.0.1:9/hook", timeout=1)
+
+        assert notifier.send_each([Delivery("m")]) == [(Delivery("m"), False)]
+        notifier.close()
@@ -0,0 +1,209 @@
+"""Tests for the notification outbox."""
+
+import sqlite3
+import time
+
+import pytest
+
+from wallet_watch.breaker import CircuitBreaker
+from wallet_watch.config import BreakerConfig, OutboxConfig
+from wallet_watch.dispatcher import Dispatcher
+from wallet_watch.models import Transaction
+from wallet_watch.notifiers.base import Delivery, NotifierBase
+from wallet_watch.outbox import Outbox
+from wallet_watch.storage.sqlite import SQLiteStorage
+
+
+class FlakyNotifier(NotifierBase):
+    """Notifier that fails for recipients listed in ``down``."""
+
+    name = "flaky"
+
+    def __init__(self):
+        super().__init__()
+        self.down: set[str] = set()
+        self.sent: list[tuple[str, str]] = []
+
+    def send(self, message: str, **kwargs) -> bool:
+        return self.send_to("default", message)
+
+    def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+        if recipient in self.down:
+            return False
+        self.sent.append((recipient, message))
+        return True
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(path=str(tmp_path / "test.db"))
+    yield storage
+    storage.close()
+
+
+def make_outbox(storage, notifier, **overrides):
+    dispatcher = Dispatcher()
+    dispatcher.add("flaky", notifier, workers=1)
+    config = OutboxConfig(base_delay=0.01, max_delay=0.05, lease=30, **overrides)
+    return Outbox(storage, dispatcher, config), dispatcher
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def make_tx(signature="sig1"):
+    return Transaction(signature=signature, chain="solana", address="addr", tx_type="transfer", description="")
+
+
+class TestOutbox:
+    """Tests for durable delivery."""
+
+    def test_delivered_rows_are_removed(self, storage):
+        """Test a successful delivery saves the transaction and clears the intent."""
+        notifier = FlakyNotifier()
+        outbox, dispatcher = make_outbox(storage, notifier)
+
+        outbox.send({"flaky": [Delivery("hi", "a"), Delivery("hi", "b")]}, transaction=make_tx())
+
+        assert wait_for(lambda: storage.outbox_counts() == {})
+        assert len(storage.get_transactions()) == 1
+        assert len(notifier.sent) == 2
+        dispatcher.close(timeout=1)
+
+    def test_retries_only_failed_deliveries(self, storage):
+        """Test failed recipients are retried with backoff until delivered."""
+        notifier = FlakyNotifier()
+        notifier.down = {"b"}
+        outbox, dispatcher = make_outbox(storage, notifier)
+
+        outbox.send({"flaky": [Delivery("hi", "a"), Delivery("hi", "b")]}, transaction=make_tx())
+        assert wait_for(lambda: outbox.retried == 1)
+
+        notifier.down = set()
+        time.sleep(0.06)
+        assert outbox.poll() == 1
+        assert wait_for(lambda: storage.outbox_counts() == {})
+        assert notifier.sent == [("a", "hi"), ("b", "hi")]
+        dispatcher.close(timeout=1)
+
+    def test_dead_letter(self, storage):
+        """Test rows become dead letters after max_attempts."""
+        notifier = FlakyNotifier()
+        notifier.down = {"a"}
+        outbox, dispatcher = make_outbox(storage, notifier, max_attempts=3)
+
+        outbox.send({"flaky": [Delivery("hi", "a")]})
+        for _ in range(50):
+            if outbox.dead:
+                break
+            outbox.poll()
+            time.sleep(0.02)
+
+        assert storage.outbox_counts() == {"dead": 1}
+        row = storage.conn.execute("SELECT * FROM outbox").fetchone()
+        assert row["attempts"] == 3
+        dispatcher.close(timeout=1)
+
+    def test_recovers_after_restart(self, storage):
+        """Test intents in flight at a crash are delivered by the next run."""
+        # A crashed process leaves a leased, pending row behind
+        storage.save_transaction_with_outbox(
+            make_tx(),
+            [{"signature": "sig1", "notifier": "flaky", "deliveries": [{"message": "hi", "recipient": "a"}]}],
+            lease_until=time.time() + 3600,
+        )
+
+        notifier = FlakyNotifier()
+        outbox, dispatcher = make_outbox(storage, notifier, poll_interval=0.01)
+        outbox.start()
+
+        assert wait_for(lambda: notifier.sent == [("a", "hi")])
+        assert wait_for(lambda: storage.outbox_counts() == {})
+        outbox.stop()
+        dispatcher.close(timeout=1)
+
+    def test_claim_uses_pending_index(self, storage):
+        """Test claiming due rows is an index search, not a table scan."""
+        plan = storage.conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM outbox
+            WHERE status = 'pending' AND next_attempt_at <= ?
+              AND (leased_until IS NULL OR leased_until <= ?)
+            ORDER BY next_attempt_at LIMIT ?
+        """, (0, 0, 10)).fetchall()
+
+        assert any("idx_outbox_pending" in row["detail"] for row in plan)
+
+    def test_backoff_grows_with_jitter(self, storage):
+        """Test delays grow exponentially, are capped, and are jittered."""
+        outbox = Outbox(storage, Dispatcher(), OutboxConfig(base_delay=2, max_delay=60))
+
+        assert 1 <= outbox.backoff(1) <= 2
+        assert 4 <= outbox.backoff(3) <= 8
+        assert 30 <= outbox.backoff(20) <= 60
+
+    def test_open_circuit_defers_without_attempts(self, storage):
+        """Test rows rejected by an open circuit are deferred, not retried."""
+        notifier = FlakyNotifier()
+        notifier.down = {"a"}
+        dispatcher = Dispatcher()
+        breaker = CircuitBreaker("flaky", BreakerConfig(min_calls=1, open_seconds=60))
+        dispatcher.add("flaky", notifier, workers=1, breaker=breaker)
+        outbox = Outbox(storage, dispatcher, OutboxConfig(base_delay=0.01, max_delay=0.05))
+
+        outbox.send({"flaky": [Delivery("hi", "a")]})
+        assert wait_for(lambda: outbox.deferred == 1)
+
+        row = storage.conn.execute("SELECT * FROM outbox").fetchone()
+        assert row["attempts"] == 0
+        assert row["next_attempt_at"] > time.time() + 50
+        assert row["last_error"] == "circuit open for flaky"
+        dispatcher.close(timeout=1)
+
+    def test_claims_high_priority_first(self, storage):
+        """Test a backlog is claimed most urgent first."""
+        intents = [
+            {"notifier": "flaky", "deliveries": [{"message": str(p), "recipient": "a"}], "priority": p}
+            for p in (0, 2, 1)
+        ]
+        storage.save_outbox(intents, lease_until=0)
+
+        rows = storage.claim_outbox(time.time(), time.time() + 60)
+
+        assert [row["priority"] for row in rows] == [2, 1, 0]
+
+    def test_storage_failure_sends_directly(self, storage, monkeypatch):
+        """Test intents that cannot be stored are still delivered."""
+        def fail(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(storage, "save_transaction_with_outbox", fail)
+        notifier = FlakyNotifier()
+        outbox, dispatcher = make_outbox(storage, notifier)
+
+        outbox.send({"flaky": [Delivery("hi", "a")]}, transaction=make_tx())
+
+        assert wait_for(lambda: notifier.sent == [("a", "hi")])
+        assert outbox.unstored == 1
+        assert storage.outbox_counts() == {}
+        dispatcher.close(timeout=1)
+
+    def test_shed_rows_are_retried_then_dead_lettered(self, storage):
+        """Test rows the dispatcher sheds use up attempts instead of sitting leased."""
+        dispatcher = Dispatcher(high_water=0.0, shed_below=1)
+        dispatcher.add("flaky", FlakyNotifier(), workers=1)
+        outbox = Outbox(storage, dispatcher, OutboxConfig(base_delay=0.01, max_delay=0.02, max_attempts=3))
+
+        outbox.send({"flaky": [Delivery("hi", "a")]}, priority=0)
+        row = storage.conn.execute("SELECT * FROM outbox").fetchone()
+        assert row["attempts"] == 1
+        assert row["leased_until"] is None or row["leased_until"] <= time.time()
+        assert row["last_error"] == "rejected by the flaky queue"
+
+        assert wait_for(lambda: outbox.poll() == 0 and outbox.dead == 1)
+        assert storage.outbox_counts() == {"dead": 1}
+        dispatcher.close(timeout=1)
@@ -0,0 +1,93 @@
+"""Tests for the spam and dust pre-filter."""
+
+from unittest.mock import patch
+
+from wallet_watch.config import PrefilterConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.prefilter import CountMinSketch, PreFilter
+
+from tests.conftest import make_address
+
+WATCHED = make_address(1)
+SENDER = make_address(2)
+SPAM_MINT = "SpamMint111"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def native(amount, sender=SENDER):
+    return {"nativeTransfers": [{"fromUserAccount": sender, "toUserAccount": WATCHED, "amount": amount}]}
+
+
+def tokens(*mints, sender=SENDER):
+    return {"tokenTransfers": [
+        {"fromUserAccount": sender, "toUserAccount": WATCHED, "mint": mint, "tokenAmount": 1} for mint in mints
+    ]}
+
+
+class TestPreFilter:
+    """Tests for the individual rules."""
+
+    def test_mint_lists(self):
+        """Test denied mints are dropped and allowlists keep only listed mints."""
+        prefilter = PreFilter(PrefilterConfig(mint_denylist=[SPAM_MINT]))
+        assert prefilter.check(tokens(SPAM_MINT)) == "mint_denylist"
+        assert prefilter.check(tokens(SPAM_MINT, USDC)) is None
+
+        prefilter = PreFilter(PrefilterConfig(mint_allowlist=[USDC], dust_lamports=1000))
+        assert prefilter.check(tokens(SPAM_MINT)) == "mint_allowlist"
+        assert prefilter.check(tokens(USDC)) is None
+        assert prefilter.check({**tokens(SPAM_MINT), **native(10**9)}) is None
+
+    def test_dust(self):
+        """Test native-only transfers below the threshold are dropped."""
+        prefilter = PreFilter(PrefilterConfig(dust_lamports=1000))
+
+        assert prefilter.check(native(999)) == "dust"
+        assert prefilter.check(native(1000)) is None
+        assert prefilter.check({"type": "SWAP"}) is None
+
+    def test_counterparty_rate(self, caplog):
+        """Test a noisy sender is limited per window, but watched senders are not."""
+        clock = [0.0]
+        prefilter = PreFilter(
+            PrefilterConfig(counterparty_limit=2, counterparty_window=60), clock=lambda: clock[0]
+        )
+
+        with caplog.at_level("INFO", logger="wallet_watch.prefilter"):
+            assert [prefilter.check(native(10**9)) for _ in range(3)] == [None, None, "counterparty_rate"]
+        assert [SENDER in record.getMessage() for record in caplog.records] == [True]
+        assert prefilter.check(native(10**9, sender=WATCHED), watched={WATCHED}) is None
+
+        clock[0] = 61
+        assert prefilter.check(native(10**9)) is None
+        assert prefilter.stats() == {
+            "checked": 5,
+            "dropped": {"mint_denylist": 0, "mint_allowlist": 0, "dust": 0, "counterparty_rate": 1},
+        }
+
+    def test_count_min_never_undercounts(self):
+        """Test sketch estimates are at least the true counts."""
+        sketch = CountMinSketch(width=16, depth=3)
+        for i in range(100):
+            sketch.add(f"k{i % 10}")
+
+        assert all(sketch.estimate(f"k{i}") >= 10 for i in range(10))
+
+
+class TestWebhookPreFilter:
+    """Tests for the pre-filter stage in the Solana provider."""
+
+    def test_drops_before_building_transactions(self, config):
+        """Test dropped payloads never reach Transaction or the watcher."""
+        config.prefilter = PrefilterConfig(dust_lamports=1000)
+        watcher = WalletWatch(config)
+        chain = watcher.chains["solana"]
+        chain.add_callback(WATCHED, lambda tx: None)
+
+        with patch("wallet_watch.chains.solana.Transaction") as transaction:
+            chain._process_webhook_data([{"signature": "dust", **native(1)}, {"signature": "real", **native(10**9)}])
+
+        assert transaction.call_count == 1
+        assert watcher.stats()["prefilter"]["solana"]["dropped"]["dust"] == 1
+        watcher.stop(timeout=1)
+        watcher.storage.close()
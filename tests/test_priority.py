@@ -0,0 +1,54 @@
+"""Tests for priority scoring and webhook admission control."""
+
+from wallet_watch.config import PriorityConfig
+from wallet_watch.models import Transaction
+from wallet_watch.priority import PriorityPolicy
+
+
+def make_tx(amount_usd=None, tx_type="transfer") -> Transaction:
+    return Transaction(
+        signature="sig1", chain="solana", address="addr", tx_type=tx_type, description="", amount_usd=amount_usd
+    )
+
+
+class TestPriorityPolicy:
+    """Tests for transaction scoring."""
+
+    def test_scores_value_type_and_watch(self):
+        """Test USD tiers, tx type bonuses and watch priority add up."""
+        policy = PriorityPolicy(PriorityConfig(usd_tiers=[1_000, 1_000_000], tx_types={"swap": 1}))
+
+        assert policy.score(make_tx(0.01)) == 0
+        assert policy.score(make_tx(5_000)) == 1
+        assert policy.score(make_tx(2_000_000, "swap")) == 3
+        assert policy.score(make_tx(None), watch_priority=-1) == -1
+        assert policy.score_many([make_tx(1), make_tx(5_000)]) == 1
+
+
+class TestAdmission:
+    """Tests for webhook admission control."""
+
+    def test_webhook_rejected_when_overloaded(self, watcher):
+        """Test the webhook answers 503 with Retry-After past the reject mark."""
+        client = watcher.create_server().app.test_client()
+
+        assert client.post("/webhook/solana", json=[]).status_code == 200
+
+        watcher.config.priority.reject_water = 0.0
+        response = client.post("/webhook/solana", json=[])
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert watcher.stats()["admission"]["rejected_webhooks"] == 1
+
+    def test_admission_is_opt_in_and_after_authentication(self, watcher):
+        """Test nothing is rejected by default, and unauthenticated callers never see a 503."""
+        watcher.dispatcher.pressure = lambda: 1.0
+        assert watcher.admission_check() is None
+
+        watcher.config.priority.reject_water = 0.5
+        watcher.chains["solana"].webhook_secret = "secret"
+        client = watcher.create_server().app.test_client()
+
+        assert client.post("/webhook/solana", json=[]).status_code == 401
+        assert client.post("/webhook/solana", json=[], headers={"Authorization": "secret"}).status_code == 503
@@ -0,0 +1,202 @@
+"""Tests for rate-limited Telegram delivery."""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import telebot
+
+from wallet_watch.notifiers.base import Delivery
+from wallet_watch.notifiers.ratelimit import RetryAfter, SendScheduler, TokenBucket
+from wallet_watch.notifiers.telegram import TelegramNotifier
+
+
+class FakeBotAPI(ThreadingHTTPServer):
+    """Local stand-in for the Telegram Bot API sendMessage method."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeBotHandler)
+        self.lock = threading.Lock()
+        self.received: list[tuple[str, float]] = []
+        self.flood: dict[str, int] = {}
+        self.retry_after = 1
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/bot{{0}}/{{1}}"
+
+
+class FakeBotHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        params = parse_qs(urlparse(self.path).query)
+        chat_id = params["chat_id"][0]
+        server: FakeBotAPI = self.server
+
+        with server.lock:
+            if server.flood.get(chat_id, 0) > 0:
+                server.flood[chat_id] -= 1
+                status, body = 429, {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {server.retry_after}",
+                    "parameters": {"retry_after": server.retry_after},
+                }
+            else:
+                server.received.append((chat_id, time.monotonic()))
+                status, body = 200, {
+                    "ok": True,
+                    "result": {
+                        "message_id": len(server.received),
+                        "date": 0,
+                        "chat": {"id": int(chat_id), "type": "private"},
+                        "text": params["text"][0],
+                    },
+                }
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def bot_api():
+    """Run a fake Bot API for notifiers to point ``api_url`` at."""
+    server = FakeBotAPI()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def max_in_window(times: list[float], window: float) -> int:
+    """Largest number of events inside any sliding window."""
+    times = sorted(times)
+    best, start = 0, 0
+    for end in range(len(times)):
+        while times[end] - times[start] >= window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_refill(self):
+        """Test tokens refill at the configured rate up to capacity."""
+        bucket = TokenBucket(rate=2.0, capacity=2.0, now=0.0)
+        bucket.take(0.0)
+        bucket.take(0.0)
+
+        assert bucket.wait_time(0.0) == pytest.approx(0.5)
+        assert bucket.wait_time(0.5) == 0
+        assert bucket.wait_time(100.0) == 0
+        assert bucket.tokens == 2.0
+
+
+class TestSendScheduler:
+    """Tests for fair scheduling."""
+
+    def test_flooded_recipient_does_not_starve_others(self):
+        """Test a backlog for one recipient doesn't delay another."""
+        sent: list[tuple[str, float]] = []
+        scheduler = SendScheduler(
+            lambda recipient, message: sent.append((recipient, time.monotonic())) or True,
+            global_rate=1000,
+            recipient_rate=lambda recipient: (20.0, 1.0),
+        )
+        started = time.monotonic()
+        flooded = [scheduler.submit("busy", str(i)) for i in range(20)]
+        quiet = scheduler.submit("quiet", "hello")
+
+        assert quiet.result(timeout=2)
+        assert time.monotonic() - started < 0.2
+        assert all(f.result(timeout=5) for f in flooded)
+        scheduler.stop()
+
+    def test_retry_after_requeues(self):
+        """Test RetryAfter pauses the recipient and retries the message."""
+        calls = []
+
+        def send(recipient, message):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RetryAfter(0.3)
+            return True
+
+        scheduler = SendScheduler(send, recipient_rate=lambda recipient: (100.0, 1.0))
+        assert scheduler.submit("chat", "hi").result(timeout=2)
+        assert calls[1] - calls[0] >= 0.29
+        assert scheduler.retried == 1
+        scheduler.stop()
+
+
+class TestTelegramThroughput:
+    """Throughput tests against a fake Bot API."""
+
+    def test_respects_global_and_chat_limits(self, bot_api):
+        """Test sustained sends stay within limits while using the budget."""
+        notifier = TelegramNotifier(
+            bot_token="123:abc",
+            api_url=bot_api.url,
+            global_rate=100,
+            chat_rate=10,
+            send_workers=16,
+        )
+        chats = [str(chat) for chat in range(1, 21)]
+        deliveries = [Delivery(f"m{i}", chat) for i in range(15) for chat in chats]
+
+        started = time.monotonic()
+        assert notifier.send_batch(deliveries) == 300
+        elapsed = time.monotonic() - started
+        notifier.close()
+
+        per_chat = defaultdict(list)
+        for chat_id, at in bot_api.received:
+            per_chat[chat_id].append(at)
+
+        # 100 burst tokens, then 100/s for the remaining 200 messages
+        assert 1.5 < elapsed < 4.0
+        assert max_in_window([at for _, at in bot_api.received], 1.0) <= 100 + 100 + 5
+        assert all(max_in_window(times, 1.0) <= 11 for times in per_chat.values())
+
+    def test_group_limit_and_retry_after(self, bot_api):
+        """Test group chats use the slower limit and 429s are retried."""
+        bot_api.flood["7"] = 1
+        notifier = TelegramNotifier(
+            bot_token="123:abc",
+            api_url=bot_api.url,
+            group_rate=5,
+            chat_rate=50,
+        )
+
+        deliveries = [Delivery(f"g{i}", "-100") for i in range(5)] + [Delivery("p", "7")]
+        assert notifier.send_batch(deliveries) == 6
+        notifier.close()
+
+        group_times = [at for chat_id, at in bot_api.received if chat_id == "-100"]
+        assert group_times[-1] - group_times[0] >= 0.75
+        assert notifier.scheduler.retried == 1
+
+    def test_api_url_is_per_notifier(self, bot_api):
+        """Test a notifier's api_url does not redirect other notifiers."""
+        previous = telebot.apihelper.API_URL
+        local = TelegramNotifier(bot_token="123:abc", api_url=bot_api.url, rate_limit=False)
+        TelegramNotifier(bot_token="456:def", rate_limit=False)
+
+        assert telebot.apihelper.API_URL == previous
+        assert local.send_to("7", "hi")
+        assert [chat_id for chat_id, _ in bot_api.received] == ["7"]
+        local.close()
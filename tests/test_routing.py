@@ -0,0 +1,38 @@
+"""Tests for the routing table."""
+
+from wallet_watch.config import WatchConfig
+from wallet_watch.routing import RoutingTable, Target
+
+
+class TestRoutingTable:
+    """Tests for address to target routing."""
+
+    def test_groups_targets_by_notifier(self):
+        """Test targets are grouped per notifier and deduplicated."""
+        table = RoutingTable()
+        route = table.set("addr", [
+            WatchConfig(address="addr", chain="solana", label="A", notify=["telegram", "webhook"],
+                        recipients=["1", "2"]),
+            WatchConfig(address="addr", chain="solana", label="A", notify=["telegram"], recipients=["2"]),
+            WatchConfig(address="addr", chain="solana", label="B", notify=["telegram"]),
+        ])
+
+        assert route.labels == ("A", "B")
+        assert route.targets["telegram"] == [
+            Target("telegram", "1", "A"),
+            Target("telegram", "2", "A"),
+            Target("telegram", "", "B"),
+        ]
+        assert len(route.targets["webhook"]) == 2
+
+    def test_incremental_updates(self):
+        """Test set replaces and remove drops a single address."""
+        table = RoutingTable()
+        table.set("a", [WatchConfig(address="a", chain="solana", label="old")])
+        table.set("b", [WatchConfig(address="b", chain="solana")])
+        table.set("a", [WatchConfig(address="a", chain="solana", label="new")])
+
+        assert table.get("a").labels == ("new",)
+        assert table.remove("b") is not None
+        assert "b" not in table
+        assert len(table) == 1
@@ -0,0 +1,110 @@
+"""Tests for the shared ingest server and provider supervision."""
+
+import threading
+import time
+
+import requests
+
+from wallet_watch.chains.base import ChainBase
+from wallet_watch.server import IngestServer, ProviderSupervisor
+
+
+class FakeProvider(ChainBase):
+    """Provider that records webhook bodies and lifecycle calls."""
+
+    def __init__(self, name: str, start_delay: float = 0.0):
+        super().__init__()
+        self.name = name
+        self.start_delay = start_delay
+        self.received: list = []
+        self.started = 0
+        self.stopped = 0
+        self.alive = False
+
+    def validate_address(self, address: str) -> bool:
+        return True
+
+    def subscribe(self, address, callback):
+        self.add_callback(address, callback)
+
+    def unsubscribe(self, address):
+        self.remove_callbacks(address)
+
+    def get_balance(self, address: str) -> float:
+        return 0.0
+
+    def handle_webhook(self, request):
+        self.received.append(request.get_json())
+        return {"status": "ok"}, 200
+
+    def start(self):
+        time.sleep(self.start_delay)
+        self.started += 1
+        self.alive = True
+
+    def stop(self):
+        self.stopped += 1
+        self.alive = False
+
+    def healthy(self) -> bool:
+        return self.alive
+
+
+class TestIngestServer:
+    """Tests for per-chain webhook routes."""
+
+    def test_routes_per_chain(self):
+        """Test each chain receives only its own webhooks."""
+        solana, other = FakeProvider("solana"), FakeProvider("other")
+        server = IngestServer()
+        server.mount(solana)
+        server.mount(other)
+        client = server.app.test_client()
+
+        assert client.post("/webhook/solana", json={"n": 1}).status_code == 200
+        assert client.post("/webhook/other", json={"n": 2}).status_code == 200
+        assert client.post("/webhook", json={"n": 3}).status_code == 200
+        assert client.post("/webhook/missing", json={}).status_code == 404
+
+        assert solana.received == [{"n": 1}, {"n": 3}]
+        assert other.received == [{"n": 2}]
+
+    def test_serve_and_shutdown(self):
+        """Test the server serves real requests and stops on shutdown."""
+        server = IngestServer(health_check=lambda: {"status": "healthy"})
+        thread = threading.Thread(target=server.serve, kwargs={"host": "127.0.0.1", "port": 0})
+        thread.start()
+        while server._server is None:
+            time.sleep(0.01)
+
+        port = server._server.server_port
+        assert requests.get(f"http://127.0.0.1:{port}/health", timeout=5).json() == {"status": "healthy"}
+
+        server.shutdown()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+class TestProviderSupervisor:
+    """Tests for provider lifecycle management."""
+
+    def test_starts_concurrently_and_restarts_unhealthy(self):
+        """Test providers start in parallel and crashed ones are restarted."""
+        providers = {name: FakeProvider(name, start_delay=0.2) for name in ("a", "b", "c")}
+        supervisor = ProviderSupervisor(providers, interval=60)
+
+        started = time.monotonic()
+        supervisor.start()
+        assert time.monotonic() - started < 0.5
+        assert all(p.started == 1 for p in providers.values())
+
+        providers["b"].alive = False
+        supervisor.check()
+        supervisor.check()
+
+        assert providers["b"].alive
+        assert supervisor.stats()["b"] == {"healthy": True, "restarts": 1}
+        assert providers["a"].started == 1
+
+        supervisor.stop()
+        assert all(p.stopped >= 1 and not p.alive for p in providers.values())
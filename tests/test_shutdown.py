@@ -0,0 +1,128 @@
+"""Deploy-time loss harness for graceful shutdown.
+
+Webhooks are posted from several threads while the watcher is asked to
+shut down, as on a SIGTERM during a deploy. A webhook answered with 200
+counts as lost if its notification was neither sent before shutdown
+finished nor left in the outbox for the next start.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from wallet_watch.config import WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.notifiers.base import NotifierBase
+from wallet_watch.storage.sqlite import SQLiteStorage
+
+from tests.conftest import make_address
+
+
+class SlowNotifier(NotifierBase):
+    """Records messages until closed; the process would exit after that."""
+
+    name = "slow"
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.sent: list[str] = []
+        self.closed = False
+
+    def send(self, message: str, **kwargs) -> bool:
+        return self.send_to("", message)
+
+    def send_to(self, recipient: str, message: str, **kwargs) -> bool:
+        time.sleep(self.delay)
+        if self.closed:
+            return False
+        self.sent.append(message)
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def measure_loss(config, total: int = 120, shutdown_after: int = 60, delay: float = 0.02) -> dict:
+    """Run a watcher, shut it down mid-stream and count lost notifications."""
+    config.server.host = "127.0.0.1"
+    config.server.port = 0
+    address = make_address(1)
+    config.watches = [WatchConfig(address=address, chain="solana", notify=["slow"])]
+
+    watcher = WalletWatch(config)
+    notifier = SlowNotifier(delay)
+    watcher.notifiers["slow"] = notifier
+    watcher.dispatcher.add("slow", notifier, workers=1, queue_size=10_000)
+
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    while watcher.server is None or watcher.server.port is None:
+        time.sleep(0.01)
+    url = f"http://127.0.0.1:{watcher.server.port}/webhook/solana"
+
+    accepted: list[str] = []
+    lock = threading.Lock()
+
+    def post(i: int):
+        signature = f"sig{i:05d}"
+        payload = {
+            "signature": signature,
+            "type": "TRANSFER",
+            "nativeTransfers": [{"fromUserAccount": make_address(2), "toUserAccount": address, "amount": 10**9}],
+        }
+        if i == shutdown_after:
+            watcher.request_shutdown()
+        try:
+            response = requests.post(url, json=[payload], timeout=5)
+        except requests.ConnectionError:
+            return
+        if response.status_code == 200:
+            with lock:
+                accepted.append(signature)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(post, range(total)))
+    thread.join(timeout=30)
+
+    storage = SQLiteStorage(path=config.storage.path)
+    pending = {row["signature"] for row in storage.conn.execute(
+        "SELECT signature FROM outbox WHERE status = 'pending'"
+    )}
+    storage.close()
+
+    delivered = {signature for signature in accepted if any(signature in m for m in notifier.sent)}
+    lost = [signature for signature in accepted if signature not in delivered and signature not in pending]
+    return {"accepted": len(accepted), "delivered": len(delivered), "pending": len(pending), "lost": len(lost)}
+
+
+class TestShutdown:
+    """Tests for the shutdown sequence."""
+
+    def test_no_loss_with_outbox(self, config):
+        """Test accepted webhooks are delivered or kept even with a short deadline."""
+        config.server.shutdown_timeout = 0.2
+
+        result = measure_loss(config)
+
+        assert result["accepted"] > 0
+        assert result["lost"] == 0
+
+    def test_loss_is_measured_without_outbox(self, config):
+        """Test the harness sees notifications dropped when nothing persists them."""
+        config.outbox.enabled = False
+        config.server.shutdown_timeout = 0.2
+
+        result = measure_loss(config)
+
+        assert result["lost"] > 0
+        assert result["delivered"] + result["lost"] == result["accepted"]
+
+    def test_stop_is_idempotent_and_closes_storage(self, watcher):
+        """Test a second stop is a no-op and storage is closed."""
+        report = watcher.stop(timeout=1)
+
+        assert report == {"in_flight": 0, "abandoned": 0, "pending": 0}
+        assert watcher.stop() == {}
@@ -0,0 +1,200 @@
+"""Tests for storage providers."""
+
+import json
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from wallet_watch.cli import main
+from wallet_watch.models import Transaction
+from wallet_watch.storage.sqlite import SQLiteStorage, fts_query
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """SQLite storage in a temp dir."""
+    storage = SQLiteStorage(path=str(tmp_path / "test.db"))
+    yield storage
+    storage.close()
+
+
+class TestSQLiteStorage:
+    """Tests for SQLite storage."""
+
+    def test_save_watches_bulk(self, storage):
+        """Test bulk save inserts and replaces by address."""
+        watches = [{"address": f"addr{i}", "chain": "solana", "label": "a"} for i in range(100)]
+        assert storage.save_watches(watches) == 100
+
+        assert storage.save_watches([{"address": "addr0", "chain": "solana", "label": "b"}]) == 1
+        rows = {row["address"]: row for row in storage.get_watches()}
+        assert len(rows) == 100
+        assert rows["addr0"]["label"] == "b"
+
+    def test_delete_watches_bulk(self, storage):
+        """Test bulk delete counts only existing rows."""
+        storage.save_watches([{"address": f"addr{i}", "chain": "solana"} for i in range(10)])
+
+        assert storage.delete_watches(["addr0", "addr1", "missing"]) == 2
+        assert len(storage.get_watches()) == 8
+
+    def test_watch_settings_round_trip(self, storage):
+        """Test fields without their own column are kept in settings."""
+        storage.save_watches([{
+            "address": "addr0",
+            "chain": "solana",
+            "digest": {"window": 30, "max_delay": 120, "top_n": 3},
+        }])
+
+        row = storage.get_watches()[0]
+        assert '"window": 30' in row["settings"]
+
+    def test_several_watches_per_address(self, storage):
+        """Test every watch on an address round-trips, and a new group replaces the old one."""
+        storage.save_watches([
+            {"address": "addr0", "chain": "solana", "label": "a", "recipients": ["1"]},
+            {"address": "addr0", "chain": "solana", "label": "b", "recipients": ["2"]},
+        ])
+        assert [(row["label"], row["recipients"]) for row in storage.get_watches()] == [("a", '["1"]'), ("b", '["2"]')]
+
+        storage.save_watches([{"address": "addr0", "chain": "solana", "label": "c"}])
+        assert [row["label"] for row in storage.get_watches()] == ["c"]
+
+    def test_migrates_unique_address_table(self, tmp_path):
+        """Test a watches table with a unique address is rebuilt keeping its rows."""
+        path = str(tmp_path / "old.db")
+        storage = SQLiteStorage(path)
+        storage.conn.executescript("""
+            DROP TABLE watches;
+            CREATE TABLE watches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, address TEXT NOT NULL UNIQUE, chain TEXT NOT NULL,
+                label TEXT, notify TEXT, filters TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO watches (address, chain, label) VALUES ('addr0', 'solana', 'old');
+        """)
+        storage.close()
+
+        storage = SQLiteStorage(path)
+        storage.save_watches([{"address": "addr1", "chain": "solana"}, {"address": "addr1", "chain": "solana"}])
+        assert [row["address"] for row in storage.get_watches()] == ["addr0", "addr1", "addr1"]
+        storage.close()
+
+    def test_transactions_after_cursor(self, storage, monkeypatch):
+        """Test reading from a cursor sets row IDs and filters by address in either query form."""
+        txs = [
+            Transaction(signature=f"s{i}", chain="solana", address=f"addr{i % 3}", tx_type="TRANSFER", description="")
+            for i in range(9)
+        ]
+        for tx in txs:
+            storage.save_transaction(tx)
+
+        assert [tx.row_id for tx in txs] == list(range(1, 10))
+        assert [row["id"] for row in storage.get_transactions_after(6)] == [7, 8, 9]
+        assert [row["id"] for row in storage.get_transactions_after(1, ["addr1"], limit=2)] == [2, 5]
+        assert storage.get_transactions_after(0, []) == []
+
+        monkeypatch.setattr(SQLiteStorage, "MAX_ADDRESS_PARAMS", 1)
+        assert [row["id"] for row in storage.get_transactions_after(0, ["addr0", "addr2"], limit=4)] == [1, 3, 4, 6]
+
+
+def save_descriptions(storage, descriptions: list[tuple[str, str]]) -> None:
+    """Save one transaction per (address, description), a day apart from 2026-01-01."""
+    for i, (address, description) in enumerate(descriptions):
+        storage.save_transaction(
+            Transaction(signature=f"s{i}", chain="solana", address=address, tx_type="SWAP", description=description)
+        )
+        storage.conn.execute(
+            "UPDATE transactions SET created_at = ? WHERE id = ?", (f"2026-01-{i + 1:02d} 12:00:00", i + 1)
+        )
+    storage.conn.commit()
+
+
+class TestSearch:
+    """Tests for full-text search over descriptions."""
+
+    DESCRIPTIONS = [
+        ("addr0", "addr0 swapped 10 USDC for 500000 BONK on JUPITER"),
+        ("addr1", "addr1 transferred 5 SOL to addr0"),
+        ("addr0", "addr0 sold Mad Lads #12 to addr1 for 80 SOL on MAGIC_EDEN"),
+        ("addr1", "addr1 swapped BONK for BONK and more BONK"),
+        ("addr1", "addr1 swapped 2 SOL for 300 USDC on JUPITER"),
+    ]
+
+    def test_fts_query_quotes_terms(self):
+        """Test words are quoted, prefixes kept and operators taken literally."""
+        assert fts_query("BON*") == '"BON"*'
+        assert fts_query('swapped "Mad Lads" OR') == '"swapped" "Mad Lads" "OR"'
+        assert fts_query('say "hi') == '"say" "hi"'
+        assert fts_query('  "" * ') == ""
+
+    def test_prefix_phrase_and_rank(self, storage):
+        """Test prefix and phrase matches, best match first, with highlighted snippets."""
+        save_descriptions(storage, self.DESCRIPTIONS)
+
+        results = storage.search_transactions("BON*")
+        assert [row["id"] for row in results] == [4, 1]
+        assert results[0]["rank"] < results[1]["rank"]
+        assert "[BONK]" in results[1]["snippet"]
+
+        assert [row["id"] for row in storage.search_transactions('"mad lads" sold')] == [3]
+        assert storage.search_transactions('"lads mad"') == []
+        assert [row["id"] for row in storage.search_transactions("swapped", order="newest")] == [5, 4, 1]
+
+    def test_address_and_time_filters(self, storage):
+        """Test address and time window filters in both orders."""
+        save_descriptions(storage, self.DESCRIPTIONS)
+
+        for order in ("rank", "newest"):
+            assert {row["id"] for row in storage.search_transactions("swapped", address="addr1", order=order)} == {4, 5}
+            found = storage.search_transactions(
+                "swapped", since=datetime(2026, 1, 2), until=datetime(2026, 1, 5), order=order
+            )
+            assert [row["id"] for row in found] == [4]
+            assert storage.search_transactions("swapped", since=datetime(2027, 1, 1), order=order) == []
+
+    def test_index_follows_writes_and_existing_databases(self, tmp_path):
+        """Test the index tracks updates and deletes and is built for a database that had none."""
+        path = str(tmp_path / "old.db")
+        storage = SQLiteStorage(path)
+        save_descriptions(storage, self.DESCRIPTIONS)
+        storage.conn.execute("UPDATE transactions SET description = 'addr1 bought ORCA' WHERE id = 2")
+        storage.conn.execute("DELETE FROM transactions WHERE id = 5")
+        storage.conn.commit()
+        assert [row["id"] for row in storage.search_transactions("ORCA")] == [2]
+        assert [row["id"] for row in storage.search_transactions("USDC")] == [1]
+
+        for name in ("insert", "delete", "update"):
+            storage.conn.execute(f"DROP TRIGGER transactions_fts_{name}")
+        storage.conn.execute("DROP TABLE transactions_fts")
+        storage.conn.commit()
+        storage.close()
+
+        storage = SQLiteStorage(path)
+        assert storage.supports_search
+        assert [row["id"] for row in storage.search_transactions("ORCA")] == [2]
+        storage.close()
+
+    def test_invalid_raw_query_and_scan_fallback(self, storage):
+        """Test a malformed raw query raises ValueError and the LIKE scan finds all words."""
+        save_descriptions(storage, self.DESCRIPTIONS)
+
+        with pytest.raises(ValueError):
+            storage.search_transactions('"unbalanced', raw=True)
+        found = storage.search_transactions("BONK OR MAGIC_EDEN", raw=True, order="newest")
+        assert [row["id"] for row in found] == [4, 3, 1]
+
+        storage.supports_search = False
+        assert [row["id"] for row in storage.search_transactions("swapped JUP", address="addr0")] == [1]
+
+    def test_cli_search(self, storage, tmp_path):
+        """Test the search command prints matches from a database file."""
+        save_descriptions(storage, self.DESCRIPTIONS)
+        db = str(tmp_path / "test.db")
+
+        result = CliRunner().invoke(main, ["search", "--db", db, "--json", "--order", "newest", "USDC"])
+        assert result.exit_code == 0, result.output
+        assert [row["id"] for row in json.loads(result.output)] == [5, 1]
+
+        result = CliRunner().invoke(main, ["search", "--db", db, "--since", "tomorrow", "USDC"])
+        assert result.exit_code != 0
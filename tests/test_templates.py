@@ -0,0 +1,108 @@
+"""Tests for message templates and rendering."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from wallet_watch.config import WatchConfig
+from wallet_watch.models import Transaction
+from wallet_watch.templates import HTML, JSON, MARKDOWN, PLAIN, Renderer, Template, context
+
+from tests.conftest import make_address
+
+
+def make_tx(**overrides) -> Transaction:
+    fields = dict(
+        signature="sig1", chain="solana", address="ABCDEFGHJKLMN", tx_type="swap",
+        description="Swapped 1 SOL for <USDC>", amount_usd=1234.5,
+    )
+    fields.update(overrides)
+    return Transaction(**fields)
+
+
+class TestTemplate:
+    """Tests for template compilation."""
+
+    def test_default_html_layout(self):
+        """Test the built-in HTML template keeps the classic message layout."""
+        message = make_tx(description="").to_message(label="Whale")
+
+        assert message == (
+            "<b>SWAP</b> on Solana\nWallet: Whale\nValue: <b>$1,234.50</b>\n\n"
+            "<a href='https://solscan.io/tx/sig1'>View on Solscan</a>"
+        )
+
+    def test_optional_sections_and_escaping(self):
+        """Test sections with empty fields are dropped and text is escaped per format."""
+        template = Template("{TYPE}[[ - {description}]][[ ${amount_usd:,.0f}]]", MARKDOWN)
+        renderer = Renderer()
+
+        assert template.render(context(make_tx(description="a_b", amount_usd=None))) == "SWAP - a\\_b"
+        assert "&lt;USDC&gt;" in renderer.render(make_tx(), fmt=HTML)
+        assert "<USDC>" in renderer.render(make_tx(), fmt=PLAIN)
+
+    def test_missing_value_with_format_spec(self):
+        """Test a formatted field outside a section renders empty when its value is missing."""
+        template = Template("{TYPE} ${amount_usd:,.2f}", PLAIN)
+
+        assert template.render(context(make_tx(amount_usd=None))) == "SWAP $"
+
+    def test_rejects_unknown_fields(self):
+        """Test templates are validated when compiled."""
+        with pytest.raises(ValueError, match="Unknown template field"):
+            Renderer({"bad": "{nope}"})
+
+
+class TestRenderer:
+    """Tests for memoized rendering."""
+
+    def test_memoizes_per_signature_template_and_label(self):
+        """Test repeated renders of the same inputs come from the cache."""
+        renderer = Renderer({"short": "{TYPE} {wallet}"})
+        tx = make_tx()
+
+        assert renderer.render(tx, "A", "short") == "SWAP A"
+        assert renderer.render(tx, "A", "short") == "SWAP A"
+        assert renderer.render(tx, "B", "short") == "SWAP B"
+        assert json.loads(renderer.render(tx, "A", fmt=JSON))["label"] == "A"
+
+        assert renderer.stats()["hits"] == 1
+        assert renderer.stats()["misses"] == 3
+
+    def test_renders_once_per_format(self, watcher):
+        """Test each notifier gets its own format, and watch templates override defaults."""
+        address = make_address(1)
+        watcher.config.templates["terse"] = "{TYPE}: {wallet}"
+        watcher.renderer = Renderer(watcher.config.templates)
+
+        sent = {}
+        for name, fmt in (("telegram", HTML), ("webhook", PLAIN), ("slack", MARKDOWN)):
+            notifier = MagicMock(max_batch=1, structured=False, format=fmt)
+            notifier.send_each.side_effect = lambda deliveries, name=name: sent.setdefault(name, deliveries) and [
+                (d, True) for d in deliveries
+            ]
+            watcher.notifiers[name] = notifier
+            watcher.dispatcher.add(name, notifier)
+
+        watcher.add_watches([
+            WatchConfig(address=address, chain="solana", label="W", notify=["telegram", "webhook"],
+                        recipients=["1", "2"]),
+            WatchConfig(address=address, chain="solana", label="W", notify=["slack"], template="terse"),
+        ])
+        watcher.chains["solana"].notify_callbacks(address, make_tx(address=address))
+        watcher.stop()
+
+        assert sent["telegram"][0].message.startswith("<b>SWAP</b>")
+        assert sent["webhook"][0].message.startswith("SWAP on Solana")
+        assert sent["slack"][0].message == "SWAP: W"
+        assert watcher.renderer.stats()["misses"] == 3
+
+    def test_rejects_invalid_watch_template(self, watcher):
+        """Test watches with broken templates are rejected."""
+        result = watcher.add_watches([
+            WatchConfig(address=make_address(1), chain="solana", template="{missing}")
+        ])
+
+        assert result["added"] == 0
+        assert "Invalid template" in result["rejected"][0]["error"]
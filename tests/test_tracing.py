@@ -0,0 +1,124 @@
+"""Tests for trace spans, the sampling profiler and stall detection."""
+
+import json
+import logging
+import threading
+import time
+from unittest.mock import MagicMock
+
+from wallet_watch.config import TracingConfig, WatchConfig
+from wallet_watch.core import WalletWatch
+from wallet_watch.profiling import SamplingProfiler, StallDetector
+from wallet_watch.tracing import Tracer, span
+
+from tests.conftest import make_address
+
+
+def read_spans(path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTracer:
+    """Tests for sampling and span export."""
+
+    def test_unsampled_writes_nothing(self, tmp_path):
+        """Test a zero sample rate never opens the trace file."""
+        tracer = Tracer(TracingConfig(sample_rate=0, path=str(tmp_path / "traces.jsonl")))
+
+        with tracer.trace("transaction"):
+            with span("filter"):
+                pass
+
+        assert not (tmp_path / "traces.jsonl").exists()
+
+    def test_nested_spans_share_trace(self, tmp_path):
+        """Test child spans link to their parents within one trace."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(TracingConfig(sample_rate=1, path=str(path)))
+
+        with tracer.trace("transaction", signature="sig1"):
+            with span("outer"):
+                with span("inner"):
+                    pass
+        tracer.close()
+
+        inner, outer, root = read_spans(path)
+        assert {s["traceId"] for s in (inner, outer, root)} == {root["traceId"]}
+        assert root["parentSpanId"] == "" and root["attributes"] == {"signature": "sig1"}
+        assert outer["parentSpanId"] == root["spanId"]
+        assert inner["parentSpanId"] == outer["spanId"]
+        assert inner["endTimeUnixNano"] >= inner["startTimeUnixNano"]
+
+    def test_pipeline_stages_traced(self, config, tmp_path):
+        """Test a sampled transaction records every stage, including the notifier call."""
+        path = tmp_path / "traces.jsonl"
+        config.tracing = TracingConfig(sample_rate=1, path=str(path))
+        watcher = WalletWatch(config)
+        notifier = MagicMock(max_batch=1, structured=False, format="html")
+        notifier.send_each.side_effect = lambda deliveries: [(d, True) for d in deliveries]
+        watcher.notifiers["telegram"] = notifier
+        watcher.dispatcher.add("telegram", notifier)
+
+        address = make_address(1)
+        watcher.add_watches([WatchConfig(address=address, chain="solana", notify=["telegram"])])
+        watcher.chains["solana"].process_payload({
+            "signature": "sig1",
+            "type": "TRANSFER",
+            "nativeTransfers": [{"fromUserAccount": make_address(2), "toUserAccount": address, "amount": 1}],
+        })
+        watcher.stop(timeout=2)
+
+        spans = read_spans(path)
+        assert {s["name"] for s in spans} == {
+            "transaction", "ingest", "dedup", "filter", "render", "persist", "notify"
+        }
+        notify = next(s for s in spans if s["name"] == "notify")
+        assert notify["attributes"]["notifier"] == "telegram"
+        assert notify["attributes"]["sent"] == 1
+
+
+class TestProfiling:
+    """Tests for the sampling profiler and stall detector."""
+
+    def test_profiler_sees_busy_thread(self):
+        """Test a busy function shows up in the sampled stacks."""
+        stop = threading.Event()
+
+        def busy_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        thread = threading.Thread(target=busy_loop, name="busy")
+        thread.start()
+        try:
+            result = SamplingProfiler().profile(0.1, interval=0.002)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert result["samples"] > 0
+        assert any("busy_loop" in entry["stack"] for entry in result["stacks"])
+
+    def test_stall_logged_once_with_stack(self, caplog):
+        """Test a stage blocked past the threshold logs its stack once."""
+        detector = StallDetector(threshold=0.05)
+        entered = threading.Event()
+
+        def slow_stage():
+            with detector.watch("notify:telegram"):
+                entered.set()
+                time.sleep(0.3)
+
+        thread = threading.Thread(target=slow_stage)
+        thread.start()
+        entered.wait()
+        time.sleep(0.1)
+
+        with caplog.at_level(logging.WARNING, logger="wallet_watch.profiling"):
+            assert detector.check() == 1
+            assert detector.check() == 0
+        thread.join()
+
+        assert "notify:telegram" in caplog.text
+        assert "slow_stage" in caplog.text
@@ -0,0 +1,91 @@
+"""Tests for CSV and JSON-lines watch files."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from wallet_watch.config import WatchFileConfig, load_config
+from wallet_watch.watchfiles import WatchFileCache, iter_watch_chunks, load_watch_files
+
+from tests.conftest import make_address
+
+
+def write_csv(path, rows: list[str]) -> None:
+    path.write_text("address,label,notify,priority\n" + "\n".join(rows) + "\n")
+
+
+class TestWatchFiles:
+    """Tests for parsing watch files into watches."""
+
+    def test_csv_rows_with_defaults(self, tmp_path):
+        """Test CSV cells override the file defaults and empty cells keep them."""
+        write_csv(tmp_path / "w.csv", [f"{make_address(1)},Whale,telegram;webhook,5", f"{make_address(2)},,,"])
+        spec = WatchFileConfig(path="w.csv", notify=["telegram"], label="Default")
+
+        first, second = load_watch_files([spec], tmp_path)
+
+        assert first.address == make_address(1) and first.label == "Whale"
+        assert first.notify == ["telegram", "webhook"] and first.priority == 5
+        assert second.label == "Default" and second.notify == ["telegram"] and second.chain == "solana"
+
+    def test_jsonl_in_chunks(self, tmp_path):
+        """Test JSON-lines files are yielded in chunks."""
+        lines = [json.dumps({"address": make_address(i), "notify": ["webhook"]}) for i in range(1, 6)]
+        (tmp_path / "w.jsonl").write_text("\n".join(lines) + "\n")
+
+        chunks = list(iter_watch_chunks(WatchFileConfig(path="w.jsonl"), tmp_path, chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert chunks[2][0].address == make_address(5) and chunks[2][0].notify == ["webhook"]
+
+    def test_bad_row_names_line(self, tmp_path):
+        """Test a row without an address reports its file and line."""
+        write_csv(tmp_path / "w.csv", [f"{make_address(1)},a,,", ",b,,"])
+
+        with pytest.raises(ValueError, match=r"w\.csv:3: missing address"):
+            load_watch_files([WatchFileConfig(path="w.csv")], tmp_path)
+
+    def test_load_config_appends_file_watches(self, tmp_path):
+        """Test watch files load after the watches listed in the config."""
+        write_csv(tmp_path / "w.csv", [f"{make_address(2)},,,"])
+        (tmp_path / "config.yaml").write_text(
+            f"watches:\n  - address: \"{make_address(1)}\"\n    chain: solana\n"
+            "watch_files:\n  - path: w.csv\nwatch_cache: ''\n"
+        )
+
+        config = load_config(tmp_path / "config.yaml")
+
+        assert [watch.address for watch in config.watches] == [make_address(1), make_address(2)]
+
+
+class TestWatchFileCache:
+    """Tests for the parsed-row cache."""
+
+    def test_unchanged_file_skips_parsing(self, tmp_path):
+        """Test a second load of an unchanged file comes from the cache."""
+        write_csv(tmp_path / "w.csv", [f"{make_address(1)},Whale,,"])
+        spec = WatchFileConfig(path="w.csv")
+        load_watch_files([spec], tmp_path, tmp_path / "cache")
+
+        with patch("wallet_watch.watchfiles.iter_rows", side_effect=AssertionError("parsed again")):
+            (watch,) = load_watch_files([spec], tmp_path, tmp_path / "cache")
+
+        assert watch.label == "Whale"
+
+    def test_touched_file_checks_contents(self, tmp_path):
+        """Test a newer mtime with the same contents still hits; new contents reparse."""
+        path = tmp_path / "w.csv"
+        write_csv(path, [f"{make_address(1)},Whale,,"])
+        cache = WatchFileCache(tmp_path / "cache")
+        list(iter_watch_chunks(WatchFileConfig(path="w.csv"), tmp_path, cache))
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get(path) == [(make_address(1), None, "Whale", None, None, None, None)]
+
+        write_csv(path, [f"{make_address(1)},Renamed,,"])
+        assert cache.get(path) is None
+        (watch,) = load_watch_files([WatchFileConfig(path="w.csv")], tmp_path, tmp_path / "cache")
+        assert watch.label == "Renamed"